@@ -4,7 +4,7 @@ Access at: http://localhost:8000/admin
 """
 
 from django.contrib import admin
-from .models import Player, PlayerGameStats, BettingScenario
+from .models import Player, PlayerGameStats, PlayerProjection, SeasonCalendar, TeamGameStats, TeamWeekStats, BettingScenario
 
 
 @admin.register(Player)
@@ -95,6 +95,48 @@ class PlayerGameStatsAdmin(admin.ModelAdmin):
     key_stats.short_description = 'Key Stats'
 
 
+@admin.register(PlayerProjection)
+class PlayerProjectionAdmin(admin.ModelAdmin):
+    """Admin interface for PlayerProjection model."""
+    
+    list_display = ['player', 'season', 'week', 'stat', 'q10', 'q50', 'q90', 'model_version', 'computed_at']
+    list_filter = ['season', 'week', 'stat', 'player__position']
+    search_fields = ['player__display_name', 'player__player_id']
+    ordering = ['-season', '-week', 'stat', '-q50']
+    
+    readonly_fields = ['computed_at']
+
+
+@admin.register(SeasonCalendar)
+class SeasonCalendarAdmin(admin.ModelAdmin):
+    """Admin interface for SeasonCalendar model."""
+    
+    list_display = ['season_type', 'season', 'week', 'updated_at']
+    readonly_fields = ['updated_at']
+
+
+@admin.register(TeamGameStats)
+class TeamGameStatsAdmin(admin.ModelAdmin):
+    """Admin interface for TeamGameStats model."""
+    
+    list_display = ['team', 'season', 'week', 'season_type', 'opponent_team', 'passing_yards',
+                    'rushing_yards', 'receptions', 'targets']
+    list_filter = ['season', 'season_type', 'team']
+    ordering = ['team', '-season', '-week']
+
+
+@admin.register(TeamWeekStats)
+class TeamWeekStatsAdmin(admin.ModelAdmin):
+    """Admin interface for TeamWeekStats model."""
+    
+    list_display = ['team', 'season', 'week', 'season_type', 'team_passing_yards', 'team_rushing_yards',
+                    'team_receptions', 'team_targets', 'updated_at']
+    list_filter = ['season', 'season_type', 'team']
+    ordering = ['team', '-season', '-week']
+    
+    readonly_fields = ['updated_at']
+
+
 @admin.register(BettingScenario)
 class BettingScenarioAdmin(admin.ModelAdmin):
     """Admin interface for BettingScenario model."""
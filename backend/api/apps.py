@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+    
+    def ready(self):
+        # Keep derived tables (rolling features, team-week totals, season
+        # calendar) up to date as game stats are saved
+        from . import signals  # noqa: F401
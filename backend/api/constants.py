@@ -2,6 +2,9 @@
 Constants and mappings for the API.
 """
 
+# Number of recent games used as player history for predictions
+HISTORY_GAMES = 8
+
 # Team abbreviation to full name mapping
 TEAM_ABBREVIATIONS = {
     'ARI': 'Arizona Cardinals',
@@ -3,11 +3,17 @@ Data access layer for querying players and game stats.
 Provides convenient functions for ML inference and API views.
 """
 
+import logging
 import pandas as pd
-from typing import List, Optional, Dict
-from django.db.models import Q, Count, Sum, Avg
-from .models import Player, PlayerGameStats
+from typing import Iterable, List, Optional, Dict, Tuple
+from django.db.models import Q, Count, Sum, Avg, F, Window
+from django.db.models.functions import RowNumber
+from .models import Player, PlayerGameStats, PlayerProjection
 from .constants import standardize_team_name
+from .season_calendar import get_latest_week
+from .team_stats import get_team_game_stats, get_team_week_stats
+
+logger = logging.getLogger(__name__)
 
 
 def get_player_by_name(name: str) -> Optional[Player]:
@@ -96,6 +102,40 @@ def get_players_by_team(team: str, position: Optional[str] = None) -> List[Playe
     return list(Player.objects.filter(q).order_by('display_name'))
 
 
+# Columns of the history DataFrames handed to the ML service, in order
+HISTORY_INFO_COLUMNS = ['player_id', 'season', 'week', 'season_type', 'team', 'opponent_team']
+HISTORY_STAT_COLUMNS = [
+    # Passing stats
+    'completions', 'attempts', 'passing_yards', 'passing_tds', 'passing_interceptions',
+    # Rushing stats
+    'carries', 'rushing_yards', 'rushing_tds',
+    # Receiving stats
+    'receptions', 'targets', 'receiving_yards', 'receiving_tds',
+]
+
+
+def _games_frame(games, reverse: bool = False) -> pd.DataFrame:
+    """
+    Fetch a PlayerGameStats queryset as a history DataFrame in one query.
+    
+    Only the history columns are selected (player_id is the FK column, so no
+    Player rows are loaded); missing stats become 0.
+    
+    Args:
+        games: Ordered PlayerGameStats queryset
+        reverse: Reverse the rows (newest-first queries, oldest-first frames)
+    """
+    rows = list(games.values_list(*HISTORY_INFO_COLUMNS, *HISTORY_STAT_COLUMNS))
+    if not rows:
+        return pd.DataFrame()
+    if reverse:
+        rows.reverse()
+    
+    df = pd.DataFrame.from_records(rows, columns=HISTORY_INFO_COLUMNS + HISTORY_STAT_COLUMNS)
+    df[HISTORY_STAT_COLUMNS] = df[HISTORY_STAT_COLUMNS].astype('float64').fillna(0).astype('int64')
+    return df
+
+
 def get_player_recent_games(
     player: Player,
     num_games: int = 5,
@@ -110,48 +150,57 @@ def get_player_recent_games(
         season_type: 'REG' for regular season, 'POST' for playoffs
     
     Returns:
-        DataFrame with game stats (compatible with ML models)
+        DataFrame with game stats (compatible with ML models), oldest first
     """
-    # Query recent games
     games = PlayerGameStats.objects.filter(
-        player=player,
+        player_id=player.player_id,
         season_type=season_type
     ).order_by('-season', '-week')[:num_games]
     
-    # Convert to list of dicts
-    games_data = []
-    for game in games:
-        games_data.append({
-            'player_id': game.player.player_id,
-            'season': game.season,
-            'week': game.week,
-            'season_type': game.season_type,
-            'team': game.team,
-            'opponent_team': game.opponent_team,
-            
-            # Passing stats
-            'completions': game.completions or 0,
-            'attempts': game.attempts or 0,
-            'passing_yards': game.passing_yards or 0,
-            'passing_tds': game.passing_tds or 0,
-            'passing_interceptions': game.passing_interceptions or 0,
-            
-            # Rushing stats
-            'carries': game.carries or 0,
-            'rushing_yards': game.rushing_yards or 0,
-            'rushing_tds': game.rushing_tds or 0,
-            
-            # Receiving stats
-            'receptions': game.receptions or 0,
-            'targets': game.targets or 0,
-            'receiving_yards': game.receiving_yards or 0,
-            'receiving_tds': game.receiving_tds or 0,
-        })
+    # Reverse so oldest is first for rolling features
+    return _games_frame(games, reverse=True)
+
+
+def get_recent_games_for_players(
+    player_ids: Optional[Iterable[str]] = None,
+    num_games: int = 5,
+    season_type: str = 'REG'
+) -> Dict[str, pd.DataFrame]:
+    """
+    Get many players' most recent games in one query.
     
-    # Convert to DataFrame (reverse so oldest is first for rolling features)
-    df = pd.DataFrame(games_data[::-1])
+    Ranks each player's games with ROW_NUMBER() OVER (PARTITION BY player
+    ORDER BY season DESC, week DESC) and keeps the first num_games, so a
+    slate costs one round trip instead of one per player.
     
-    return df
+    Args:
+        player_ids: Players to fetch (default: every player)
+        num_games: Number of recent games to retrieve per player
+        season_type: 'REG' for regular season, 'POST' for playoffs
+    
+    Returns:
+        Dict of player_id -> DataFrame in get_player_recent_games format
+        (oldest first); players without games are left out
+    """
+    games = PlayerGameStats.objects.filter(season_type=season_type)
+    if player_ids is not None:
+        games = games.filter(player_id__in=list(player_ids))
+    
+    games = games.annotate(
+        game_rank=Window(
+            expression=RowNumber(),
+            partition_by=[F('player_id')],
+            order_by=[F('season').desc(), F('week').desc()]
+        )
+    ).filter(game_rank__lte=num_games).order_by('player_id', 'season', 'week')
+    
+    df = _games_frame(games)
+    if df.empty:
+        return {}
+    return {
+        player_id: player_games.reset_index(drop=True)
+        for player_id, player_games in df.groupby('player_id', sort=False)
+    }
 
 
 def get_player_season_stats(
@@ -168,39 +217,15 @@ def get_player_season_stats(
         season_type: 'REG' or 'POST'
     
     Returns:
-        DataFrame with game stats
+        DataFrame with game stats (same format as get_player_recent_games)
     """
     games = PlayerGameStats.objects.filter(
-        player=player,
+        player_id=player.player_id,
         season=season,
         season_type=season_type
     ).order_by('week')
     
-    # Convert to DataFrame (same format as get_player_recent_games)
-    games_data = []
-    for game in games:
-        games_data.append({
-            'player_id': game.player.player_id,
-            'season': game.season,
-            'week': game.week,
-            'season_type': game.season_type,
-            'team': game.team,
-            'opponent_team': game.opponent_team,
-            'completions': game.completions or 0,
-            'attempts': game.attempts or 0,
-            'passing_yards': game.passing_yards or 0,
-            'passing_tds': game.passing_tds or 0,
-            'passing_interceptions': game.passing_interceptions or 0,
-            'carries': game.carries or 0,
-            'rushing_yards': game.rushing_yards or 0,
-            'rushing_tds': game.rushing_tds or 0,
-            'receptions': game.receptions or 0,
-            'targets': game.targets or 0,
-            'receiving_yards': game.receiving_yards or 0,
-            'receiving_tds': game.receiving_tds or 0,
-        })
-    
-    return pd.DataFrame(games_data)
+    return _games_frame(games)
 
 
 def player_has_sufficient_history(
@@ -310,68 +335,229 @@ def get_team_stats_for_week(team: str, season: int, week: int) -> Optional[Dict[
         }
         Returns None if no data is available (caller should use defaults)
     """
-    import logging
-    logger = logging.getLogger(__name__)
+    team_abb = standardize_team_name(team)
+    
+    # The requested week, or the most recent week with data for this team/season
+    team_week = get_team_week_stats(team_abb, season, week)
+    
+    if team_week is None:
+        # No data at all for this team/season
+        logger.warning(
+            f"No game data found for {team_abb} in {season}. "
+            f"Team stats will use defaults."
+        )
+        return None
+    
+    if team_week.week != week:
+        logger.warning(
+            f"No data for {team_abb} in {season} Week {week}. "
+            f"Using Week {team_week.week} stats instead."
+        )
+    
+    return {
+        'team_passing_yards': float(team_week.team_passing_yards),
+        'team_rushing_yards': float(team_week.team_rushing_yards),
+        'team_receptions': float(team_week.team_receptions),
+        'team_targets': float(team_week.team_targets),
+    }
+
+
+def get_team_game_context(team: str, season: int, week: int) -> Optional[Dict[str, float]]:
+    """
+    Get a team's totals for a game week from the team weekly stats
+    (TeamGameStats), the same columns the training notebook's
+    merge_team_context adds, in one row read.
     
+    Falls back to the team's most recent week of the season like
+    get_team_stats_for_week.
+    
+    Returns:
+        Dictionary with team_passing_yards, team_rushing_yards,
+        team_receptions and team_targets, or None if the team's season
+        has not been loaded
+    """
     team_abb = standardize_team_name(team)
+    team_game = get_team_game_stats(team_abb, season, week)
     
-    # First, try to get stats for the requested week
-    games = PlayerGameStats.objects.filter(
-        team=team_abb,
-        season=season,
-        week=week,
-        season_type='REG'
-    )
+    if team_game is None:
+        return None
     
-    # If no games found for requested week, fallback to most recent week
-    if games.count() == 0:
-        # Find the most recent week with data for this team/season
-        latest_game = PlayerGameStats.objects.filter(
-            team=team_abb,
-            season=season,
-            season_type='REG'
-        ).order_by('-week').first()
+    if team_game.week != week:
+        logger.warning(
+            f"No team game data for {team_abb} in {season} Week {week}. "
+            f"Using Week {team_game.week} stats instead."
+        )
+    
+    return {
+        'team_passing_yards': float(team_game.passing_yards),
+        'team_rushing_yards': float(team_game.rushing_yards),
+        'team_receptions': float(team_game.receptions),
+        'team_targets': float(team_game.targets),
+    }
+
+
+def get_prediction_week() -> Tuple[int, int, bool]:
+    """
+    Work out which season/week to predict for from the latest loaded week.
+    
+    Returns:
+        Tuple of (current_season, current_week, is_playoff)
+    """
+    try:
+        # Latest loaded regular season week (cached season calendar)
+        latest_week = get_latest_week('REG')
         
-        if latest_game:
-            # Use the most recent week's data
-            actual_week = latest_game.week
-            if actual_week != week:
-                logger.warning(
-                    f"No data for {team_abb} in {season} Week {week}. "
-                    f"Using Week {actual_week} stats instead."
-                )
-            games = PlayerGameStats.objects.filter(
-                team=team_abb,
-                season=season,
-                week=actual_week,
-                season_type='REG'
-            )
+        if latest_week:
+            current_season, latest = latest_week
+            current_week = latest + 1  # Predict for NEXT week
+            
+            # Handle end of regular season (week > 18 = playoffs)
+            if current_week > 18:
+                # If we're past week 18, we're in playoffs
+                # Use week 18 for regular season predictions, or set is_playoff=True
+                # For now, cap at week 18 for regular season
+                current_week = 18
+                is_playoff = True
+            else:
+                is_playoff = False
         else:
-            # No data at all for this team/season
-            logger.warning(
-                f"No game data found for {team_abb} in {season}. "
-                f"Team stats will use defaults."
-            )
-            return None
-    
-    # Aggregate stats for all players on the team for this week
-    # Sum treats NULL values as 0, which is what we want
-    stats = games.aggregate(
-        team_passing_yards=Sum('passing_yards'),
-        team_rushing_yards=Sum('rushing_yards'),
-        team_receptions=Sum('receptions'),
-        team_targets=Sum('targets'),
-    )
+            # Fallback
+            current_season = 2025
+            current_week = 8
+            is_playoff = False
+    except Exception:
+        current_season = 2025
+        current_week = 8
+        is_playoff = False
+    
+    return current_season, current_week, is_playoff
+
+
+def get_team_context(team: str, season: int, week: int) -> Optional[Dict[str, float]]:
+    """
+    Get team context for the upcoming game in the format expected by the ML service.
     
-    # Convert to float and ensure all values are present (handle None from Sum)
-    result = {
-        'team_passing_yards': float(stats.get('team_passing_yards') or 0.0),
-        'team_rushing_yards': float(stats.get('team_rushing_yards') or 0.0),
-        'team_receptions': float(stats.get('team_receptions') or 0.0),
-        'team_targets': float(stats.get('team_targets') or 0.0),
-    }
+    Returns:
+        Dictionary of team stats, or None to let feature engineering use defaults
+    """
+    try:
+        # Team weekly stats when loaded, else summed from the team's player rows
+        team_stats_dict = get_team_game_context(team, season, week) or get_team_stats_for_week(
+            team=team,
+            season=season,
+            week=week
+        )
+        
+        if team_stats_dict:
+            # Convert to format expected by ML service
+            return {
+                'team_passing_yards': team_stats_dict.get('team_passing_yards', 230.0),
+                'team_rushing_yards': team_stats_dict.get('team_rushing_yards', 120.0),
+                'team_receptions': team_stats_dict.get('team_receptions', 22.0),
+                'team_targets': team_stats_dict.get('team_targets', 34.0)
+            }
+        
+        # Fallback to defaults if calculation fails
+        logger.warning(
+            f"Could not calculate team stats for {team} in {season} Week {week}. "
+            f"Using default values."
+        )
+    except Exception as e:
+        # Fallback to defaults if calculation fails
+        logger.warning(
+            f"Error calculating team stats for {team} in {season} Week {week}: {e}. "
+            f"Using default values."
+        )
+    
+    return None  # Will use defaults in feature engineering
+
+
+def get_projection(
+    player: Player,
+    stat: str,
+    season: int,
+    week: int,
+    model_version: str
+) -> Optional[PlayerProjection]:
+    """
+    Get a precomputed projection (see the precompute_projections command).
+    
+    Args:
+        player: Player object
+        stat: Stat name (e.g., 'passing_yards')
+        season: Season year predicted for
+        week: Week number predicted for
+        model_version: Only return projections made by this model version
+    
+    Returns:
+        PlayerProjection, or None if there is no current projection
+    """
+    return PlayerProjection.objects.filter(
+        player=player,
+        stat=stat,
+        season=season,
+        week=week,
+        model_version=model_version
+    ).first()
+
+
+def forget_projections(
+    player_ids: Optional[Iterable[str]] = None,
+    teams: Optional[Iterable[str]] = None
+) -> int:
+    """
+    Delete precomputed projections whose inputs changed, so predictions for
+    those players are computed on demand until precompute_projections reruns.
+    
+    A projection depends on the player's recent games and on their team's
+    stats, so a changed game invalidates its player and their teammates.
+    
+    Args:
+        player_ids: Players whose games changed
+        teams: Teams whose stats changed (invalidates their current players)
+        (neither: delete every projection)
+    
+    Returns:
+        Number of projections deleted
+    """
+    projections = PlayerProjection.objects.all()
+    if player_ids is not None or teams is not None:
+        projections = projections.filter(
+            Q(player_id__in=list(player_ids or [])) | Q(player__current_team__in=list(teams or []))
+        )
+    return projections.delete()[0]
+
+
+def get_top_projections(
+    stat: str,
+    season: int,
+    week: int,
+    position: Optional[str] = None,
+    limit: int = 20
+) -> List[PlayerProjection]:
+    """
+    Get the highest median projections for a stat in a week.
+    
+    Args:
+        stat: Stat name (e.g., 'receiving_yards')
+        season: Season year
+        week: Week number
+        position: Optional position filter
+        limit: Maximum number of projections
+    
+    Returns:
+        List of PlayerProjection objects (with players), highest q50 first
+    """
+    projections = PlayerProjection.objects.filter(
+        stat=stat,
+        season=season,
+        week=week
+    ).select_related('player')
+    
+    if position:
+        projections = projections.filter(player__position=position)
     
-    return result
+    return list(projections.order_by('-q50')[:limit])
 
 
 def get_database_stats() -> Dict:
@@ -0,0 +1,182 @@
+"""
+Persisted rolling-feature store.
+
+Keeps one PlayerFeatures row per player with the rolling form features
+(*_avg_3, *_std_3, *_avg_5, *_std_5 of every stat in POSITION_STATS) going
+into their next game. The row holds a running window of the player's last
+HISTORY_GAMES regular season games, the same games the request path
+fetches as history, so the stored features are identical to computing
+them per request.
+
+Saving a game folds it into the window without touching the database
+again; only deleting a game from the window refetches the player's games.
+"""
+
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+
+from ml_service.constants import POSITION_STATS
+from ml_service.feature_engineering import RollingFeatures, rolling_form_features
+from .constants import HISTORY_GAMES
+from .data_access import get_player_recent_games, get_recent_games_for_players
+from .models import Player, PlayerFeatures, PlayerGameStats
+
+# Stats with rolling features, for every position
+FEATURE_STATS = tuple(dict.fromkeys(stat for stats in POSITION_STATS.values() for stat in stats))
+
+
+def _game_values(game: PlayerGameStats) -> dict:
+    """Stat values of a game, as get_player_recent_games reports them."""
+    return {stat: getattr(game, stat) or 0 for stat in FEATURE_STATS}
+
+
+def _compute_features(recent_games: List[list]) -> dict:
+    """Rolling features of a running window of [season, week, values] games."""
+    values = np.array(
+        [[game[2][stat] for stat in FEATURE_STATS] for game in recent_games],
+        dtype=np.float64
+    ).reshape(len(recent_games), len(FEATURE_STATS))
+    return rolling_form_features(values, list(FEATURE_STATS))
+
+
+def rebuild_player_features(player_ids: Optional[Iterable[str]] = None) -> int:
+    """
+    Recompute players' rows from their games in the database.
+    
+    Args:
+        player_ids: Players to rebuild (default: every player)
+    
+    Returns:
+        Number of rows written (players without regular season games get none)
+    """
+    if player_ids is not None:
+        player_ids = list(player_ids)
+    
+    rows = []
+    for player_id, games in get_recent_games_for_players(player_ids, num_games=HISTORY_GAMES).items():
+        recent_games = [
+            [season, week, dict(zip(FEATURE_STATS, values))]
+            for season, week, values in zip(
+                games['season'].tolist(),
+                games['week'].tolist(),
+                games[list(FEATURE_STATS)].to_numpy().tolist()
+            )
+        ]
+        rows.append(PlayerFeatures(
+            player_id=player_id,
+            games=len(recent_games),
+            recent_games=recent_games,
+            features=_compute_features(recent_games)
+        ))
+    
+    with transaction.atomic():
+        stale = PlayerFeatures.objects.all()
+        if player_ids is not None:
+            stale = stale.filter(player_id__in=player_ids)
+        stale.delete()
+        PlayerFeatures.objects.bulk_create(rows, batch_size=500)
+    
+    return len(rows)
+
+
+def record_game(game: PlayerGameStats):
+    """
+    Fold a saved (new or updated) game into its player's running window.
+    """
+    if game.season_type != 'REG':
+        return
+    
+    with transaction.atomic():
+        row = PlayerFeatures.objects.select_for_update().filter(player_id=game.player_id).first()
+        if row is None:
+            # No window yet: start one from the player's games
+            rebuild_player_features([game.player_id])
+            return
+        
+        key = [game.season, game.week]
+        window = [entry for entry in row.recent_games if entry[:2] != key]
+        replaced = len(window) < len(row.recent_games)
+        if not replaced and len(window) >= HISTORY_GAMES and key < window[0][:2]:
+            # Older than every game in a full window: can't change the features
+            return
+        
+        window.append([game.season, game.week, _game_values(game)])
+        window.sort(key=lambda entry: (entry[0], entry[1]))
+        row.recent_games = window[-HISTORY_GAMES:]
+        row.games = len(row.recent_games)
+        row.features = _compute_features(row.recent_games)
+        row.save()
+
+
+def forget_game(game: PlayerGameStats):
+    """
+    Update a player's window after one of their games was deleted.
+    """
+    if game.season_type != 'REG':
+        return
+    
+    row = PlayerFeatures.objects.filter(player_id=game.player_id).first()
+    if row is not None and [game.season, game.week] not in [entry[:2] for entry in row.recent_games]:
+        return
+    
+    # An older game moves into the window: refetch once the delete is committed
+    # (and after a cascading player delete, when there is nothing left to rebuild)
+    player_id = game.player_id
+    transaction.on_commit(lambda: rebuild_player_features([player_id]))
+
+
+def get_rolling_features(player: Player) -> Optional[RollingFeatures]:
+    """
+    Get a player's stored rolling features (one primary-key lookup).
+    
+    Returns:
+        RollingFeatures, or None if the player has no row
+    """
+    row = PlayerFeatures.objects.filter(player_id=player.player_id).only('games', 'features').first()
+    if row is None:
+        return None
+    return RollingFeatures(values=row.features, games=row.games)
+
+
+def get_player_form(player: Player) -> Union[RollingFeatures, pd.DataFrame]:
+    """
+    Get what predictions need about a player's recent form: their stored
+    rolling features, or (without a stored row, or with ML_USE_FEATURE_STORE
+    off) their recent games.
+    """
+    if settings.ML_USE_FEATURE_STORE:
+        features = get_rolling_features(player)
+        if features is not None:
+            return features
+    return get_player_recent_games(player, num_games=HISTORY_GAMES)
+
+
+def get_players_form(players: Iterable[Player]) -> Dict[str, Union[RollingFeatures, pd.DataFrame]]:
+    """
+    get_player_form for many players: one query for the stored rows and one
+    (get_recent_games_for_players) for players without one.
+    
+    Returns:
+        Dict of player_id -> RollingFeatures or recent games DataFrame (empty
+        for players without games)
+    """
+    player_ids = list(dict.fromkeys(player.player_id for player in players))
+    forms = {}
+    
+    if settings.ML_USE_FEATURE_STORE:
+        for player_id, games, features in PlayerFeatures.objects.filter(
+            player_id__in=player_ids
+        ).values_list('player_id', 'games', 'features'):
+            forms[player_id] = RollingFeatures(values=features, games=games)
+    
+    missing = [player_id for player_id in player_ids if player_id not in forms]
+    if missing:
+        histories = get_recent_games_for_players(missing, num_games=HISTORY_GAMES)
+        for player_id in missing:
+            forms[player_id] = histories.get(player_id, pd.DataFrame())
+    
+    return forms
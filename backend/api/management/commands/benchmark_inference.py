@@ -0,0 +1,130 @@
+"""
+Django management command to benchmark LightGBM inference by batch size and thread count.
+
+Prints the time per prediction for each (rows, threads) pair and the batch
+size at which multi-threaded prediction starts beating a single thread,
+which is what ML_BATCH_MIN_ROWS should be set to on that host.
+
+Usage:
+    python manage.py benchmark_inference
+    python manage.py benchmark_inference --position WR --stat receptions --threads 1 2 4 8
+    python manage.py benchmark_inference --rows 1 16 256 4096 --seconds 0.5
+"""
+
+import os
+import time
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from ml_service import ModelLoader
+from ml_service.inference_engine import BoosterPredictor, FAST_SINGLE_ROW_AVAILABLE
+
+
+class Command(BaseCommand):
+    help = 'Benchmark LightGBM prediction latency by batch size and thread count'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--position', type=str, default='QB', help='Model position (default: QB)')
+        parser.add_argument('--stat', type=str, default='passing_yards', help='Model stat (default: passing_yards)')
+        parser.add_argument(
+            '--rows',
+            nargs='+',
+            type=int,
+            default=[1, 4, 16, 64, 256, 1024, 4096],
+            help='Batch sizes to time',
+        )
+        parser.add_argument(
+            '--threads',
+            nargs='+',
+            type=int,
+            help='Thread counts to time (default: 1, 2, 4, ... up to the CPU count)',
+        )
+        parser.add_argument(
+            '--seconds',
+            type=float,
+            default=0.2,
+            help='Minimum time spent on each measurement',
+        )
+    
+    def _time_per_call(self, func, seconds):
+        """Best-of-3 average call time, each run lasting at least `seconds`."""
+        func()
+        best = float('inf')
+        for _ in range(3):
+            calls = 0
+            start = time.perf_counter()
+            while True:
+                func()
+                calls += 1
+                elapsed = time.perf_counter() - start
+                if elapsed >= seconds:
+                    break
+            best = min(best, elapsed / calls)
+        return best
+    
+    def handle(self, *args, **options):
+        cpu_count = os.cpu_count() or 1
+        threads = options['threads']
+        if not threads:
+            threads = [1]
+            while threads[-1] * 2 <= cpu_count:
+                threads.append(threads[-1] * 2)
+        # A single thread is always the baseline
+        threads = sorted(set(threads) | {1})
+        
+        loader = ModelLoader()
+        try:
+            model, _ = loader.get_model(options['position'], options['stat'], 'q50')
+        except (ValueError, FileNotFoundError) as e:
+            raise CommandError(str(e))
+        booster = model.booster
+        # Time the opt-in single-row fast path (ML_LIGHTGBM_FAST_SINGLE_ROW) where available
+        fast_model = BoosterPredictor(booster, fast_single_row=FAST_SINGLE_ROW_AVAILABLE)
+        
+        self.stdout.write(self.style.SUCCESS('=' * 70))
+        self.stdout.write(self.style.SUCCESS(
+            f"LIGHTGBM INFERENCE BENCHMARK: {options['position']}_{options['stat']}_q50, "
+            f"{booster.num_feature()} features, {booster.num_trees()} trees, {cpu_count} CPUs"
+        ))
+        self.stdout.write(self.style.SUCCESS('=' * 70))
+        
+        header = f"{'rows':>6} | " + ' | '.join(f"{f'{t} thr':>12}" for t in threads) + f" | {'fast path':>12}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        
+        rng = np.random.default_rng(0)
+        crossover = None
+        
+        for rows in options['rows']:
+            features = np.ascontiguousarray(rng.random((rows, booster.num_feature())) * 100)
+            
+            # Microseconds per row for each thread count
+            timings = {
+                t: self._time_per_call(lambda: booster.predict(features, num_threads=t), options['seconds'])
+                / rows * 1e6
+                for t in threads
+            }
+            cells = [f"{timings[t]:>9.2f} us" for t in threads]
+            
+            if rows == 1 and fast_model.fast_path:
+                fast = self._time_per_call(lambda: fast_model.predict(features), options['seconds']) * 1e6
+                cells.append(f"{fast:>9.2f} us")
+            else:
+                cells.append(f"{'-':>12}")
+            
+            self.stdout.write(f"{rows:>6} | " + ' | '.join(cells))
+            
+            best_threads = min(timings, key=timings.get)
+            if crossover is None and best_threads > 1 and timings[best_threads] < timings[1] * 0.9:
+                crossover = (rows, best_threads)
+        
+        self.stdout.write('')
+        if crossover:
+            self.stdout.write(self.style.SUCCESS(
+                f"Multi-threading pays off from {crossover[0]} rows ({crossover[1]} threads >10% faster "
+                f"per row). Suggested: ML_BATCH_MIN_ROWS={crossover[0]} ML_BATCH_THREADS={crossover[1]}"
+            ))
+        else:
+            self.stdout.write(self.style.WARNING(
+                'A single thread was fastest (or within 10%) at every batch size tested; '
+                'keep ML_SINGLE_ROW_THREADS=1 and raise ML_BATCH_MIN_ROWS.'
+            ))
@@ -0,0 +1,75 @@
+"""
+Django management command to benchmark load_player_data's CSV row conversion.
+
+Converts the 2024 player stats CSVs in machine_learning/datasets both ways:
+cell by cell with the loader's per-row game_stats_data over df.iterrows()
+(how it used to load) and a column at a time (game_stats_records). It checks
+that the rows are identical and prints rows/s for each. No database access.
+
+The 2024 files hold season totals, so the weekly columns the loader reads
+(week, team, opponent_team) are filled in from the season-level ones.
+
+Usage:
+    python manage.py benchmark_loader
+    python manage.py benchmark_loader --repeat 10
+"""
+
+import time
+from pathlib import Path
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+from api.management.commands.load_player_data import Command as LoadPlayerData, GAME_FIELDS
+
+DATASETS_DIR = Path(__file__).parent.parent.parent.parent.parent / "machine_learning" / "datasets"
+
+
+def convert_per_row(df):
+    """Reference conversion: the loader's per-row game_stats_data over df.iterrows()."""
+    loader = LoadPlayerData()
+    records = []
+    for _, row in df.iterrows():
+        values = loader.game_stats_data(row)
+        records.append(tuple(values[field] for field in GAME_FIELDS))
+    return records
+
+
+class Command(BaseCommand):
+    help = "Benchmark per-row vs column-level CSV conversion in load_player_data"
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=1,
+            help='Stack the 2024 rows this many times for a larger sample (default: 1)',
+        )
+    
+    def handle(self, *args, **options):
+        files = sorted(DATASETS_DIR.glob('stats_player_*_2024.csv'))
+        if not files:
+            raise CommandError(f"No 2024 player stats CSVs found in {DATASETS_DIR}")
+        
+        frames = []
+        for path in files:
+            df = pd.read_csv(path)
+            df = df[df['position'].isin(['QB', 'RB', 'WR', 'TE'])]
+            frames.append(df.assign(week=1, team=df['recent_team'], opponent_team=None))
+            self.stdout.write(f'  {path.name}: {len(df)} rows')
+        df = pd.concat(frames * max(1, options['repeat']), ignore_index=True)
+        
+        start = time.perf_counter()
+        expected = convert_per_row(df)
+        per_row = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        records = LoadPlayerData.game_stats_records(df)
+        vectorized = time.perf_counter() - start
+        
+        if records != expected:
+            raise CommandError("Column-level conversion differs from the per-row conversion")
+        
+        self.stdout.write(f'Per-row:      {per_row * 1000:8.1f} ms  {len(df) / per_row:12,.0f} rows/s')
+        self.stdout.write(f'Column-level: {vectorized * 1000:8.1f} ms  {len(df) / vectorized:12,.0f} rows/s')
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(df)} identical rows, {per_row / vectorized:.0f}x faster"
+        ))
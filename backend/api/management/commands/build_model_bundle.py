@@ -0,0 +1,147 @@
+"""
+Django management command to pack the quantile models into one memory-mappable bundle.
+
+Writes models.bundle (see ml_service/model_bundle.py) into the model
+directory. Served with ML_INFERENCE_BACKEND=numpy, every worker maps the
+same file instead of unpickling its own copy of each model.
+
+With --compare, loads all models in fresh processes through the joblib
+path and through the bundle and prints startup time and memory for each.
+
+Usage:
+    python manage.py build_model_bundle
+    python manage.py build_model_bundle --models-dir /path/to/models --compare
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ml_service.model_bundle import ModelBundle
+
+# Run in a fresh interpreter per backend, so neither sees the other's pages
+MEASURE_SCRIPT = """
+import json, sys, time
+import numpy as np
+
+def memory():
+    # Resident and private anonymous (heap) memory in bytes
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            name, _, rest = line.partition(':')
+            if name in ('Rss', 'Anonymous'):
+                values[name] = int(rest.split()[0]) * 1024
+    return values
+
+from ml_service.model_loader import ModelLoader
+from ml_service.inference_engine import InferenceEngine
+
+before = memory()
+start = time.perf_counter()
+loader = ModelLoader(sys.argv[1], inference_backend=sys.argv[2])
+engine = InferenceEngine()
+combos = sorted({(position, stat) for position, stat, _ in loader.available_models()})
+for position, stat in combos:
+    models = loader.get_all_quantile_models(position, stat)
+    features = np.zeros((1, len(next(iter(models.values()))[1])))
+    engine.predict_quantiles(models, features)
+elapsed = time.perf_counter() - start
+after = memory()
+
+print(json.dumps({
+    'seconds': elapsed,
+    'models': len(loader.get_cache_info()['cached_models']),
+    'rss': after['Rss'] - before['Rss'],
+    'private': after['Anonymous'] - before['Anonymous'],
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = 'Pack the quantile models and feature schemas into a single memory-mappable models.bundle'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--models-dir',
+            type=str,
+            default=str(Path(settings.BASE_DIR) / 'ml_service'),
+            help='Model bundle directory (default: backend/ml_service)',
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Bundle path (default: <models-dir>/models.bundle)',
+        )
+        parser.add_argument(
+            '--model-version',
+            type=str,
+            help='Version name (default: training date from model_metadata.joblib)',
+        )
+        parser.add_argument(
+            '--compare',
+            action='store_true',
+            help='Compare startup time and memory of joblib loading vs the bundle (Linux only)',
+        )
+    
+    def handle(self, *args, **options):
+        models_dir = Path(options['models_dir'])
+        
+        if not (models_dir / 'feature_columns.joblib').exists():
+            raise CommandError(f"feature_columns.joblib not found in {models_dir}")
+        
+        try:
+            output = ModelBundle.build(models_dir, output=options['output'], version=options['model_version'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        bundle = ModelBundle(output)
+        
+        joblib_bytes = sum(path.stat().st_size for path in models_dir.glob('*_q[0-9][0-9].joblib'))
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {output} ({len(bundle.model_keys())} models, {output.stat().st_size / 1024:.0f} KB, "
+            f"from {joblib_bytes / 1024:.0f} KB of joblib files; version {bundle.version})"
+        ))
+        
+        if options['compare']:
+            if options['output'] and Path(options['output']).parent != models_dir:
+                raise CommandError('--compare needs the bundle inside --models-dir')
+            self._compare(models_dir)
+    
+    def _measure(self, models_dir: Path, backend: str) -> dict:
+        """Load and run every model in a fresh process."""
+        result = subprocess.run(
+            [sys.executable, '-c', MEASURE_SCRIPT, str(models_dir), backend],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Measuring the {backend} backend failed:\n{result.stderr}")
+        return json.loads(result.stdout.strip().splitlines()[-1])
+    
+    def _compare(self, models_dir: Path):
+        """Print startup time and memory for joblib loading vs the mapped bundle."""
+        if not Path('/proc/self/smaps_rollup').exists():
+            raise CommandError('--compare reads /proc/self/smaps_rollup and needs Linux')
+        
+        rows = [
+            ('joblib.load (lightgbm)', self._measure(models_dir, 'lightgbm')),
+            ('models.bundle (numpy)', self._measure(models_dir, 'numpy')),
+        ]
+        
+        self.stdout.write('')
+        header = f"{'path':<24} | {'models':>6} | {'startup':>9} | {'RSS':>9} | {'private':>9}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name, result in rows:
+            self.stdout.write(
+                f"{name:<24} | {result['models']:>6} | {result['seconds'] * 1000:>6.0f} ms | "
+                f"{result['rss'] / 2**20:>6.1f} MB | {result['private'] / 2**20:>6.1f} MB"
+            )
+        self.stdout.write(
+            'RSS and private are growth while loading and running every model once; '
+            'private (anonymous) memory is what each additional worker pays, the rest '
+            'is file-backed and shared through the page cache.'
+        )
@@ -0,0 +1,80 @@
+"""
+Django management command to generate manifest.json for a model bundle.
+
+Run it whenever the model files change outside the model registry (which
+writes a manifest on publish), and commit it with the models: ModelLoader
+rejects model files that don't match it. --check only verifies the existing
+manifest (the test suite runs it on the bundled models).
+
+Usage:
+    python manage.py build_model_manifest
+    python manage.py build_model_manifest --models-dir /path/to/models --model-version 2025-11-02
+    python manage.py build_model_manifest --check
+"""
+
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ml_service.model_manifest import ModelManifest, MANIFEST_FILENAME
+
+
+class Command(BaseCommand):
+    help = 'Generate manifest.json (sizes, checksums, feature-schema hashes) for a model bundle'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--models-dir',
+            type=str,
+            default=str(Path(settings.BASE_DIR) / 'ml_service'),
+            help='Model bundle directory (default: backend/ml_service)',
+        )
+        parser.add_argument(
+            '--model-version',
+            type=str,
+            help='Version name (default: training date from model_metadata.joblib)',
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Fail if the existing manifest is missing or out of date instead of writing one',
+        )
+    
+    def handle(self, *args, **options):
+        models_dir = Path(options['models_dir'])
+        
+        if not (models_dir / 'feature_columns.joblib').exists():
+            raise CommandError(f"feature_columns.joblib not found in {models_dir}")
+        
+        manifest = ModelManifest.build(models_dir, version=options['model_version'])
+        
+        if options['check']:
+            existing = ModelManifest.load(models_dir)
+            if existing is None:
+                raise CommandError(f"No {MANIFEST_FILENAME} in {models_dir}")
+            stale = existing.differences(manifest)
+            if stale:
+                raise CommandError(
+                    f"{MANIFEST_FILENAME} in {models_dir} is out of date for: {', '.join(stale)}. "
+                    f"Regenerate it with: python manage.py build_model_manifest"
+                )
+            self.stdout.write(self.style.SUCCESS(
+                f"{MANIFEST_FILENAME} matches the {len(manifest.models)} models in {models_dir}"
+            ))
+            return
+        
+        manifest_file = manifest.write(models_dir)
+        
+        # Flag models whose own feature names disagree with feature_columns.joblib
+        for model_key, entry in sorted(manifest.models.items()):
+            expected = manifest.feature_schemas.get(f"{entry['position']}_{entry['stat']}")
+            if entry['feature_schema_hash'] and entry['feature_schema_hash'] != expected:
+                self.stdout.write(self.style.WARNING(
+                    f"{model_key}: feature schema does not match feature_columns.joblib "
+                    f"(the model will be rejected at load time)"
+                ))
+        
+        total_bytes = sum(entry['size_bytes'] for entry in manifest.models.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {manifest_file} ({len(manifest.models)} models, {total_bytes / 1024:.0f} KB, "
+            f"version {manifest.version})"
+        ))
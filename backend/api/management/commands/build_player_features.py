@@ -0,0 +1,34 @@
+"""
+Django management command to (re)build the rolling-feature store from game stats.
+
+Saving and deleting PlayerGameStats keeps PlayerFeatures up to date on its
+own; run this once to fill the store for data loaded before it existed,
+or after writes that skip model signals (raw SQL, fixtures, bulk_create).
+
+Usage:
+    python manage.py build_player_features
+    python manage.py build_player_features --players 00-0033873 00-0036355
+"""
+
+import time
+from django.core.management.base import BaseCommand
+from api.feature_store import rebuild_player_features
+
+
+class Command(BaseCommand):
+    help = "Rebuild players' stored rolling form features (PlayerFeatures) from their games"
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--players',
+            nargs='+',
+            type=str,
+            help='Player IDs to rebuild (default: every player)',
+        )
+    
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        count = rebuild_player_features(options['players'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored rolling features for {count} players in {time.perf_counter() - start:.1f}s"
+        ))
@@ -0,0 +1,35 @@
+"""
+Django management command to (re)build the team-week totals from game stats.
+
+load_player_data rebuilds the seasons it loads and saving or deleting
+PlayerGameStats keeps TeamWeekStats up to date on its own; run this once to
+fill the table for data loaded before it existed, or after writes that skip
+model signals (raw SQL, fixtures, bulk_create).
+
+Usage:
+    python manage.py build_team_week_stats
+    python manage.py build_team_week_stats --seasons 2024 2025
+"""
+
+import time
+from django.core.management.base import BaseCommand
+from api.team_stats import rebuild_team_week_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild teams' per-week passing/rushing/receiving totals (TeamWeekStats) from game stats"
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seasons',
+            nargs='+',
+            type=int,
+            help='Seasons to rebuild (default: every season)',
+        )
+    
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        count = rebuild_team_week_stats(options['seasons'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {count} team-week totals in {time.perf_counter() - start:.1f}s"
+        ))
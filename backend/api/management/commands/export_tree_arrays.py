@@ -0,0 +1,70 @@
+"""
+Django management command to export the quantile models as flattened tree arrays.
+
+Writes one .npz per model into <models-dir>/trees/, for the NumPy inference
+backend (ML_INFERENCE_BACKEND=numpy). Each file records the checksum of the
+joblib it came from, so arrays left over from an older model are ignored.
+
+Usage:
+    python manage.py export_tree_arrays
+    python manage.py export_tree_arrays --models-dir /path/to/models
+"""
+
+import io
+from pathlib import Path
+import joblib
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ml_service.constants import get_model_filename, POSITION_STATS, QUANTILES
+from ml_service.inference_engine import extract_booster
+from ml_service.model_manifest import file_sha256
+from ml_service.tree_evaluator import TreeEnsemble, TREE_ARRAYS_DIR
+
+
+class Command(BaseCommand):
+    help = 'Export the quantile models as flattened NumPy tree arrays (.npz)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--models-dir',
+            type=str,
+            default=str(Path(settings.BASE_DIR) / 'ml_service'),
+            help='Model bundle directory (default: backend/ml_service)',
+        )
+    
+    def handle(self, *args, **options):
+        models_dir = Path(options['models_dir'])
+        if not models_dir.is_dir():
+            raise CommandError(f"{models_dir} is not a directory")
+        
+        output_dir = models_dir / TREE_ARRAYS_DIR
+        output_dir.mkdir(exist_ok=True)
+        
+        exported = 0
+        model_bytes = array_bytes = 0
+        for position, stats in POSITION_STATS.items():
+            for stat in stats:
+                for quantile in QUANTILES.keys():
+                    model_path = models_dir / get_model_filename(position, stat, quantile)
+                    if not model_path.exists():
+                        continue
+                    
+                    data = model_path.read_bytes()
+                    booster = extract_booster(joblib.load(io.BytesIO(data)))
+                    try:
+                        ensemble = TreeEnsemble.from_booster(booster, source_sha256=file_sha256(data))
+                    except ValueError as e:
+                        raise CommandError(f"{model_path.name}: {e}")
+                    
+                    ensemble.save(output_dir / f"{position}_{stat}_{quantile}.npz")
+                    exported += 1
+                    model_bytes += len(data)
+                    array_bytes += ensemble.nbytes
+        
+        if not exported:
+            raise CommandError(f"No model files found in {models_dir}")
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {exported} models to {output_dir} "
+            f"({array_bytes / 1024:.0f} KB of tree arrays, from {model_bytes / 1024:.0f} KB of joblib files)"
+        ))
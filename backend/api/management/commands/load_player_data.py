@@ -1,19 +1,54 @@
 """
 Django management command to load player and game stats from CSV files.
 
+CSV rows are converted a column at a time (fillna/astype and team name
+mappings, see game_stats_records and player_records) and upserted in
+batches, each batch one INSERT ... ON CONFLICT DO UPDATE in a transaction.
+Game stats are loaded for players already in the database.
+Per-game signal handlers are skipped while loading; the derived tables
+(rolling features, team-week totals, season calendar) are rebuilt once at
+the end.
+
 Usage:
     python manage.py load_player_data
     python manage.py load_player_data --years 2024 2025
     python manage.py load_player_data --skip-players
+    python manage.py load_player_data --batch-size 5000
 """
 
 import os
+import time
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from api.models import Player, PlayerGameStats
 from api.constants import standardize_team_name
+from api.data_access import forget_projections
+from api.feature_store import rebuild_player_features
+from api.season_calendar import rebuild_season_calendar
+from api.signals import deferred_updates
+from api.team_stats import load_team_game_csv, rebuild_team_week_stats
+
+# PlayerGameStats fields read from the weekly CSV column of the same name
+GAME_INT_FIELDS = [
+    # Passing stats
+    'completions', 'attempts', 'passing_yards', 'passing_tds', 'passing_interceptions',
+    'sacks_suffered', 'passing_2pt_conversions',
+    # Rushing stats
+    'carries', 'rushing_yards', 'rushing_tds', 'rushing_fumbles', 'rushing_fumbles_lost',
+    'rushing_first_downs', 'rushing_2pt_conversions',
+    # Receiving stats
+    'receptions', 'targets', 'receiving_yards', 'receiving_tds', 'receiving_fumbles',
+    'receiving_fumbles_lost', 'receiving_first_downs', 'receiving_2pt_conversions',
+    'receiving_air_yards', 'receiving_yards_after_catch',
+]
+GAME_FLOAT_FIELDS = ['passing_epa', 'rushing_epa', 'receiving_epa', 'fantasy_points', 'fantasy_points_ppr']
+GAME_FIELDS = ['season', 'week', 'season_type', 'team', 'opponent_team'] + GAME_INT_FIELDS + GAME_FLOAT_FIELDS
+
+# players.csv status -> Player.status (anything else is 'UNK')
+PLAYER_STATUSES = {'ACT': 'ACT', 'CUT': 'CUT', 'DEV': 'DEV', 'RES': 'RES', 'RET': 'RET'}
 
 
 class Command(BaseCommand):
@@ -36,6 +71,12 @@ class Command(BaseCommand):
             action='store_true',
             help='Clear existing data before importing',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Game stat rows upserted per transaction (default: 2000)',
+        )
     
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS('=' * 70))
@@ -47,28 +88,37 @@ class Command(BaseCommand):
         datasets_dir = base_dir / "machine_learning" / "datasets"
         players_file = datasets_dir / "players.csv"
         stats_dir = datasets_dir / "player_weekly_stats"
+        team_stats_dir = datasets_dir / "team_season_stats"
         
         # Check if directories exist
         if not datasets_dir.exists():
             self.stdout.write(self.style.ERROR(f"Datasets directory not found: {datasets_dir}"))
             return
         
-        # Clear existing data if requested
-        if options['clear']:
-            self.stdout.write(self.style.WARNING('Clearing existing data...'))
-            PlayerGameStats.objects.all().delete()
-            Player.objects.all().delete()
-            self.stdout.write(self.style.SUCCESS('Existing data cleared'))
+        years = options.get('years') or range(2019, 2026)  # 2019-2025
         
-        # Load players
-        if not options['skip_players']:
-            self.load_players(players_file)
-        else:
-            self.stdout.write(self.style.WARNING('Skipping players.csv'))
+        # Derived tables are rebuilt once below instead of per game
+        with deferred_updates():
+            # Clear existing data if requested
+            if options['clear']:
+                self.stdout.write(self.style.WARNING('Clearing existing data...'))
+                PlayerGameStats.objects.all().delete()
+                Player.objects.all().delete()
+                self.stdout.write(self.style.SUCCESS('Existing data cleared'))
+            
+            # Load players
+            if not options['skip_players']:
+                self.load_players(players_file)
+            else:
+                self.stdout.write(self.style.WARNING('Skipping players.csv'))
+            
+            # Load game stats
+            loaded_player_ids = self.load_game_stats(stats_dir, years, options['batch_size'])
         
-        # Load game stats
-        years = options.get('years') or range(2019, 2026)  # 2019-2025
-        self.load_game_stats(stats_dir, years)
+        # Team game stats (the team context the models were trained with)
+        self.load_team_stats(team_stats_dir, years)
+        
+        self.rebuild_derived_tables(years, loaded_player_ids, cleared=options['clear'])
         
         # Print summary
         self.print_summary()
@@ -94,65 +144,49 @@ class Command(BaseCommand):
         df = df[df['position'].isin(model_positions)]
         self.stdout.write(f'Filtered to {len(df)} players (QB/RB/WR/TE only)')
         
-        # Import players
-        created_count = 0
-        updated_count = 0
-        skipped_count = 0
-        
-        for index, row in df.iterrows():
-            try:
-                player_id = row['gsis_id']
-                
-                # Skip if no player_id
-                if pd.isna(player_id):
-                    skipped_count += 1
-                    continue
-                
-                # Prepare player data
-                player_data = {
-                    'display_name': row.get('display_name', ''),
-                    'short_name': row.get('short_name') if pd.notna(row.get('short_name')) else None,
-                    'first_name': row.get('first_name', ''),
-                    'last_name': row.get('last_name', ''),
-                    'position': row['position'],
-                    'current_team': row.get('latest_team') if pd.notna(row.get('latest_team')) else None,
-                    'jersey_number': int(row['jersey_number']) if pd.notna(row.get('jersey_number')) else None,
-                    'status': self.map_status(row.get('status')),
-                    'headshot_url': row.get('headshot') if pd.notna(row.get('headshot')) else None,
-                    'rookie_season': int(row['rookie_season']) if pd.notna(row.get('rookie_season')) else None,
-                    'last_season': int(row['last_season']) if pd.notna(row.get('last_season')) else None,
-                }
-                
-                # Create or update player
-                player, created = Player.objects.update_or_create(
-                    player_id=player_id,
-                    defaults=player_data
-                )
-                
-                if created:
-                    created_count += 1
-                else:
-                    updated_count += 1
-                
-                # Progress indicator
-                if (index + 1) % 100 == 0:
-                    self.stdout.write(f'  Processed {index + 1}/{len(df)} players...', ending='\\r')
-            
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f'\\nError processing player {row.get("display_name")}: {e}'))
-                skipped_count += 1
-                continue
+        # Skip rows without a player_id
+        skipped_count = int(df['gsis_id'].isna().sum())
+        df = df[df['gsis_id'].notna()]
+        
+        # Convert whole columns, then upsert in batches
+        existing_ids = set(Player.objects.values_list('player_id', flat=True))
+        fields, records = self.player_records(df)
+        players = {}
+        for values in records:
+            player = dict(zip(fields, values))
+            players[player['player_id']] = Player(**player)
         
-        self.stdout.write(f'\\n{self.style.SUCCESS("Players imported successfully!")}')
+        with transaction.atomic():
+            Player.objects.bulk_create(
+                list(players.values()),
+                batch_size=2000,
+                update_conflicts=True,
+                unique_fields=['player_id'],
+                update_fields=[field for field in fields if field != 'player_id'] + ['updated_at']
+            )
+        
+        created_count = len(players.keys() - existing_ids)
+        updated_count = len(players) - created_count
+        
+        self.stdout.write(f'\n{self.style.SUCCESS("Players imported successfully!")}')
         self.stdout.write(f'  Created: {created_count}')
         self.stdout.write(f'  Updated: {updated_count}')
         self.stdout.write(f'  Skipped: {skipped_count}')
     
-    def load_game_stats(self, stats_dir, years):
-        """Load game stats from weekly CSV files."""
-        self.stdout.write(self.style.WARNING(f'\\nLoading game stats for years: {list(years)}'))
+    def load_game_stats(self, stats_dir, years, batch_size=2000):
+        """
+        Load game stats from weekly CSV files.
+        
+        Returns:
+            Set of player_ids with games in the loaded files
+        """
+        self.stdout.write(self.style.WARNING(f'\nLoading game stats for years: {list(years)}'))
         
         model_positions = ['QB', 'RB', 'WR', 'TE']
+        
+        # Valid players, fetched once instead of one lookup per row
+        known_player_ids = set(Player.objects.values_list('player_id', flat=True))
+        loaded_player_ids = set()
         total_created = 0
         total_updated = 0
         total_skipped = 0
@@ -164,7 +198,8 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.WARNING(f'  Skipping {year}: File not found'))
                 continue
             
-            self.stdout.write(f'\\n  Loading {year}...')
+            self.stdout.write(f'\n  Loading {year}...')
+            start = time.perf_counter()
             
             # Read CSV
             df = pd.read_csv(stats_file)
@@ -173,106 +208,193 @@ class Command(BaseCommand):
             df = df[df['position'].isin(model_positions)]
             self.stdout.write(f'    Found {len(df)} records for QB/RB/WR/TE')
             
-            # Process each game
-            created_count = 0
-            updated_count = 0
-            skipped_count = 0
+            # Skip rows without a player in the database
+            # (not QB/RB/WR/TE or not in players.csv) or without a season/week
+            valid = (
+                df['player_id'].isin(known_player_ids)
+                & pd.to_numeric(df['season'], errors='coerce').notna()
+                & pd.to_numeric(df['week'], errors='coerce').notna()
+            )
+            skipped_count = int((~valid).sum())
+            df = df[valid]
             
-            for index, row in df.iterrows():
-                try:
-                    player_id = row['player_id']
-                    
-                    # Skip if no player_id
-                    if pd.isna(player_id):
-                        skipped_count += 1
-                        continue
-                    
-                    # Try to get player from database
-                    try:
-                        player = Player.objects.get(player_id=player_id)
-                    except Player.DoesNotExist:
-                        # Player not in database (not QB/RB/WR/TE or not in players.csv)
-                        skipped_count += 1
-                        continue
-                    
-                    # Prepare game stats data
-                    stats_data = {
-                        'season': int(row['season']),
-                        'week': int(row['week']),
-                        'season_type': row['season_type'],
-                        'team': standardize_team_name(row['team']) if pd.notna(row['team']) else '',
-                        'opponent_team': standardize_team_name(row['opponent_team']) if pd.notna(row['opponent_team']) else '',
-                        
-                        # Passing stats
-                        'completions': self.safe_int(row.get('completions')),
-                        'attempts': self.safe_int(row.get('attempts')),
-                        'passing_yards': self.safe_int(row.get('passing_yards')),
-                        'passing_tds': self.safe_int(row.get('passing_tds')),
-                        'passing_interceptions': self.safe_int(row.get('passing_interceptions')),
-                        'sacks_suffered': self.safe_int(row.get('sacks_suffered')),
-                        'passing_epa': self.safe_float(row.get('passing_epa')),
-                        'passing_2pt_conversions': self.safe_int(row.get('passing_2pt_conversions')),
-                        
-                        # Rushing stats
-                        'carries': self.safe_int(row.get('carries')),
-                        'rushing_yards': self.safe_int(row.get('rushing_yards')),
-                        'rushing_tds': self.safe_int(row.get('rushing_tds')),
-                        'rushing_fumbles': self.safe_int(row.get('rushing_fumbles')),
-                        'rushing_fumbles_lost': self.safe_int(row.get('rushing_fumbles_lost')),
-                        'rushing_first_downs': self.safe_int(row.get('rushing_first_downs')),
-                        'rushing_epa': self.safe_float(row.get('rushing_epa')),
-                        'rushing_2pt_conversions': self.safe_int(row.get('rushing_2pt_conversions')),
-                        
-                        # Receiving stats
-                        'receptions': self.safe_int(row.get('receptions')),
-                        'targets': self.safe_int(row.get('targets')),
-                        'receiving_yards': self.safe_int(row.get('receiving_yards')),
-                        'receiving_tds': self.safe_int(row.get('receiving_tds')),
-                        'receiving_fumbles': self.safe_int(row.get('receiving_fumbles')),
-                        'receiving_fumbles_lost': self.safe_int(row.get('receiving_fumbles_lost')),
-                        'receiving_first_downs': self.safe_int(row.get('receiving_first_downs')),
-                        'receiving_epa': self.safe_float(row.get('receiving_epa')),
-                        'receiving_2pt_conversions': self.safe_int(row.get('receiving_2pt_conversions')),
-                        'receiving_air_yards': self.safe_int(row.get('receiving_air_yards')),
-                        'receiving_yards_after_catch': self.safe_int(row.get('receiving_yards_after_catch')),
-                        
-                        # Fantasy points
-                        'fantasy_points': self.safe_float(row.get('fantasy_points')),
-                        'fantasy_points_ppr': self.safe_float(row.get('fantasy_points_ppr')),
-                    }
-                    
-                    # Create or update game stats
-                    game_stats, created = PlayerGameStats.objects.update_or_create(
-                        player=player,
-                        season=stats_data['season'],
-                        week=stats_data['week'],
-                        season_type=stats_data['season_type'],
-                        defaults=stats_data
-                    )
-                    
-                    if created:
-                        created_count += 1
-                    else:
-                        updated_count += 1
-                    
-                    # Progress indicator
-                    if (index + 1) % 200 == 0:
-                        self.stdout.write(f'      Processed {index + 1}/{len(df)} records...', ending='\\r')
-                
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(f'\\n      Error processing record: {e}'))
-                    skipped_count += 1
-                    continue
+            # Build the rows, keyed so a repeated game keeps its last row
+            games = {}
+            for player_id, values in zip(df['player_id'].tolist(), self.game_stats_records(df)):
+                stats_data = dict(zip(GAME_FIELDS, values))
+                key = (player_id, stats_data['season'], stats_data['week'], stats_data['season_type'])
+                games[key] = PlayerGameStats(player_id=player_id, **stats_data)
             
-            self.stdout.write(f'\\n    {year}: Created {created_count}, Updated {updated_count}, Skipped {skipped_count}')
+            existing = PlayerGameStats.objects.filter(season=year).count()
+            self.upsert_game_stats(list(games.values()), batch_size)
+            created_count = PlayerGameStats.objects.filter(season=year).count() - existing
+            updated_count = len(games) - created_count
+            loaded_player_ids.update(player_id for player_id, _, _, _ in games)
+            
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f'    {year}: Created {created_count}, Updated {updated_count}, Skipped {skipped_count} '
+                f'({len(games) / max(elapsed, 1e-9):,.0f} rows/s)'
+            )
             total_created += created_count
             total_updated += updated_count
             total_skipped += skipped_count
         
-        self.stdout.write(f'\\n{self.style.SUCCESS("Game stats imported successfully!")}')
+        self.stdout.write(f'\n{self.style.SUCCESS("Game stats imported successfully!")}')
         self.stdout.write(f'  Total Created: {total_created}')
         self.stdout.write(f'  Total Updated: {total_updated}')
         self.stdout.write(f'  Total Skipped: {total_skipped}')
+        
+        return loaded_player_ids
+    
+    @staticmethod
+    def upsert_game_stats(games, batch_size):
+        """
+        Insert game stats, updating rows that already exist for the same
+        (player, season, week, season_type), batch_size rows per transaction.
+        """
+        update_fields = [
+            field.name for field in PlayerGameStats._meta.concrete_fields
+            if field.name not in ('id', 'player', 'season', 'week', 'season_type', 'created_at')
+        ]
+        for start in range(0, len(games), batch_size):
+            with transaction.atomic():
+                PlayerGameStats.objects.bulk_create(
+                    games[start:start + batch_size],
+                    update_conflicts=True,
+                    unique_fields=['player', 'season', 'week', 'season_type'],
+                    update_fields=update_fields
+                )
+    
+    @classmethod
+    def game_stats_records(cls, df):
+        """
+        PlayerGameStats field values of weekly CSV rows, as one tuple per row
+        in GAME_FIELDS order, converted a column at a time.
+        """
+        columns = [
+            cls.int_column(df, 'season'),
+            cls.int_column(df, 'week'),
+            df['season_type'].tolist(),
+            cls.team_column(df, 'team'),
+            cls.team_column(df, 'opponent_team'),
+        ]
+        columns += [cls.int_column(df, field) for field in GAME_INT_FIELDS]
+        columns += [cls.float_column(df, field) for field in GAME_FLOAT_FIELDS]
+        return list(zip(*columns))
+    
+    def game_stats_data(self, row):
+        """
+        PlayerGameStats field values of one weekly CSV row, converted cell by
+        cell as the loader used to. game_stats_records converts whole columns
+        instead; this is kept as the reference it must match (benchmark_loader
+        and the tests compare the two).
+        """
+        return {
+            'season': int(row['season']),
+            'week': int(row['week']),
+            'season_type': row['season_type'],
+            'team': standardize_team_name(row['team']) if pd.notna(row['team']) else '',
+            'opponent_team': standardize_team_name(row['opponent_team']) if pd.notna(row['opponent_team']) else '',
+            
+            # Passing stats
+            'completions': self.safe_int(row.get('completions')),
+            'attempts': self.safe_int(row.get('attempts')),
+            'passing_yards': self.safe_int(row.get('passing_yards')),
+            'passing_tds': self.safe_int(row.get('passing_tds')),
+            'passing_interceptions': self.safe_int(row.get('passing_interceptions')),
+            'sacks_suffered': self.safe_int(row.get('sacks_suffered')),
+            'passing_epa': self.safe_float(row.get('passing_epa')),
+            'passing_2pt_conversions': self.safe_int(row.get('passing_2pt_conversions')),
+            
+            # Rushing stats
+            'carries': self.safe_int(row.get('carries')),
+            'rushing_yards': self.safe_int(row.get('rushing_yards')),
+            'rushing_tds': self.safe_int(row.get('rushing_tds')),
+            'rushing_fumbles': self.safe_int(row.get('rushing_fumbles')),
+            'rushing_fumbles_lost': self.safe_int(row.get('rushing_fumbles_lost')),
+            'rushing_first_downs': self.safe_int(row.get('rushing_first_downs')),
+            'rushing_epa': self.safe_float(row.get('rushing_epa')),
+            'rushing_2pt_conversions': self.safe_int(row.get('rushing_2pt_conversions')),
+            
+            # Receiving stats
+            'receptions': self.safe_int(row.get('receptions')),
+            'targets': self.safe_int(row.get('targets')),
+            'receiving_yards': self.safe_int(row.get('receiving_yards')),
+            'receiving_tds': self.safe_int(row.get('receiving_tds')),
+            'receiving_fumbles': self.safe_int(row.get('receiving_fumbles')),
+            'receiving_fumbles_lost': self.safe_int(row.get('receiving_fumbles_lost')),
+            'receiving_first_downs': self.safe_int(row.get('receiving_first_downs')),
+            'receiving_epa': self.safe_float(row.get('receiving_epa')),
+            'receiving_2pt_conversions': self.safe_int(row.get('receiving_2pt_conversions')),
+            'receiving_air_yards': self.safe_int(row.get('receiving_air_yards')),
+            'receiving_yards_after_catch': self.safe_int(row.get('receiving_yards_after_catch')),
+            
+            # Fantasy points
+            'fantasy_points': self.safe_float(row.get('fantasy_points')),
+            'fantasy_points_ppr': self.safe_float(row.get('fantasy_points_ppr')),
+        }
+    
+    @classmethod
+    def player_records(cls, df):
+        """
+        Player field values of players.csv rows, converted a column at a time.
+        
+        Returns:
+            Tuple of (field names, one tuple of values per row)
+        """
+        columns = {
+            'player_id': df['gsis_id'].tolist(),
+            'display_name': cls.text_column(df, 'display_name', ''),
+            'short_name': cls.text_column(df, 'short_name'),
+            'first_name': cls.text_column(df, 'first_name', ''),
+            'last_name': cls.text_column(df, 'last_name', ''),
+            'position': df['position'].tolist(),
+            'current_team': cls.text_column(df, 'latest_team'),
+            'jersey_number': cls.optional_int_column(df, 'jersey_number'),
+            'status': cls.map_status(df['status'] if 'status' in df else pd.Series(None, index=df.index)),
+            'headshot_url': cls.text_column(df, 'headshot'),
+            'rookie_season': cls.optional_int_column(df, 'rookie_season'),
+            'last_season': cls.optional_int_column(df, 'last_season'),
+        }
+        return list(columns), list(zip(*columns.values()))
+    
+    def rebuild_derived_tables(self, years, player_ids, cleared=False):
+        """Rebuild the tables derived from game stats, which the bulk load bypassed."""
+        # Rolling features of every player with new games (all players after --clear)
+        count = rebuild_player_features(None if cleared else player_ids)
+        self.stdout.write(f'\n{self.style.SUCCESS(f"Rolling features rebuilt: {count}")}')
+        
+        # Team totals for the loaded seasons, in one GROUP BY
+        count = rebuild_team_week_stats(None if cleared else years)
+        self.stdout.write(self.style.SUCCESS(f"Team-week totals rebuilt: {count}"))
+        
+        # Latest loaded week of each season type, which predictions start from
+        latest = rebuild_season_calendar()
+        self.stdout.write(self.style.SUCCESS(f'Season calendar: {latest}'))
+        
+        # Precomputed projections were made from the old games and team totals
+        count = forget_projections()
+        self.stdout.write(self.style.SUCCESS(f"Stale projections deleted: {count} (rerun precompute_projections)"))
+    
+    def load_team_stats(self, team_stats_dir, years):
+        """Load team game stats from team weekly CSV files."""
+        self.stdout.write(self.style.WARNING(f'\nLoading team game stats for years: {list(years)}'))
+        
+        total = 0
+        for year in years:
+            stats_file = team_stats_dir / f"stats_team_week_{year}.csv"
+            
+            if not stats_file.exists():
+                self.stdout.write(self.style.WARNING(f'  Skipping {year}: File not found'))
+                continue
+            
+            count = load_team_game_csv(stats_file)
+            self.stdout.write(f'    {year}: {count} team games')
+            total += count
+        
+        self.stdout.write(f'\n{self.style.SUCCESS("Team game stats imported successfully!")}')
+        self.stdout.write(f'  Total Team Games: {total}')
     
     def print_summary(self):
         """Print database summary."""
@@ -297,6 +419,56 @@ class Command(BaseCommand):
         for year_data in games_by_year:
             self.stdout.write(f'    {year_data["season"]}: {year_data["count"]} games')
     
+    @classmethod
+    def int_column(cls, df, name):
+        """Integer values of a column (missing column, NaN or unparsable: 0)."""
+        if name not in df:
+            return [0] * len(df)
+        column = df[name]
+        if pd.api.types.is_numeric_dtype(column):
+            # int() truncates toward zero, like safe_int
+            return np.trunc(column.fillna(0).to_numpy(dtype='float64')).astype('int64').tolist()
+        return column.map(cls.safe_int).tolist()
+    
+    @classmethod
+    def float_column(cls, df, name):
+        """Float values of a column (missing column, NaN or unparsable: None)."""
+        if name not in df:
+            return [None] * len(df)
+        column = df[name]
+        if not pd.api.types.is_numeric_dtype(column):
+            return column.map(cls.safe_float).tolist()
+        column = column.astype('float64')
+        return column.astype(object).where(column.notna(), None).tolist()
+    
+    @classmethod
+    def optional_int_column(cls, df, name):
+        """Integer values of a column, None where missing or NaN."""
+        if name not in df:
+            return [None] * len(df)
+        column = pd.to_numeric(df[name], errors='coerce')
+        return [None if pd.isna(value) else int(value) for value in column.tolist()]
+    
+    @staticmethod
+    def text_column(df, name, missing_column=None):
+        """
+        Values of a text column; NaN becomes None when the column has no
+        default for a missing column, otherwise values pass through as read.
+        """
+        if name not in df:
+            return [missing_column] * len(df)
+        column = df[name]
+        if missing_column is None:
+            column = column.astype(object).where(column.notna(), None)
+        return column.tolist()
+    
+    @staticmethod
+    def team_column(df, name):
+        """Standardized team abbreviations of a column ('' where missing)."""
+        column = df[name]
+        teams = {team: standardize_team_name(team) for team in column.dropna().unique()}
+        return column.map(teams).fillna('').tolist()
+    
     @staticmethod
     def safe_int(value):
         """Safely convert to int, return 0 if NaN or None."""
@@ -318,18 +490,6 @@ class Command(BaseCommand):
             return None
     
     @staticmethod
-    def map_status(status_str):
-        """Map status string to our choices."""
-        if pd.isna(status_str):
-            return 'UNK'
-        
-        status_map = {
-            'ACT': 'ACT',
-            'CUT': 'CUT',
-            'DEV': 'DEV',
-            'RES': 'RES',
-            'RET': 'RET',
-        }
-        
-        return status_map.get(status_str, 'UNK')
-
+    def map_status(statuses):
+        """Map a column of status strings to our choices."""
+        return statuses.map(PLAYER_STATUSES).fillna('UNK').tolist()
@@ -0,0 +1,70 @@
+"""
+Django management command to load team game stats from the team weekly CSV files
+(machine_learning/datasets/team_season_stats/stats_team_week_<year>.csv).
+
+Rows are upserted in chunks, so rerunning for a season updates it in place.
+load_player_data runs the same load for the years it imports.
+
+Usage:
+    python manage.py load_team_stats
+    python manage.py load_team_stats --years 2024 2025
+    python manage.py load_team_stats --chunk-size 2000
+"""
+
+import time
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from api.data_access import forget_projections
+from api.team_stats import load_team_game_csv
+
+TEAM_STATS_DIR = Path(__file__).parent.parent.parent.parent.parent / "machine_learning" / "datasets" / "team_season_stats"
+
+
+class Command(BaseCommand):
+    help = 'Load team game stats (TeamGameStats) from the team weekly CSV files'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--years',
+            nargs='+',
+            type=int,
+            help='Specific years to import (default: every file)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='CSV rows read and inserted at a time (default: 5000)',
+        )
+        parser.add_argument(
+            '--dir',
+            type=Path,
+            default=TEAM_STATS_DIR,
+            help='Directory with stats_team_week_<year>.csv files',
+        )
+    
+    def handle(self, *args, **options):
+        stats_dir = options['dir']
+        if options['years']:
+            files = [stats_dir / f"stats_team_week_{year}.csv" for year in options['years']]
+        else:
+            files = sorted(stats_dir.glob('stats_team_week_*.csv'))
+        
+        files = [path for path in files if path.exists()]
+        if not files:
+            raise CommandError(f"No team weekly stats files found in {stats_dir}")
+        
+        start = time.perf_counter()
+        total = 0
+        for path in files:
+            count = load_team_game_csv(path, chunk_size=options['chunk_size'])
+            self.stdout.write(f'  {path.name}: {count} team games')
+            total += count
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {total} team games from {len(files)} files in {time.perf_counter() - start:.1f}s"
+        ))
+        
+        # Team context changed for every team loaded
+        count = forget_projections()
+        self.stdout.write(f"Stale projections deleted: {count} (rerun precompute_projections)")
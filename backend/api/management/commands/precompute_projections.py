@@ -0,0 +1,188 @@
+"""
+Django management command to precompute the week's projections for every active player.
+
+Scores every QB/RB/WR/TE who has played in the season for every stat in
+POSITION_STATS and stores q10/q50/q90 in the PlayerProjection table.
+predict_bet then serves those players from the table and only runs the
+threshold analysis. Rerun it after loading new game data or activating a
+new model version.
+
+Players are split across a pool of forked processes, each with its own
+models; --workers 1 scores in this process.
+
+Usage:
+    python manage.py precompute_projections
+    python manage.py precompute_projections --season 2025 --week 9 --workers 8
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from api.data_access import get_prediction_week, get_team_context
+from api.feature_store import get_players_form
+from api.models import Player, PlayerProjection
+from ml_service import BetRequest, ModelRegistry, PredictionService, ThreadingPolicy
+from ml_service.constants import POSITION_STATS
+
+# Prediction service of this process (set by _init_worker)
+_service = None
+
+
+def _init_worker(models_dir, version):
+    """Load the given models, with single-threaded batches (one process per core)."""
+    global _service
+    _service = PredictionService(
+        models_dir=models_dir,
+        cache_size=0,
+        model_version=version,
+        threading_policy=ThreadingPolicy(single_row_threads=1, batch_threads=1),
+        inference_backend=settings.ML_INFERENCE_BACKEND
+    )
+
+
+def _project_players(player_ids, season, week, is_playoff):
+    """
+    Predict every stat of a chunk of players.
+    
+    Returns:
+        Tuple of (model version, list of projection field dicts)
+    """
+    bets, keys = [], []
+    team_stats_by_team = {}
+    
+    players = list(Player.objects.filter(player_id__in=player_ids))
+    histories = get_players_form(players)
+    
+    for player in players:
+        history = histories[player.player_id]
+        team = player.current_team or 'FA'
+        if team not in team_stats_by_team:
+            team_stats_by_team[team] = get_team_context(team, season, week)
+        
+        for stat in POSITION_STATS[player.position]:
+            if not _service.validate_position_stat_combination(player.position, stat)[0]:
+                continue
+            bets.append(BetRequest(
+                position=player.position,
+                stat_name=stat,
+                player_history=history,
+                current_season=season,
+                current_week=week,
+                threshold=0.0,
+                bet_type='over',
+                is_playoff=is_playoff,
+                team_stats=team_stats_by_team[team]
+            ))
+            keys.append((player.player_id, stat, len(history)))
+    
+    predictions = _service.predict_quantiles_many(bets)
+    
+    return _service.model_loader.get_model_version(), [
+        {
+            'player_id': player_id,
+            'stat': stat,
+            'games_analyzed': games_analyzed,
+            'q10': quantiles['q10'],
+            'q50': quantiles['q50'],
+            'q90': quantiles['q90']
+        }
+        for (player_id, stat, games_analyzed), quantiles in zip(keys, predictions)
+    ]
+
+
+class Command(BaseCommand):
+    help = "Precompute q10/q50/q90 projections for every active player and stat for a week"
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--season',
+            type=int,
+            help='Season to project (default: the season of the upcoming week)',
+        )
+        parser.add_argument(
+            '--week',
+            type=int,
+            help='Week to project (default: the week after the latest loaded game)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Worker processes (default: CPU count)',
+        )
+    
+    def handle(self, *args, **options):
+        current_season, current_week, current_is_playoff = get_prediction_week()
+        season = options['season'] or current_season
+        week = options['week'] or current_week
+        is_playoff = current_is_playoff and (season, week) == (current_season, current_week)
+        workers = max(1, options['workers'])
+        
+        if 'fork' not in multiprocessing.get_all_start_methods() and workers > 1:
+            self.stdout.write(self.style.WARNING('Process pools need fork; scoring in this process'))
+            workers = 1
+        
+        # Active players: anyone who has played a regular season game this season
+        player_ids = list(
+            Player.objects.filter(
+                position__in=POSITION_STATS.keys(),
+                game_stats__season=season,
+                game_stats__season_type='REG'
+            ).distinct().values_list('player_id', flat=True)
+        )
+        if not player_ids:
+            raise CommandError(f"No players with {season} regular season games")
+        
+        # The models Django serves, resolved once so every worker loads the same version
+        registry = ModelRegistry(settings.ML_MODEL_REGISTRY_DIR) if settings.ML_MODEL_REGISTRY_DIR else None
+        models_dir, version = registry.active_models() if registry else (None, None)
+        
+        self.stdout.write(f"Projecting {len(player_ids)} players for {season} Week {week} ({workers} workers)...")
+        start = time.perf_counter()
+        
+        # A few chunks per worker keeps the pool busy when chunks take uneven time
+        num_chunks = min(len(player_ids), workers * 4)
+        chunks = [player_ids[i::num_chunks] for i in range(num_chunks)]
+        
+        if workers == 1:
+            _init_worker(models_dir, version)
+            results = [_project_players(chunk, season, week, is_playoff) for chunk in chunks]
+        else:
+            # Forked workers must open their own database connections
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('fork'),
+                initializer=_init_worker,
+                initargs=(models_dir, version)
+            ) as executor:
+                results = list(executor.map(
+                    _project_players, chunks,
+                    [season] * num_chunks, [week] * num_chunks, [is_playoff] * num_chunks
+                ))
+        
+        versions = {version for version, _ in results}
+        if len(versions) != 1:
+            raise CommandError(f"Workers used different model versions {sorted(versions)}; rerun the command")
+        model_version = versions.pop()
+        
+        projections = [
+            PlayerProjection(season=season, week=week, model_version=model_version, **fields)
+            for _, rows in results
+            for fields in rows
+        ]
+        
+        # Replace the week's projections in one transaction
+        with transaction.atomic():
+            PlayerProjection.objects.filter(season=season, week=week).delete()
+            PlayerProjection.objects.bulk_create(projections, batch_size=1000)
+        
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {len(projections)} projections for {len(player_ids)} players "
+            f"(model version {model_version}) in {elapsed:.1f}s"
+        ))
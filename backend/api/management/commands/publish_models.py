@@ -0,0 +1,88 @@
+"""
+Django management command to publish a model bundle to the model registry.
+
+Usage:
+    python manage.py publish_models
+    python manage.py publish_models --source ../machine_learning/saved_models --model-version 2025-11-02
+    python manage.py publish_models --no-activate
+    python manage.py publish_models --activate 20251019-225211
+    python manage.py publish_models --list
+"""
+
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ml_service import ModelRegistry
+
+
+class Command(BaseCommand):
+    help = 'Publish a model bundle as a new registry version, or switch the active version'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--registry',
+            type=str,
+            default=settings.ML_MODEL_REGISTRY_DIR,
+            help='Registry root directory (default: ML_MODEL_REGISTRY_DIR)',
+        )
+        parser.add_argument(
+            '--source',
+            type=str,
+            default=str(Path(settings.BASE_DIR) / 'ml_service'),
+            help='Directory with the model, feature_columns and model_metadata joblib files',
+        )
+        parser.add_argument(
+            '--model-version',
+            type=str,
+            help='Version name (default: training date from model_metadata.joblib)',
+        )
+        parser.add_argument(
+            '--no-activate',
+            action='store_true',
+            help='Publish without making it the active version',
+        )
+        parser.add_argument(
+            '--activate',
+            type=str,
+            metavar='VERSION',
+            help='Switch the active version to an already published version',
+        )
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='List published versions',
+        )
+    
+    def handle(self, *args, **options):
+        if not options['registry']:
+            raise CommandError('No registry directory. Pass --registry or set ML_MODEL_REGISTRY_DIR.')
+        
+        registry = ModelRegistry(Path(options['registry']))
+        
+        if options['list']:
+            current = registry.get_current_version()
+            for version in registry.list_versions():
+                marker = '*' if version == current else ' '
+                self.stdout.write(f"{marker} {version}")
+            return
+        
+        try:
+            if options['activate']:
+                registry.activate(options['activate'])
+                self.stdout.write(self.style.SUCCESS(f"Activated model version '{options['activate']}'"))
+                return
+            
+            version = registry.publish(
+                Path(options['source']),
+                version=options['model_version'],
+                activate=not options['no_activate']
+            )
+        except (FileNotFoundError, ValueError) as e:
+            raise CommandError(str(e))
+        
+        self.stdout.write(self.style.SUCCESS(f"Published model version '{version}' to {registry.root}"))
+        if not options['no_activate']:
+            self.stdout.write(
+                'Running servers pick it up on their next registry check '
+                f"(every {settings.ML_MODEL_REGISTRY_POLL_SECONDS:g}s)."
+            )
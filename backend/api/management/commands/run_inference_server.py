@@ -0,0 +1,90 @@
+"""
+Django management command to run the out-of-process inference server.
+
+Loads the models once, forks a pool of processes sharing them, and serves
+micro-batched predictions over a Unix socket. Point Django at it with
+ML_INFERENCE_SOCKET so request threads only prepare features. With
+ML_MODEL_REGISTRY_DIR set, each process follows the registry's active
+version like Django does.
+
+Usage:
+    python manage.py run_inference_server --socket /run/hedge/inference.sock
+    python manage.py run_inference_server --socket /tmp/inference.sock --processes 4 --window-ms 2
+"""
+
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ml_service import InferenceServer, ModelRegistry, PredictionService, ThreadingPolicy
+
+
+class Command(BaseCommand):
+    help = 'Serve model predictions over a Unix socket from a pool of micro-batching processes'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--socket',
+            type=str,
+            default=settings.ML_INFERENCE_SOCKET,
+            help='Unix socket path (default: ML_INFERENCE_SOCKET)',
+        )
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=settings.ML_INFERENCE_PROCESSES,
+            help='Server processes sharing the socket (default: ML_INFERENCE_PROCESSES)',
+        )
+        parser.add_argument(
+            '--window-ms',
+            type=float,
+            default=settings.ML_INFERENCE_BATCH_WINDOW_MS,
+            help='How long to collect requests into one batch (default: ML_INFERENCE_BATCH_WINDOW_MS)',
+        )
+        parser.add_argument(
+            '--max-batch-rows',
+            type=int,
+            default=settings.ML_INFERENCE_MAX_BATCH_ROWS,
+            help='Maximum rows per batch (default: ML_INFERENCE_MAX_BATCH_ROWS)',
+        )
+    
+    def handle(self, *args, **options):
+        if not options['socket']:
+            raise CommandError('Set --socket or ML_INFERENCE_SOCKET')
+        if not Path(options['socket']).parent.is_dir():
+            raise CommandError(f"Directory for {options['socket']} does not exist")
+        
+        # Serve the same models Django would
+        registry = ModelRegistry(settings.ML_MODEL_REGISTRY_DIR) if settings.ML_MODEL_REGISTRY_DIR else None
+        models_dir, version = registry.active_models() if registry else (None, None)
+        service = PredictionService(
+            models_dir=models_dir,
+            cache_size=0,
+            model_cache_bytes=settings.ML_MODEL_CACHE_MAX_BYTES,
+            model_cache_policy=settings.ML_MODEL_CACHE_POLICY,
+            model_version=version,
+            threading_policy=ThreadingPolicy(
+                single_row_threads=settings.ML_SINGLE_ROW_THREADS,
+                batch_threads=settings.ML_BATCH_THREADS,
+                batch_min_rows=settings.ML_BATCH_MIN_ROWS,
+                fast_single_row=settings.ML_LIGHTGBM_FAST_SINGLE_ROW
+            ),
+            inference_backend=settings.ML_INFERENCE_BACKEND
+        )
+        
+        server = InferenceServer(
+            service,
+            options['socket'],
+            window_ms=options['window_ms'],
+            max_batch_rows=options['max_batch_rows'],
+            registry=registry,
+            registry_poll_seconds=settings.ML_MODEL_REGISTRY_POLL_SECONDS
+        )
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Serving model version {service.model_loader.get_model_version()} on {options['socket']} "
+            f"({options['processes']} processes, {options['window_ms']}ms batching window)"
+        ))
+        try:
+            server.serve(processes=options['processes'], max_workers=settings.ML_PRELOAD_WORKERS)
+        except KeyboardInterrupt:
+            server.shutdown()
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_remove_bettingscenario_prediction_score_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='bettingscenario',
+            name='expected_value',
+            field=models.FloatField(blank=True, help_text='Probability edge: deviation from 50% win probability (range: -1 to +1)', null=True),
+        ),
+        migrations.CreateModel(
+            name='PlayerProjection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.IntegerField(help_text='Season year predicted for')),
+                ('week', models.IntegerField(help_text='Week number predicted for')),
+                ('stat', models.CharField(help_text="Stat name (e.g., 'passing_yards')", max_length=30)),
+                ('q10', models.FloatField(help_text='Pessimistic prediction (10th percentile)')),
+                ('q50', models.FloatField(help_text='Most likely prediction (50th percentile / median)')),
+                ('q90', models.FloatField(help_text='Optimistic prediction (90th percentile)')),
+                ('games_analyzed', models.IntegerField(help_text='Number of games used for the prediction')),
+                ('model_version', models.CharField(help_text='Version of the models that made the prediction', max_length=50)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('player', models.ForeignKey(help_text='Player the projection is for', on_delete=django.db.models.deletion.CASCADE, related_name='projections', to='api.player')),
+            ],
+            options={
+                'verbose_name': 'Player Projection',
+                'verbose_name_plural': 'Player Projections',
+                'ordering': ['-season', '-week', 'stat', '-q50'],
+                'indexes': [models.Index(fields=['season', 'week', 'stat', '-q50'], name='api_playerp_season_bb178c_idx')],
+                'unique_together': {('player', 'season', 'week', 'stat')},
+            },
+        ),
+    ]
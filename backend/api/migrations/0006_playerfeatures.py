@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_playerprojection'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerFeatures',
+            fields=[
+                ('player', models.OneToOneField(help_text='Player the features belong to', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rolling_features', serialize=False, to='api.player')),
+                ('games', models.IntegerField(help_text='Number of games in the running window')),
+                ('recent_games', models.JSONField(default=list, help_text='Running window: [season, week, {stat: value}] of the latest regular season games, oldest first')),
+                ('features', models.JSONField(default=dict, help_text="Rolling features by name (e.g. 'passing_yards_avg_3')")),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Player Features',
+                'verbose_name_plural': 'Player Features',
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_playerfeatures'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamWeekStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('team', models.CharField(help_text="Team abbreviation (e.g., 'KC')", max_length=10)),
+                ('season', models.IntegerField(help_text='Season year (e.g., 2025)')),
+                ('week', models.IntegerField(help_text='Week number')),
+                ('season_type', models.CharField(choices=[('REG', 'Regular Season'), ('POST', 'Playoffs'), ('PRE', 'Preseason')], default='REG', max_length=10)),
+                ('team_passing_yards', models.IntegerField(default=0)),
+                ('team_rushing_yards', models.IntegerField(default=0)),
+                ('team_receptions', models.IntegerField(default=0)),
+                ('team_targets', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Team Week Stats',
+                'verbose_name_plural': 'Team Week Stats',
+                'ordering': ['team', '-season', '-week'],
+                'unique_together': {('team', 'season_type', 'season', 'week')},
+            },
+        ),
+    ]
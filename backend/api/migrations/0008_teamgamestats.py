@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_teamweekstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamGameStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('team', models.CharField(help_text="Team abbreviation (e.g., 'KC')", max_length=10)),
+                ('season', models.IntegerField(help_text='Season year (e.g., 2025)')),
+                ('week', models.IntegerField(help_text='Week number')),
+                ('season_type', models.CharField(choices=[('REG', 'Regular Season'), ('POST', 'Playoffs'), ('PRE', 'Preseason')], default='REG', max_length=10)),
+                ('opponent_team', models.CharField(blank=True, help_text='Opponent team abbreviation', max_length=10)),
+                ('completions', models.IntegerField(default=0)),
+                ('attempts', models.IntegerField(default=0)),
+                ('passing_yards', models.IntegerField(default=0)),
+                ('passing_tds', models.IntegerField(default=0)),
+                ('passing_interceptions', models.IntegerField(default=0)),
+                ('carries', models.IntegerField(default=0)),
+                ('rushing_yards', models.IntegerField(default=0)),
+                ('rushing_tds', models.IntegerField(default=0)),
+                ('receptions', models.IntegerField(default=0)),
+                ('targets', models.IntegerField(default=0)),
+                ('receiving_yards', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Team Game Stats',
+                'verbose_name_plural': 'Team Game Stats',
+                'ordering': ['team', '-season', '-week'],
+                'unique_together': {('team', 'season_type', 'season', 'week')},
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_teamgamestats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeasonCalendar',
+            fields=[
+                ('season_type', models.CharField(choices=[('REG', 'Regular Season'), ('POST', 'Playoffs'), ('PRE', 'Preseason')], max_length=10, primary_key=True, serialize=False)),
+                ('season', models.IntegerField(help_text='Season of the latest loaded week')),
+                ('week', models.IntegerField(help_text='Latest loaded week of that season')),
+                ('updated_at', models.DateTimeField(help_text='Set on every change; processes reload their cached calendar when it moves')),
+            ],
+            options={
+                'verbose_name': 'Season Calendar',
+                'verbose_name_plural': 'Season Calendar',
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+from django.db import migrations
+from django.db.models import Sum
+
+# TeamWeekStats field -> summed PlayerGameStats field (as api.team_stats.TEAM_WEEK_SUMS)
+TEAM_WEEK_SUMS = {
+    'team_passing_yards': 'passing_yards',
+    'team_rushing_yards': 'rushing_yards',
+    'team_receptions': 'receptions',
+    'team_targets': 'targets',
+}
+
+TEAM_WEEK_KEY = ('team', 'season', 'week', 'season_type')
+
+
+def backfill_team_week_stats(apps, schema_editor):
+    """Sum the existing game stats into TeamWeekStats with one GROUP BY."""
+    PlayerGameStats = apps.get_model('api', 'PlayerGameStats')
+    TeamWeekStats = apps.get_model('api', 'TeamWeekStats')
+    
+    grouped = PlayerGameStats.objects.values(*TEAM_WEEK_KEY).annotate(
+        **{field: Sum(column) for field, column in TEAM_WEEK_SUMS.items()}
+    ).order_by()
+    
+    TeamWeekStats.objects.all().delete()
+    TeamWeekStats.objects.bulk_create(
+        [
+            TeamWeekStats(
+                **{key: group[key] for key in TEAM_WEEK_KEY},
+                **{field: group[field] or 0 for field in TEAM_WEEK_SUMS}
+            )
+            for group in grouped
+        ],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_seasoncalendar'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_team_week_stats, migrations.RunPython.noop),
+    ]
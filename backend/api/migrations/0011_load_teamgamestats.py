@@ -0,0 +1,116 @@
+from pathlib import Path
+
+import pandas as pd
+from django.db import migrations
+
+# Same directory load_player_data and load_team_stats read
+TEAM_STATS_DIR = Path(__file__).resolve().parents[3] / "machine_learning" / "datasets" / "team_season_stats"
+
+# Frozen copies of the api.team_stats and api.constants names the loader used
+# when this migration was written, so later changes to them can't alter it
+TEAM_WEEK_KEY = ('team', 'season', 'week', 'season_type')
+
+TEAM_GAME_STATS = [
+    'completions', 'attempts', 'passing_yards', 'passing_tds', 'passing_interceptions',
+    'carries', 'rushing_yards', 'rushing_tds',
+    'receptions', 'targets', 'receiving_yards',
+]
+
+# Full and former team names -> abbreviation; anything else is kept as-is
+TEAM_NAMES = {
+    'Arizona Cardinals': 'ARI',
+    'Atlanta Falcons': 'ATL',
+    'Baltimore Ravens': 'BAL',
+    'Buffalo Bills': 'BUF',
+    'Carolina Panthers': 'CAR',
+    'Chicago Bears': 'CHI',
+    'Cincinnati Bengals': 'CIN',
+    'Cleveland Browns': 'CLE',
+    'Dallas Cowboys': 'DAL',
+    'Denver Broncos': 'DEN',
+    'Detroit Lions': 'DET',
+    'Green Bay Packers': 'GB',
+    'Houston Texans': 'HOU',
+    'Indianapolis Colts': 'IND',
+    'Jacksonville Jaguars': 'JAX',
+    'Kansas City Chiefs': 'KC',
+    'Los Angeles Rams': 'LA',
+    'Los Angeles Chargers': 'LAC',
+    'Las Vegas Raiders': 'LV',
+    'Miami Dolphins': 'MIA',
+    'Minnesota Vikings': 'MIN',
+    'New England Patriots': 'NE',
+    'New Orleans Saints': 'NO',
+    'New York Giants': 'NYG',
+    'New York Jets': 'NYJ',
+    'Philadelphia Eagles': 'PHI',
+    'Pittsburgh Steelers': 'PIT',
+    'Seattle Seahawks': 'SEA',
+    'San Francisco 49ers': 'SF',
+    'Tampa Bay Buccaneers': 'TB',
+    'Tennessee Titans': 'TEN',
+    'Washington Commanders': 'WAS',
+    'Washington Football Team': 'WAS',
+    'Washington Redskins': 'WAS',
+    'Oakland Raiders': 'LV',
+    'San Diego Chargers': 'LAC',
+    'St. Louis Rams': 'LA',
+}
+
+
+def load_team_game_csv(path, TeamGameStats, chunk_size=5000):
+    """Upsert one stats_team_week_<year>.csv, chunk_size rows per bulk INSERT ... ON CONFLICT."""
+    columns = list(TEAM_WEEK_KEY) + ['opponent_team'] + TEAM_GAME_STATS
+    
+    for chunk in pd.read_csv(path, usecols=columns, chunksize=chunk_size):
+        chunk = chunk.dropna(subset=['team', 'season', 'week'])
+        teams = [TEAM_NAMES.get(team, team) for team in chunk['team']]
+        opponents = [TEAM_NAMES.get(team, team) for team in chunk['opponent_team'].fillna('')]
+        stats = chunk[TEAM_GAME_STATS].fillna(0).astype('int64').to_numpy().tolist()
+        
+        TeamGameStats.objects.bulk_create(
+            [
+                TeamGameStats(
+                    team=team, season=season, week=week, season_type=season_type,
+                    opponent_team=opponent, **dict(zip(TEAM_GAME_STATS, values))
+                )
+                for team, season, week, season_type, opponent, values in zip(
+                    teams,
+                    chunk['season'].astype('int64').tolist(),
+                    chunk['week'].astype('int64').tolist(),
+                    chunk['season_type'].tolist(),
+                    opponents,
+                    stats
+                )
+            ],
+            update_conflicts=True,
+            unique_fields=['team', 'season_type', 'season', 'week'],
+            update_fields=['opponent_team'] + TEAM_GAME_STATS
+        )
+
+
+def load_team_game_stats(apps, schema_editor):
+    """
+    Load the team weekly CSVs of every season with game stats, so an existing
+    database serves team context from TeamGameStats right after migrate
+    (as after rerunning load_player_data). Skipped for an empty database.
+    """
+    PlayerGameStats = apps.get_model('api', 'PlayerGameStats')
+    TeamGameStats = apps.get_model('api', 'TeamGameStats')
+    
+    seasons = PlayerGameStats.objects.values_list('season', flat=True).distinct().order_by('season')
+    for season in seasons:
+        path = TEAM_STATS_DIR / f"stats_team_week_{season}.csv"
+        if path.exists():
+            load_team_game_csv(path, TeamGameStats)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_backfill_teamweekstats'),
+    ]
+
+    operations = [
+        migrations.RunPython(load_team_game_stats, migrations.RunPython.noop),
+    ]
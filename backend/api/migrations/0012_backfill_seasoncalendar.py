@@ -0,0 +1,30 @@
+from django.db import migrations
+from django.utils import timezone
+
+
+def backfill_season_calendar(apps, schema_editor):
+    """Record the latest week of each season type of the existing game stats."""
+    PlayerGameStats = apps.get_model('api', 'PlayerGameStats')
+    SeasonCalendar = apps.get_model('api', 'SeasonCalendar')
+    
+    now = timezone.now()
+    for season_type in ('REG', 'POST', 'PRE'):
+        game = PlayerGameStats.objects.filter(
+            season_type=season_type
+        ).order_by('-season', '-week').values_list('season', 'week').first()
+        if game:
+            SeasonCalendar.objects.update_or_create(
+                season_type=season_type,
+                defaults={'season': game[0], 'week': game[1], 'updated_at': now}
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_load_teamgamestats'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_season_calendar, migrations.RunPython.noop),
+    ]
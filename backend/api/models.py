@@ -244,6 +244,217 @@ class PlayerGameStats(models.Model):
         return {}
 
 
+class PlayerFeatures(models.Model):
+    """
+    A player's rolling form features going into their next game.
+    
+    Kept up to date incrementally as PlayerGameStats rows are saved (see
+    api/feature_store.py), so predictions read this row instead of fetching
+    recent games and computing rolling windows.
+    """
+    
+    player = models.OneToOneField(
+        Player,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='rolling_features',
+        help_text="Player the features belong to"
+    )
+    
+    games = models.IntegerField(help_text="Number of games in the running window")
+    
+    recent_games = models.JSONField(
+        default=list,
+        help_text="Running window: [season, week, {stat: value}] of the latest regular season games, oldest first"
+    )
+    
+    features = models.JSONField(
+        default=dict,
+        help_text="Rolling features by name (e.g. 'passing_yards_avg_3')"
+    )
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Player Features"
+        verbose_name_plural = "Player Features"
+    
+    def __str__(self):
+        return f"{self.player_id} rolling features ({self.games} games)"
+
+
+class TeamGameStats(models.Model):
+    """
+    A team's offensive totals for one game, from the nflverse team weekly stats
+    (machine_learning/datasets/team_season_stats), the team context the
+    models were trained with.
+    """
+    
+    team = models.CharField(
+        max_length=10,
+        help_text="Team abbreviation (e.g., 'KC')"
+    )
+    
+    season = models.IntegerField(help_text="Season year (e.g., 2025)")
+    week = models.IntegerField(help_text="Week number")
+    
+    season_type = models.CharField(
+        max_length=10,
+        choices=PlayerGameStats.SEASON_TYPE_CHOICES,
+        default='REG'
+    )
+    
+    opponent_team = models.CharField(
+        max_length=10,
+        blank=True,
+        help_text="Opponent team abbreviation"
+    )
+    
+    # Passing stats
+    completions = models.IntegerField(default=0)
+    attempts = models.IntegerField(default=0)
+    passing_yards = models.IntegerField(default=0)
+    passing_tds = models.IntegerField(default=0)
+    passing_interceptions = models.IntegerField(default=0)
+    
+    # Rushing stats
+    carries = models.IntegerField(default=0)
+    rushing_yards = models.IntegerField(default=0)
+    rushing_tds = models.IntegerField(default=0)
+    
+    # Receiving stats
+    receptions = models.IntegerField(default=0)
+    targets = models.IntegerField(default=0)
+    receiving_yards = models.IntegerField(default=0)
+    
+    class Meta:
+        ordering = ['team', '-season', '-week']
+        verbose_name = "Team Game Stats"
+        verbose_name_plural = "Team Game Stats"
+        # Also serves "latest week of a team's season" (team, season_type, season, -week)
+        unique_together = [['team', 'season_type', 'season', 'week']]
+    
+    def __str__(self):
+        return f"{self.team} vs {self.opponent_team} - Week {self.week} {self.season} ({self.season_type})"
+
+
+class TeamWeekStats(models.Model):
+    """
+    A team's passing/rushing/receiving totals for one game week.
+    
+    Sums of the team's PlayerGameStats rows, filled in bulk by the data
+    loader and kept up to date as game stats are saved (see
+    api/team_stats.py), so team context is one indexed lookup.
+    """
+    
+    team = models.CharField(
+        max_length=10,
+        help_text="Team abbreviation (e.g., 'KC')"
+    )
+    
+    season = models.IntegerField(help_text="Season year (e.g., 2025)")
+    week = models.IntegerField(help_text="Week number")
+    
+    season_type = models.CharField(
+        max_length=10,
+        choices=PlayerGameStats.SEASON_TYPE_CHOICES,
+        default='REG'
+    )
+    
+    team_passing_yards = models.IntegerField(default=0)
+    team_rushing_yards = models.IntegerField(default=0)
+    team_receptions = models.IntegerField(default=0)
+    team_targets = models.IntegerField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['team', '-season', '-week']
+        verbose_name = "Team Week Stats"
+        verbose_name_plural = "Team Week Stats"
+        # Also serves "latest week of a team's season" (team, season_type, season, -week)
+        unique_together = [['team', 'season_type', 'season', 'week']]
+    
+    def __str__(self):
+        return f"{self.team} - Week {self.week} {self.season} ({self.season_type})"
+
+
+class SeasonCalendar(models.Model):
+    """
+    The latest loaded (season, week) of each season type.
+    
+    Maintained by the data loader and game stat saves (see
+    api/season_calendar.py) and cached in each process, so working out the
+    week to predict for doesn't scan PlayerGameStats.
+    """
+    
+    season_type = models.CharField(
+        max_length=10,
+        primary_key=True,
+        choices=PlayerGameStats.SEASON_TYPE_CHOICES
+    )
+    
+    season = models.IntegerField(help_text="Season of the latest loaded week")
+    week = models.IntegerField(help_text="Latest loaded week of that season")
+    
+    updated_at = models.DateTimeField(
+        help_text="Set on every change; processes reload their cached calendar when it moves"
+    )
+    
+    class Meta:
+        verbose_name = "Season Calendar"
+        verbose_name_plural = "Season Calendar"
+    
+    def __str__(self):
+        return f"{self.season_type}: latest Week {self.week} {self.season}"
+
+
+class PlayerProjection(models.Model):
+    """Precomputed quantile predictions for one player and stat in an upcoming week."""
+    
+    player = models.ForeignKey(
+        Player,
+        on_delete=models.CASCADE,
+        related_name='projections',
+        help_text="Player the projection is for"
+    )
+    
+    season = models.IntegerField(help_text="Season year predicted for")
+    week = models.IntegerField(help_text="Week number predicted for")
+    
+    stat = models.CharField(
+        max_length=30,
+        help_text="Stat name (e.g., 'passing_yards')"
+    )
+    
+    # Quantile predictions
+    q10 = models.FloatField(help_text="Pessimistic prediction (10th percentile)")
+    q50 = models.FloatField(help_text="Most likely prediction (50th percentile / median)")
+    q90 = models.FloatField(help_text="Optimistic prediction (90th percentile)")
+    
+    # Prediction metadata
+    games_analyzed = models.IntegerField(help_text="Number of games used for the prediction")
+    
+    model_version = models.CharField(
+        max_length=50,
+        help_text="Version of the models that made the prediction"
+    )
+    
+    computed_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-season', '-week', 'stat', '-q50']
+        verbose_name = "Player Projection"
+        verbose_name_plural = "Player Projections"
+        unique_together = [['player', 'season', 'week', 'stat']]
+        indexes = [
+            models.Index(fields=['season', 'week', 'stat', '-q50']),
+        ]
+    
+    def __str__(self):
+        return f"{self.player.display_name} - {self.stat} Week {self.week} {self.season} (q50 {self.q50:.1f})"
+
+
 class BettingScenario(models.Model):
     """Model to store betting scenario data from users."""
     
@@ -2,34 +2,274 @@
 API views for ML predictions.
 """
 
+from django.conf import settings
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 import json
 import sys
 import logging
+import numpy as np
 from decimal import Decimal, InvalidOperation
 
 logger = logging.getLogger(__name__)
 
 # Import ML service
 sys.path.insert(0, 'ml_service')
-from ml_service import PredictionService
+from ml_service import PredictionService, BetRequest, ModelRegistry, ThreadingPolicy, InferenceClient
+from ml_service.constants import ACTION_TO_STAT
 
 # Import data access functions
 from .data_access import (
     get_player_by_name,
-    get_player_recent_games,
     search_players,
     get_available_seasons,
-    get_team_stats_for_week
+    get_prediction_week,
+    get_team_context,
+    get_projection,
+    get_top_projections
 )
-from .models import BettingScenario, PlayerGameStats
+from .feature_store import get_player_form, get_players_form
+from .models import BettingScenario
 from .constants import standardize_team_name
 
 
 # Initialize prediction service
-predictor = PredictionService()
+# Serve the registry's active version if a registry is configured, else the bundled models
+model_registry = ModelRegistry(settings.ML_MODEL_REGISTRY_DIR) if settings.ML_MODEL_REGISTRY_DIR else None
+models_dir, model_version = model_registry.active_models() if model_registry else (None, None)
+
+predictor = PredictionService(
+    models_dir=models_dir,
+    cache_size=settings.PREDICTION_CACHE_SIZE,
+    model_cache_bytes=settings.ML_MODEL_CACHE_MAX_BYTES,
+    model_cache_policy=settings.ML_MODEL_CACHE_POLICY,
+    model_version=model_version,
+    threading_policy=ThreadingPolicy(
+        single_row_threads=settings.ML_SINGLE_ROW_THREADS,
+        batch_threads=settings.ML_BATCH_THREADS,
+        batch_min_rows=settings.ML_BATCH_MIN_ROWS,
+        fast_single_row=settings.ML_LIGHTGBM_FAST_SINGLE_ROW
+    ),
+    inference_backend=settings.ML_INFERENCE_BACKEND,
+    # With an inference server, this process only prepares features and the server runs the models
+    inference_client=(
+        InferenceClient(settings.ML_INFERENCE_SOCKET, timeout=settings.ML_INFERENCE_TIMEOUT)
+        if settings.ML_INFERENCE_SOCKET else None
+    )
+)
+
+
+def start_background_tasks():
+    """
+    Start per-process background work: hot reload when a new version is
+    activated in the registry. Runs at import, or from each worker's
+    post_fork hook when the app is preloaded in a forking master.
+    """
+    if model_registry:
+        predictor.watch_registry(model_registry, interval=settings.ML_MODEL_REGISTRY_POLL_SECONDS)
+
+
+if settings.ML_PREFORK_PRELOAD:
+    # Load everything now, in the master, so forked workers share it copy-on-write
+    predictor.prepare_for_fork(max_workers=settings.ML_PRELOAD_WORKERS)
+else:
+    # Warm every quantile model at boot so no request pays a cold load
+    if settings.ML_PRELOAD_MODELS:
+        predictor.model_loader.preload_in_background(max_workers=settings.ML_PRELOAD_WORKERS)
+    start_background_tasks()
+
+# Upper bound on the number of bets accepted by predict_bets in one request
+MAX_BATCH_BETS = 500
+
+# Upper bound on the number of thresholds accepted by predict_curve in one request
+MAX_CURVE_POINTS = 2000
+
+
+def _parse_bet_fields(data):
+    """
+    Validate the bet fields shared by the prediction endpoints.
+    
+    Returns:
+        Tuple of (parsed_fields, error_message). On success error_message is None
+        and parsed_fields has player_name, action, bet_type, action_amount, bet_amount.
+    """
+    required_fields = ['player', 'action', 'bet_type', 'action_amount']
+    for field in required_fields:
+        if field not in data or data[field] in [None, '']:
+            return None, f'Missing required field: {field}'
+    
+    bet_type = str(data['bet_type']).lower()
+    
+    # Validate bet type
+    if bet_type not in ['over', 'under']:
+        return None, f'Invalid bet_type: {bet_type}. Must be "over" or "under"'
+    
+    # Validate and parse amounts
+    try:
+        action_amount = float(data['action_amount'])
+    except (ValueError, TypeError):
+        return None, 'action_amount must be a valid number'
+    if action_amount <= 0:
+        return None, 'action_amount must be greater than 0'
+    
+    bet_amount = 0.0
+    if 'bet_amount' in data:
+        try:
+            bet_amount = float(data['bet_amount'])
+        except (ValueError, TypeError):
+            bet_amount = 0.0
+    
+    return {
+        'player_name': data['player'],
+        'action': data['action'],
+        'bet_type': bet_type,
+        'action_amount': action_amount,
+        'bet_amount': bet_amount,
+    }, None
+
+
+def _parse_curve_thresholds(data):
+    """
+    Read the thresholds for a prediction curve from a request body.
+    
+    Accepts either an explicit "thresholds" list, or "min_threshold",
+    "max_threshold" and "step" describing an evenly spaced grid.
+    
+    Returns:
+        Tuple of (thresholds, error_message). On success error_message is None.
+    """
+    if 'thresholds' in data:
+        values = data['thresholds']
+        if not isinstance(values, list) or not values:
+            return None, 'thresholds must be a non-empty list of numbers'
+        try:
+            thresholds = np.asarray([float(v) for v in values], dtype=float)
+        except (ValueError, TypeError):
+            return None, 'thresholds must be a non-empty list of numbers'
+    else:
+        for field in ['min_threshold', 'max_threshold', 'step']:
+            if field not in data or data[field] in [None, '']:
+                return None, f'Missing required field: {field} (or provide thresholds)'
+        try:
+            low = float(data['min_threshold'])
+            high = float(data['max_threshold'])
+            step = float(data['step'])
+        except (ValueError, TypeError):
+            return None, 'min_threshold, max_threshold and step must be valid numbers'
+        if step <= 0:
+            return None, 'step must be greater than 0'
+        if high < low:
+            return None, 'max_threshold must be greater than or equal to min_threshold'
+        
+        num_points = int(np.floor((high - low) / step + 1e-9)) + 1
+        if num_points > MAX_CURVE_POINTS:
+            return None, f'Too many thresholds: {num_points}. Maximum is {MAX_CURVE_POINTS}'
+        thresholds = np.round(low + step * np.arange(num_points), 6)
+    
+    if len(thresholds) > MAX_CURVE_POINTS:
+        return None, f'Too many thresholds: {len(thresholds)}. Maximum is {MAX_CURVE_POINTS}'
+    if not np.all(np.isfinite(thresholds)) or np.any(thresholds <= 0):
+        return None, 'thresholds must be greater than 0'
+    
+    return thresholds, None
+
+
+def _history_warning(games_analyzed):
+    """Return a warning message when a player has too few games of history, else None."""
+    if games_analyzed < 3:
+        return (
+            f"Limited data available. Only {games_analyzed} games found. "
+            f"Predictions may be less accurate."
+        )
+    return None
+
+
+def _build_scenario(player, team, position, bet, result, games_analyzed,
+                    current_season, current_week, warning_message):
+    """Build an (unsaved) BettingScenario for a processed prediction."""
+    return BettingScenario(
+        sport='football',
+        team=team,
+        player=player.display_name,
+        bet_type=bet['bet_type'],
+        action=bet['action'],
+        action_amount=Decimal(str(bet['action_amount'])),
+        bet_amount=Decimal(str(bet['bet_amount'])),
+        
+        # Mark as processed
+        is_processed=True,
+        
+        # Store predictions
+        prediction_q10=result.predictions.get('q10'),
+        prediction_q50=result.predictions.get('q50'),
+        prediction_q90=result.predictions.get('q90'),
+        
+        # Store analysis
+        win_probability=result.win_probability,
+        confidence_level=result.confidence_level,
+        expected_value=result.expected_value,
+        recommendation=result.recommendation,
+        
+        # Store metadata
+        player_position=position,
+        games_analyzed=games_analyzed,
+        prediction_season=current_season,
+        prediction_week=current_week,
+        
+        # Store warning if any
+        has_warning=warning_message is not None,
+        warning_message=warning_message
+    )
+
+
+def _build_prediction_response(scenario, player, team, position, bet, result,
+                               games_analyzed, current_season, current_week):
+    """Build the JSON body describing one processed prediction."""
+    response = {
+        'success': True,
+        'scenario_id': scenario.id,
+        
+        'player': {
+            'name': player.display_name,
+            'position': position,
+            'team': team
+        },
+        
+        'bet': {
+            'action': bet['action'],
+            'type': bet['bet_type'],
+            'threshold': bet['action_amount'],
+            'amount': float(bet['bet_amount'])
+        },
+        
+        'prediction': {
+            'q10': result.predictions.get('q10'),
+            'q50': result.predictions.get('q50'),
+            'q90': result.predictions.get('q90')
+        },
+        
+        'analysis': {
+            'win_probability': result.win_probability,
+            'confidence_level': result.confidence_level,
+            'expected_value': result.expected_value,
+            'recommendation': result.recommendation
+        },
+        
+        'details': {
+            'games_analyzed': games_analyzed,
+            'current_season': current_season,
+            'current_week': current_week,
+            'stat_display_name': result.stat_display_name,
+            'stat_unit': result.details.get('stat_unit', '')
+        }
+    }
+    
+    # Add warning if present
+    if scenario.has_warning:
+        response['warning'] = scenario.warning_message
+    
+    return response
 
 
 @csrf_exempt
@@ -63,9 +303,362 @@ def predict_bet(request):
         # Parse JSON data
         data = json.loads(request.body)
         
-        # Validate required fields
-        required_fields = ['player', 'action', 'bet_type', 'action_amount']
-        for field in required_fields:
+        # Validate required fields, bet type and amounts
+        bet, error = _parse_bet_fields(data)
+        if error:
+            return JsonResponse({
+                'success': False,
+                'error': error
+            }, status=400)
+        
+        player_name = bet['player_name']
+        
+        # Look up player in database
+        player = get_player_by_name(player_name)
+        
+        if not player:
+            # Player not found - provide suggestions
+            suggestions = search_players(player_name, limit=5)
+            suggestion_names = [p.display_name for p in suggestions]
+            
+            return JsonResponse({
+                'success': False,
+                'error': f'Player "{player_name}" not found in database',
+                'suggestions': suggestion_names
+            }, status=404)
+        
+        # Get player info
+        position = player.position
+        team = player.current_team or 'FA'
+        
+        # Auto-detect current week from database
+        current_season, current_week, is_playoff = get_prediction_week()
+        
+        # Use this week's precomputed projection (precompute_projections) if there is one
+        projection = None
+        stat_name = ACTION_TO_STAT.get(bet['action'])
+        if settings.ML_SERVE_PROJECTIONS and stat_name:
+            projection = get_projection(
+                player, stat_name, current_season, current_week,
+                predictor.model_loader.get_model_version()
+            )
+        
+        if projection is not None:
+            games_analyzed = projection.games_analyzed
+        else:
+            # Get player history (stored rolling features when available)
+            try:
+                player_history = get_player_form(player)
+            except Exception as e:
+                return JsonResponse({
+                    'success': False,
+                    'error': f'Error retrieving player history: {str(e)}'
+                }, status=500)
+            games_analyzed = len(player_history)
+            
+            # Get team stats for the upcoming game
+            team_stats = get_team_context(team, current_season, current_week)
+        
+        # Check if sufficient history
+        warning_message = _history_warning(games_analyzed)
+        
+        # Make prediction
+        try:
+            if projection is not None:
+                # Only the threshold analysis depends on the bet
+                result = predictor.analyze_quantiles(
+                    position=position,
+                    stat_name=stat_name,
+                    predictions={'q10': projection.q10, 'q50': projection.q50, 'q90': projection.q90},
+                    threshold=bet['action_amount'],
+                    bet_type=bet['bet_type'],
+                    games_analyzed=games_analyzed,
+                    current_season=current_season,
+                    current_week=current_week,
+                    is_playoff=is_playoff
+                )
+            else:
+                result = predictor.predict_from_betting_scenario(
+                    player_name=player.display_name,
+                    position=position,
+                    team=team,
+                    action=bet['action'],
+                    bet_type=bet['bet_type'],
+                    action_amount=bet['action_amount'],
+                    player_history=player_history,
+                    current_season=current_season,
+                    current_week=current_week,
+                    is_playoff=is_playoff,
+                    team_stats=team_stats,
+                    player_id=player.player_id
+                )
+        except ValueError as e:
+            # Stat doesn't match position or other validation error
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=400)
+        except ConnectionError as e:
+            # Inference server (ML_INFERENCE_SOCKET) unreachable
+            return JsonResponse({
+                'success': False,
+                'error': f'Prediction service unavailable: {str(e)}'
+            }, status=503)
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': f'Prediction error: {str(e)}'
+            }, status=500)
+        
+        # Save to database
+        try:
+            scenario = _build_scenario(
+                player, team, position, bet, result, games_analyzed,
+                current_season, current_week, warning_message
+            )
+            scenario.save()
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': f'Error saving scenario: {str(e)}'
+            }, status=500)
+        
+        # Build response
+        response = _build_prediction_response(
+            scenario, player, team, position, bet, result,
+            games_analyzed, current_season, current_week
+        )
+        response['details']['precomputed'] = projection is not None
+        
+        return JsonResponse(response, status=201)
+    
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'success': False,
+            'error': 'Invalid JSON format'
+        }, status=400)
+    except Exception as e:
+        # Catch-all for unexpected errors
+        return JsonResponse({
+            'success': False,
+            'error': f'Server error: {str(e)}'
+        }, status=500)
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def predict_bets(request):
+    """
+    API endpoint to make predictions for many bets in one request.
+    
+    Bets are scored together so each position/stat model runs once per
+    request instead of once per bet.
+    
+    Request body:
+    {
+        "bets": [
+            {"player": "Patrick Mahomes", "action": "Passing Yards",
+             "bet_type": "over", "action_amount": 275.5, "bet_amount": 100.00},
+            ...
+        ]
+    }
+    
+    Response:
+    {
+        "success": true,
+        "count": 2,
+        "results": [
+            {"index": 0, "success": true, "scenario_id": 123, ...},
+            {"index": 1, "success": false, "error": "..."}
+        ]
+    }
+    """
+    try:
+        data = json.loads(request.body)
+        
+        bets_data = data.get('bets') if isinstance(data, dict) else None
+        if not isinstance(bets_data, list) or not bets_data:
+            return JsonResponse({
+                'success': False,
+                'error': 'Missing required field: bets (a non-empty list)'
+            }, status=400)
+        
+        if len(bets_data) > MAX_BATCH_BETS:
+            return JsonResponse({
+                'success': False,
+                'error': f'Too many bets: {len(bets_data)}. Maximum is {MAX_BATCH_BETS}'
+            }, status=400)
+        
+        current_season, current_week, is_playoff = get_prediction_week()
+        
+        results = [None] * len(bets_data)
+        pending = []  # (index, bet, player) for bets that passed validation
+        players_by_name = {}
+        team_stats_by_team = {}
+        
+        for index, item in enumerate(bets_data):
+            if not isinstance(item, dict):
+                results[index] = {'index': index, 'success': False, 'error': 'Bet must be an object'}
+                continue
+            
+            bet, error = _parse_bet_fields(item)
+            if error:
+                results[index] = {'index': index, 'success': False, 'error': error}
+                continue
+            
+            name_key = str(bet['player_name']).lower()
+            if name_key not in players_by_name:
+                players_by_name[name_key] = get_player_by_name(bet['player_name'])
+            player = players_by_name[name_key]
+            
+            if not player:
+                results[index] = {
+                    'index': index,
+                    'success': False,
+                    'error': f'Player "{bet["player_name"]}" not found in database'
+                }
+                continue
+            
+            stat_name = ACTION_TO_STAT.get(bet['action'])
+            if stat_name is None:
+                results[index] = {
+                    'index': index,
+                    'success': False,
+                    'error': f"Unknown action '{bet['action']}'. Valid actions: {list(ACTION_TO_STAT.keys())}"
+                }
+                continue
+            
+            is_valid, error = predictor.validate_position_stat_combination(player.position, stat_name)
+            if not is_valid:
+                results[index] = {'index': index, 'success': False, 'error': error}
+                continue
+            
+            team = player.current_team or 'FA'
+            if team not in team_stats_by_team:
+                team_stats_by_team[team] = get_team_context(team, current_season, current_week)
+            
+            bet['stat_name'] = stat_name
+            pending.append((index, bet, player))
+        
+        if pending:
+            # Every player's history in one or two queries
+            histories = get_players_form(player for _, _, player in pending)
+            try:
+                predictions = predictor.predict_many([
+                    BetRequest(
+                        position=player.position,
+                        stat_name=bet['stat_name'],
+                        player_history=histories[player.player_id],
+                        current_season=current_season,
+                        current_week=current_week,
+                        threshold=bet['action_amount'],
+                        bet_type=bet['bet_type'],
+                        is_playoff=is_playoff,
+                        team_stats=team_stats_by_team[player.current_team or 'FA'],
+                        player_id=player.player_id
+                    )
+                    for _, bet, player in pending
+                ])
+            except ValueError as e:
+                return JsonResponse({
+                    'success': False,
+                    'error': str(e)
+                }, status=400)
+            except ConnectionError as e:
+                # Inference server (ML_INFERENCE_SOCKET) unreachable
+                return JsonResponse({
+                    'success': False,
+                    'error': f'Prediction service unavailable: {str(e)}'
+                }, status=503)
+            except Exception as e:
+                return JsonResponse({
+                    'success': False,
+                    'error': f'Prediction error: {str(e)}'
+                }, status=500)
+            
+            # Save all scenarios in one query
+            scenarios = []
+            for (index, bet, player), result in zip(pending, predictions):
+                history = histories[player.player_id]
+                scenarios.append(_build_scenario(
+                    player, player.current_team or 'FA', player.position, bet, result,
+                    len(history), current_season, current_week, _history_warning(len(history))
+                ))
+            
+            try:
+                BettingScenario.objects.bulk_create(scenarios)
+            except Exception as e:
+                return JsonResponse({
+                    'success': False,
+                    'error': f'Error saving scenarios: {str(e)}'
+                }, status=500)
+            
+            for (index, bet, player), result, scenario in zip(pending, predictions, scenarios):
+                results[index] = {
+                    'index': index,
+                    **_build_prediction_response(
+                        scenario, player, player.current_team or 'FA', player.position, bet,
+                        result, len(histories[player.player_id]), current_season, current_week
+                    )
+                }
+        
+        return JsonResponse({
+            'success': bool(pending),
+            'count': len(pending),
+            'results': results
+        }, status=201 if pending else 400)
+    
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'success': False,
+            'error': 'Invalid JSON format'
+        }, status=400)
+    except Exception as e:
+        # Catch-all for unexpected errors
+        return JsonResponse({
+            'success': False,
+            'error': f'Server error: {str(e)}'
+        }, status=500)
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def predict_curve(request):
+    """
+    API endpoint to get win probability across a whole range of lines.
+    
+    The models run once for the player and the analysis is computed for
+    every threshold. Nothing is saved to the database.
+    
+    Request body:
+    {
+        "player": "Patrick Mahomes",
+        "action": "Passing Yards",
+        "bet_type": "over",
+        "min_threshold": 150.5,
+        "max_threshold": 350.5,
+        "step": 0.5
+        // or: "thresholds": [250.5, 262.5, 275.5]
+    }
+    
+    Response:
+    {
+        "success": true,
+        "player": {...},
+        "prediction": {...},
+        "confidence_level": "Medium",
+        "curve": [
+            {"threshold": 150.5, "win_probability": 0.95, "expected_value": 0.9,
+             "recommendation": "Good Bet", "distance_from_median": 120.3},
+            ...
+        ],
+        "details": {...}
+    }
+    """
+    try:
+        data = json.loads(request.body)
+        
+        for field in ['player', 'action', 'bet_type']:
             if field not in data or data[field] in [None, '']:
                 return JsonResponse({
                     'success': False,
@@ -74,207 +667,84 @@ def predict_bet(request):
         
         player_name = data['player']
         action = data['action']
-        bet_type = data['bet_type'].lower()
+        bet_type = str(data['bet_type']).lower()
         
-        # Validate bet type
         if bet_type not in ['over', 'under']:
             return JsonResponse({
                 'success': False,
                 'error': f'Invalid bet_type: {bet_type}. Must be "over" or "under"'
             }, status=400)
         
-        # Validate and parse amounts
-        try:
-            action_amount = float(data['action_amount'])
-            if action_amount <= 0:
-                return JsonResponse({
-                    'success': False,
-                    'error': 'action_amount must be greater than 0'
-                }, status=400)
-        except (ValueError, TypeError):
+        thresholds, error = _parse_curve_thresholds(data)
+        if error:
             return JsonResponse({
                 'success': False,
-                'error': 'action_amount must be a valid number'
+                'error': error
             }, status=400)
         
-        bet_amount = 0.0
-        if 'bet_amount' in data:
-            try:
-                bet_amount = float(data['bet_amount'])
-            except (ValueError, TypeError):
-                bet_amount = 0.0
+        stat_name = ACTION_TO_STAT.get(action)
+        if stat_name is None:
+            return JsonResponse({
+                'success': False,
+                'error': f"Unknown action '{action}'. Valid actions: {list(ACTION_TO_STAT.keys())}"
+            }, status=400)
         
-        # Look up player in database
         player = get_player_by_name(player_name)
         
         if not player:
-            # Player not found - provide suggestions
             suggestions = search_players(player_name, limit=5)
-            suggestion_names = [p.display_name for p in suggestions]
-            
             return JsonResponse({
                 'success': False,
                 'error': f'Player "{player_name}" not found in database',
-                'suggestions': suggestion_names
+                'suggestions': [p.display_name for p in suggestions]
             }, status=404)
         
-        # Get player info
         position = player.position
         team = player.current_team or 'FA'
+        current_season, current_week, is_playoff = get_prediction_week()
         
-        # Auto-detect current week from database
         try:
-            latest_game = PlayerGameStats.objects.filter(
-                season_type='REG'
-            ).order_by('-season', '-week').first()
-            
-            if latest_game:
-                current_season = latest_game.season
-                current_week = latest_game.week + 1  # Predict for NEXT week
-                
-                # Handle end of regular season (week > 18 = playoffs)
-                if current_week > 18:
-                    # If we're past week 18, we're in playoffs
-                    # Use week 18 for regular season predictions, or set is_playoff=True
-                    # For now, cap at week 18 for regular season
-                    current_week = 18
-                    is_playoff = True
-                else:
-                    is_playoff = False
-            else:
-                # Fallback
-                current_season = 2025
-                current_week = 8
-                is_playoff = False
-        except Exception:
-            current_season = 2025
-            current_week = 8
-            is_playoff = False
-        
-        # Get player history
-        try:
-            player_history = get_player_recent_games(player, num_games=8)
+            player_history = get_player_form(player)
         except Exception as e:
             return JsonResponse({
                 'success': False,
                 'error': f'Error retrieving player history: {str(e)}'
             }, status=500)
         
-        # Check if sufficient history
-        has_warning = False
-        warning_message = None
-        
-        if len(player_history) < 3:
-            has_warning = True
-            warning_message = (
-                f"Limited data available. Only {len(player_history)} games found. "
-                f"Predictions may be less accurate."
-            )
+        team_stats = get_team_context(team, current_season, current_week)
         
-        # Get team stats for the upcoming game
-        team_stats = None
         try:
-            team_stats_dict = get_team_stats_for_week(
-                team=team,
-                season=current_season,
-                week=current_week
-            )
-            
-            if team_stats_dict:
-                # Convert to format expected by ML service
-                team_stats = {
-                    'team_passing_yards': team_stats_dict.get('team_passing_yards', 230.0),
-                    'team_rushing_yards': team_stats_dict.get('team_rushing_yards', 120.0),
-                    'team_receptions': team_stats_dict.get('team_receptions', 22.0),
-                    'team_targets': team_stats_dict.get('team_targets', 34.0)
-                }
-            else:
-                # Fallback to defaults if calculation fails
-                logger.warning(
-                    f"Could not calculate team stats for {team} in {current_season} Week {current_week}. "
-                    f"Using default values."
-                )
-                team_stats = None  # Will use defaults in feature engineering
-        except Exception as e:
-            # Fallback to defaults if calculation fails
-            logger.warning(
-                f"Error calculating team stats for {team} in {current_season} Week {current_week}: {e}. "
-                f"Using default values."
-            )
-            team_stats = None  # Will use defaults in feature engineering
-        
-        # Make prediction
-        try:
-            result = predictor.predict_from_betting_scenario(
-                player_name=player.display_name,
+            curve = predictor.predict_curve(
                 position=position,
-                team=team,
-                action=action,
-                bet_type=bet_type,
-                action_amount=action_amount,
+                stat_name=stat_name,
                 player_history=player_history,
                 current_season=current_season,
                 current_week=current_week,
+                thresholds=thresholds,
+                bet_type=bet_type,
                 is_playoff=is_playoff,
-                team_stats=team_stats
+                team_stats=team_stats,
+                player_id=player.player_id
             )
         except ValueError as e:
-            # Stat doesn't match position or other validation error
             return JsonResponse({
                 'success': False,
                 'error': str(e)
             }, status=400)
-        except Exception as e:
+        except ConnectionError as e:
+            # Inference server (ML_INFERENCE_SOCKET) unreachable
             return JsonResponse({
                 'success': False,
-                'error': f'Prediction error: {str(e)}'
-            }, status=500)
-        
-        # Save to database
-        try:
-            scenario = BettingScenario.objects.create(
-                sport='football',
-                team=team,
-                player=player.display_name,
-                bet_type=bet_type,
-                action=action,
-                action_amount=Decimal(str(action_amount)),
-                bet_amount=Decimal(str(bet_amount)),
-                
-                # Mark as processed
-                is_processed=True,
-                
-                # Store predictions
-                prediction_q10=result.predictions.get('q10'),
-                prediction_q50=result.predictions.get('q50'),
-                prediction_q90=result.predictions.get('q90'),
-                
-                # Store analysis
-                win_probability=result.win_probability,
-                confidence_level=result.confidence_level,
-                expected_value=result.expected_value,
-                recommendation=result.recommendation,
-                
-                # Store metadata
-                player_position=position,
-                games_analyzed=len(player_history),
-                prediction_season=current_season,
-                prediction_week=current_week,
-                
-                # Store warning if any
-                has_warning=has_warning,
-                warning_message=warning_message
-            )
+                'error': f'Prediction service unavailable: {str(e)}'
+            }, status=503)
         except Exception as e:
             return JsonResponse({
                 'success': False,
-                'error': f'Error saving scenario: {str(e)}'
+                'error': f'Prediction error: {str(e)}'
             }, status=500)
         
-        # Build response
         response = {
             'success': True,
-            'scenario_id': scenario.id,
             
             'player': {
                 'name': player.display_name,
@@ -284,39 +754,33 @@ def predict_bet(request):
             
             'bet': {
                 'action': action,
-                'type': bet_type,
-                'threshold': action_amount,
-                'amount': float(bet_amount)
+                'type': bet_type
             },
             
             'prediction': {
-                'q10': result.predictions.get('q10'),
-                'q50': result.predictions.get('q50'),
-                'q90': result.predictions.get('q90')
+                'q10': curve.predictions.get('q10'),
+                'q50': curve.predictions.get('q50'),
+                'q90': curve.predictions.get('q90')
             },
             
-            'analysis': {
-                'win_probability': result.win_probability,
-                'confidence_level': result.confidence_level,
-                'expected_value': result.expected_value,
-                'recommendation': result.recommendation
-            },
+            'confidence_level': curve.confidence_level,
+            'curve': curve.points,
             
             'details': {
                 'games_analyzed': len(player_history),
                 'current_season': current_season,
                 'current_week': current_week,
-                'stat_display_name': result.stat_display_name,
-                'stat_unit': result.details.get('stat_unit', '')
+                'stat_display_name': curve.stat_display_name,
+                'stat_unit': curve.details.get('stat_unit', '')
             }
         }
         
-        # Add warning if present
-        if has_warning:
+        warning_message = _history_warning(len(player_history))
+        if warning_message:
             response['warning'] = warning_message
         
-        return JsonResponse(response, status=201)
-        
+        return JsonResponse(response)
+    
     except json.JSONDecodeError:
         return JsonResponse({
             'success': False,
@@ -329,3 +793,110 @@ def predict_bet(request):
             'error': f'Server error: {str(e)}'
         }, status=500)
 
+
+@require_http_methods(["GET"])
+def projections(request):
+    """
+    API endpoint listing the top precomputed projections for a stat.
+    
+    Query params: stat (required), position, season and week (default: the
+    upcoming week), limit (default 20, max 100).
+    
+    Response:
+    {
+        "success": true,
+        "season": 2025,
+        "week": 9,
+        "stat": "receiving_yards",
+        "projections": [
+            {"player": "...", "position": "WR", "team": "...", "q10": ..., "q50": ..., "q90": ...},
+            ...
+        ]
+    }
+    """
+    stat = request.GET.get('stat')
+    if not stat:
+        return JsonResponse({
+            'success': False,
+            'error': 'stat parameter is required'
+        }, status=400)
+    
+    try:
+        current_season, current_week, _ = get_prediction_week()
+        season = int(request.GET.get('season', current_season))
+        week = int(request.GET.get('week', current_week))
+        limit = min(int(request.GET.get('limit', 20)), 100)
+    except ValueError:
+        return JsonResponse({
+            'success': False,
+            'error': 'season, week and limit must be integers'
+        }, status=400)
+    
+    top = get_top_projections(
+        stat=stat,
+        season=season,
+        week=week,
+        position=request.GET.get('position'),
+        limit=limit
+    )
+    
+    return JsonResponse({
+        'success': True,
+        'season': season,
+        'week': week,
+        'stat': stat,
+        'projections': [
+            {
+                'player': projection.player.display_name,
+                'position': projection.player.position,
+                'team': projection.player.current_team,
+                'q10': projection.q10,
+                'q50': projection.q50,
+                'q90': projection.q90,
+                'games_analyzed': projection.games_analyzed,
+                'model_version': projection.model_version
+            }
+            for projection in top
+        ]
+    })
+
+
+@require_http_methods(["GET"])
+def health(request):
+    """
+    Health check reporting whether the ML models are loaded.
+    
+    Returns 503 while models are still preloading (or if preload failed),
+    so a load balancer can hold traffic until the process is warm. With
+    preloading disabled the service is always reported ready.
+    
+    Response:
+    {
+        "status": "ok",
+        "models_ready": true,
+        "preload": {"state": "ready", "models_loaded": 51, "elapsed_ms": 850.2, ...}
+    }
+    """
+    loader = predictor.model_loader
+    preload = loader.get_preload_info()
+    preload_enabled = settings.ML_PRELOAD_MODELS or settings.ML_PREFORK_PRELOAD
+    models_ready = loader.is_ready or not preload_enabled
+    
+    response = {
+        'status': 'ok' if models_ready else preload['state'],
+        'models_ready': models_ready,
+        'model_version': loader.get_model_version(),
+        'preload': {
+            'enabled': preload_enabled,
+            'state': preload['state'],
+            'models_loaded': preload['models_loaded'],
+            'elapsed_ms': preload['elapsed_ms'],
+            'total_bytes': preload['total_bytes'],
+            'errors': preload['errors']
+        }
+    }
+    
+    if request.GET.get('verbose'):
+        response['preload']['models'] = preload['models']
+    
+    return JsonResponse(response, status=200 if models_ready else 503)
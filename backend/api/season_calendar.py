@@ -0,0 +1,131 @@
+"""
+Season calendar service.
+
+Keeps the latest loaded (season, week) of each season type in the
+SeasonCalendar table, the single source of truth for which week comes
+next. The data loader rebuilds it in bulk and game stat saves advance it.
+
+Each process keeps a copy of the table in memory and serves reads from it
+without a query. Writes from the same process invalidate it; writes from
+other processes (the loader) are picked up by a version check (the latest
+updated_at, one read over at most three rows) at most once every
+SEASON_CALENDAR_POLL_SECONDS, reloading only when the version moved.
+
+Reads never write: a database whose games predate the table is filled by
+migration 0012, and the loader rebuilds the calendar after each load.
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from .models import PlayerGameStats, SeasonCalendar
+
+
+class _CalendarCache:
+    """Process-local copy of the SeasonCalendar rows."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._weeks: Optional[Dict[str, Tuple[int, int]]] = None
+        self._version = None
+        self._checked_at = 0.0
+    
+    def invalidate(self):
+        """Reload on the next read (after a write from this process)."""
+        with self._lock:
+            self._weeks = None
+    
+    def get(self) -> Dict[str, Tuple[int, int]]:
+        """Latest (season, week) by season type."""
+        now = time.monotonic()
+        with self._lock:
+            if self._weeks is not None and now - self._checked_at < settings.SEASON_CALENDAR_POLL_SECONDS:
+                return self._weeks
+            weeks, cached_version = self._weeks, self._version
+        
+        version = SeasonCalendar.objects.aggregate(version=Max('updated_at'))['version']
+        
+        if weeks is None or version != cached_version:
+            weeks = {
+                season_type: (season, week)
+                for season_type, season, week in SeasonCalendar.objects.values_list('season_type', 'season', 'week')
+            }
+        
+        with self._lock:
+            self._weeks, self._version, self._checked_at = weeks, version, now
+        return weeks
+
+
+_cache = _CalendarCache()
+
+
+def get_latest_week(season_type: str = 'REG') -> Optional[Tuple[int, int]]:
+    """
+    Get the latest loaded (season, week) of a season type.
+    
+    Returns:
+        Tuple of (season, week), or None if no games of that type are loaded
+    """
+    return _cache.get().get(season_type)
+
+
+def rebuild_season_calendar() -> Dict[str, Tuple[int, int]]:
+    """
+    Recompute the calendar from the loaded game stats.
+    
+    Returns:
+        Latest (season, week) by season type
+    """
+    latest = {}
+    for season_type, _ in PlayerGameStats.SEASON_TYPE_CHOICES:
+        game = PlayerGameStats.objects.filter(
+            season_type=season_type
+        ).order_by('-season', '-week').values_list('season', 'week').first()
+        if game:
+            latest[season_type] = game
+    
+    now = timezone.now()
+    with transaction.atomic():
+        SeasonCalendar.objects.all().delete()
+        SeasonCalendar.objects.bulk_create([
+            SeasonCalendar(season_type=season_type, season=season, week=week, updated_at=now)
+            for season_type, (season, week) in latest.items()
+        ])
+    
+    _cache.invalidate()
+    return latest
+
+
+def record_week(season: int, week: int, season_type: str):
+    """
+    Advance the calendar to a saved game's week if it is the latest one.
+    """
+    now = timezone.now()
+    advanced = SeasonCalendar.objects.filter(season_type=season_type).filter(
+        Q(season__lt=season) | Q(season=season, week__lt=week)
+    ).update(season=season, week=week, updated_at=now)
+    
+    if not advanced:
+        _, created = SeasonCalendar.objects.get_or_create(
+            season_type=season_type,
+            defaults={'season': season, 'week': week, 'updated_at': now}
+        )
+        if not created:
+            return
+    
+    _cache.invalidate()
+
+
+def forget_week(season: int, week: int, season_type: str):
+    """
+    Recompute the calendar after the last game of its latest week was deleted.
+    """
+    key = {'season_type': season_type, 'season': season, 'week': week}
+    if SeasonCalendar.objects.filter(**key).exists() and not PlayerGameStats.objects.filter(**key).exists():
+        rebuild_season_calendar()
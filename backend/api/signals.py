@@ -0,0 +1,93 @@
+"""
+Signal handlers keeping derived tables in step with PlayerGameStats.
+
+Bulk writers (the data loader) wrap their writes in deferred_updates() and
+rebuild the derived tables once afterwards instead.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .data_access import forget_projections
+from .feature_store import forget_game, record_game
+from .models import PlayerGameStats
+from .season_calendar import forget_week, record_week
+from .team_stats import refresh_team_week
+
+_state = threading.local()
+
+
+@contextmanager
+def deferred_updates():
+    """
+    Skip the per-game handlers below in this thread (the caller rebuilds the
+    derived tables when done).
+    """
+    previous = getattr(_state, 'deferred', False)
+    _state.deferred = True
+    try:
+        yield
+    finally:
+        _state.deferred = previous
+
+
+def _skip(raw: bool) -> bool:
+    """Loading fixtures (raw) or inside deferred_updates()."""
+    return raw or getattr(_state, 'deferred', False)
+
+
+@receiver(post_save, sender=PlayerGameStats)
+def update_player_features(sender, instance, raw=False, **kwargs):
+    """Fold a saved game into the player's stored rolling features."""
+    if _skip(raw):
+        # Rebuild with build_player_features afterwards
+        return
+    record_game(instance)
+
+
+@receiver(post_delete, sender=PlayerGameStats)
+def remove_from_player_features(sender, instance, **kwargs):
+    """Update the player's stored rolling features after a game is deleted."""
+    if _skip(False):
+        return
+    forget_game(instance)
+
+
+@receiver(post_save, sender=PlayerGameStats)
+@receiver(post_delete, sender=PlayerGameStats)
+def update_team_week_stats(sender, instance, raw=False, **kwargs):
+    """Re-sum the team-week of a saved or deleted game."""
+    if _skip(raw):
+        # Rebuild with build_team_week_stats afterwards
+        return
+    refresh_team_week(instance.team, instance.season, instance.week, instance.season_type)
+
+
+@receiver(post_save, sender=PlayerGameStats)
+def advance_season_calendar(sender, instance, raw=False, **kwargs):
+    """Move the season calendar forward to a saved game's week."""
+    if _skip(raw):
+        # Rebuild with rebuild_season_calendar afterwards (the loader does)
+        return
+    record_week(instance.season, instance.week, instance.season_type)
+
+
+@receiver(post_delete, sender=PlayerGameStats)
+def rewind_season_calendar(sender, instance, **kwargs):
+    """Recompute the season calendar if a game of the latest week was deleted."""
+    if _skip(False):
+        return
+    forget_week(instance.season, instance.week, instance.season_type)
+
+
+@receiver(post_save, sender=PlayerGameStats)
+@receiver(post_delete, sender=PlayerGameStats)
+def invalidate_projections(sender, instance, raw=False, **kwargs):
+    """Drop the projections a saved or deleted game makes stale."""
+    if _skip(raw):
+        # The data loader deletes every projection afterwards
+        return
+    forget_projections(player_ids=[instance.player_id], teams=[instance.team])
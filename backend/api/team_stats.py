@@ -0,0 +1,179 @@
+"""
+Team-level stats tables.
+
+TeamGameStats holds each team's own game totals, loaded in chunks from the
+team weekly stats CSVs the models were trained with.
+
+TeamWeekStats keeps one row per (team, season, week, season_type) with the
+sums of the team's PlayerGameStats rows, for weeks without team CSV data.
+The data loader fills it in bulk with one GROUP BY; saving or deleting a
+game re-sums just that game's team-week.
+"""
+
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import pandas as pd
+from django.db import transaction
+from django.db.models import Case, Count, IntegerField, QuerySet, Sum, Value, When
+
+from .constants import standardize_team_name
+from .models import PlayerGameStats, TeamGameStats, TeamWeekStats
+
+# TeamWeekStats field -> summed PlayerGameStats field
+TEAM_WEEK_SUMS = {
+    'team_passing_yards': 'passing_yards',
+    'team_rushing_yards': 'rushing_yards',
+    'team_receptions': 'receptions',
+    'team_targets': 'targets',
+}
+
+TEAM_WEEK_KEY = ('team', 'season', 'week', 'season_type')
+
+# TeamGameStats stat columns, as named in stats_team_week_<year>.csv
+TEAM_GAME_STATS = [
+    'completions', 'attempts', 'passing_yards', 'passing_tds', 'passing_interceptions',
+    'carries', 'rushing_yards', 'rushing_tds',
+    'receptions', 'targets', 'receiving_yards',
+]
+
+
+def _totals(aggregates: dict) -> dict:
+    """TeamWeekStats totals from Sum aggregates (Sum gives None for all-NULL columns)."""
+    return {field: aggregates[field] or 0 for field in TEAM_WEEK_SUMS}
+
+
+def rebuild_team_week_stats(seasons: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute team-week rows from game stats with one GROUP BY.
+    
+    Args:
+        seasons: Seasons to rebuild (default: every season)
+    
+    Returns:
+        Number of rows written
+    """
+    games = PlayerGameStats.objects.all()
+    stale = TeamWeekStats.objects.all()
+    if seasons is not None:
+        seasons = list(seasons)
+        games = games.filter(season__in=seasons)
+        stale = stale.filter(season__in=seasons)
+    
+    grouped = games.values(*TEAM_WEEK_KEY).annotate(
+        **{field: Sum(column) for field, column in TEAM_WEEK_SUMS.items()}
+    ).order_by()
+    
+    rows = [
+        TeamWeekStats(**{key: group[key] for key in TEAM_WEEK_KEY}, **_totals(group))
+        for group in grouped
+    ]
+    
+    with transaction.atomic():
+        stale.delete()
+        TeamWeekStats.objects.bulk_create(rows, batch_size=1000)
+    
+    return len(rows)
+
+
+def refresh_team_week(team: str, season: int, week: int, season_type: str):
+    """
+    Re-sum one team-week after one of its games was saved or deleted.
+    """
+    key = {'team': team, 'season': season, 'week': week, 'season_type': season_type}
+    aggregates = PlayerGameStats.objects.filter(**key).aggregate(
+        games=Count('id'),
+        **{field: Sum(column) for field, column in TEAM_WEEK_SUMS.items()}
+    )
+    
+    if not aggregates['games']:
+        TeamWeekStats.objects.filter(**key).delete()
+        return
+    
+    TeamWeekStats.objects.update_or_create(**key, defaults=_totals(aggregates))
+
+
+def _week_or_latest(rows: QuerySet, week: int):
+    """
+    The row for a week, or else the latest week's, in one query
+    (team-season rows are read in week order off the unique index).
+    """
+    return rows.order_by(
+        Case(When(week=week, then=Value(0)), default=Value(1), output_field=IntegerField()),
+        '-week'
+    ).first()
+
+
+def get_team_week_stats(team: str, season: int, week: int, season_type: str = 'REG') -> Optional[TeamWeekStats]:
+    """
+    Get a team's summed player totals for a week, or for its latest week of
+    the season when that week has no data.
+    
+    Returns:
+        TeamWeekStats row (check .week for the week used), or None without
+        any data for the team's season
+    """
+    return _week_or_latest(
+        TeamWeekStats.objects.filter(team=team, season_type=season_type, season=season),
+        week
+    )
+
+
+def get_team_game_stats(team: str, season: int, week: int, season_type: str = 'REG') -> Optional[TeamGameStats]:
+    """
+    Get a team's game totals for a week, or for its latest week of the
+    season when that week has no data.
+    
+    Returns:
+        TeamGameStats row (check .week for the week used), or None without
+        any data for the team's season
+    """
+    return _week_or_latest(
+        TeamGameStats.objects.filter(team=team, season_type=season_type, season=season),
+        week
+    )
+
+
+def load_team_game_csv(path: Union[str, Path], chunk_size: int = 5000) -> int:
+    """
+    Upsert a stats_team_week_<year>.csv file into TeamGameStats.
+    
+    Reads only the needed columns, chunk_size rows at a time, and writes each
+    chunk with one bulk INSERT ... ON CONFLICT DO UPDATE, so reloading a
+    season updates its rows in place.
+    
+    Returns:
+        Number of rows written
+    """
+    columns = list(TEAM_WEEK_KEY) + ['opponent_team'] + TEAM_GAME_STATS
+    written = 0
+    
+    for chunk in pd.read_csv(path, usecols=columns, chunksize=chunk_size):
+        chunk = chunk.dropna(subset=['team', 'season', 'week'])
+        teams = chunk['team'].map(standardize_team_name).tolist()
+        opponents = chunk['opponent_team'].fillna('').map(standardize_team_name).tolist()
+        stats = chunk[TEAM_GAME_STATS].fillna(0).astype('int64').to_numpy().tolist()
+        
+        rows = [
+            TeamGameStats(
+                team=team, season=season, week=week, season_type=season_type,
+                opponent_team=opponent, **dict(zip(TEAM_GAME_STATS, values))
+            )
+            for team, season, week, season_type, opponent, values in zip(
+                teams,
+                chunk['season'].astype('int64').tolist(),
+                chunk['week'].astype('int64').tolist(),
+                chunk['season_type'].tolist(),
+                opponents,
+                stats
+            )
+        ]
+        TeamGameStats.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['team', 'season_type', 'season', 'week'],
+            update_fields=['opponent_team'] + TEAM_GAME_STATS
+        )
+        written += len(rows)
+    
+    return written
@@ -3,12 +3,38 @@ Unit test for the BettingScenario API endpoint.
 Tests if JSON data is submitted and processed properly.
 """
 
+import gc
+import io
 import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
 from decimal import Decimal
-from django.test import TestCase, Client
+from unittest import mock
+import joblib
+import numpy as np
+import pandas as pd
+from django.core.management import CommandError, call_command
+from django.conf import settings
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
-from .models import BettingScenario, Player, PlayerGameStats
-from .data_access import get_team_stats_for_week, get_team_stats_summary
+from .models import BettingScenario, Player, PlayerFeatures, PlayerGameStats, PlayerProjection
+from .data_access import get_team_context, get_team_stats_for_week, get_team_stats_summary
+from .prediction_views import predictor
+from ml_service import BetRequest, InferenceClient, InferenceServer, ModelLoader, ModelRegistry, PredictionService
+from ml_service.prediction_cache import QuantileCache
+from ml_service.model_cache import ModelCache
+from ml_service.model_manifest import ModelManifest
+from ml_service.inference_engine import BoosterPredictor, InferenceEngine, ThreadingPolicy, FAST_SINGLE_ROW_AVAILABLE
+from ml_service.tree_evaluator import NumpyTreeModel, TreeEnsemble, TREE_ARRAYS_DIR
+from ml_service.model_bundle import ModelBundle, BUNDLE_FILENAME
+from ml_service.constants import POSITION_STATS
+from ml_service.feature_engineering import FeatureEngineer, RollingFeatures
 
 
 class BettingScenarioAPITest(TestCase):
@@ -330,4 +356,2089 @@ class TeamStatsTest(TestCase):
         # Values should be the same as before (NULL doesn't add anything)
         self.assertEqual(stats['team_passing_yards'], 250.0)
         self.assertEqual(stats['team_rushing_yards'], 100.0)
-        
\ No newline at end of file
+        
+    def test_team_week_lookup_single_query(self):
+        """Team stats for a week, or the fallback week, are one query on TeamWeekStats."""
+        with self.assertNumQueries(1):
+            self.assertEqual(get_team_stats_for_week('KC', 2025, 1)['team_targets'], 18.0)
+        with self.assertNumQueries(1):
+            self.assertEqual(get_team_stats_for_week('KC', 2025, 5)['team_passing_yards'], 300.0)
+        with self.assertNumQueries(1):
+            self.assertIsNone(get_team_stats_for_week('BUF', 2025, 1))
+    
+    def test_team_week_stats_follow_game_changes(self):
+        """Saving, updating and deleting games re-sums their team-week."""
+        from .models import TeamWeekStats
+        
+        game = PlayerGameStats.objects.create(
+            player=self.wr, season=2025, week=2, season_type='REG',
+            team='KC', opponent_team='LV', receptions=6, targets=9
+        )
+        self.assertEqual(get_team_stats_for_week('KC', 2025, 2)['team_receptions'], 9.0)
+        
+        game.receptions = 2
+        game.save()
+        self.assertEqual(get_team_stats_for_week('KC', 2025, 2)['team_receptions'], 5.0)
+        
+        PlayerGameStats.objects.filter(week=2).delete()
+        self.assertFalse(TeamWeekStats.objects.filter(team='KC', season=2025, week=2).exists())
+        self.assertEqual(get_team_stats_for_week('KC', 2025, 2)['team_passing_yards'], 250.0)
+    
+    def test_rebuild_team_week_stats(self):
+        """A bulk rebuild writes the same totals as incremental updates."""
+        from .models import TeamWeekStats
+        from .team_stats import rebuild_team_week_stats
+        
+        fields = ['team', 'season', 'week', 'season_type', 'team_passing_yards',
+                  'team_rushing_yards', 'team_receptions', 'team_targets']
+        incremental = list(TeamWeekStats.objects.order_by('week').values(*fields))
+        
+        TeamWeekStats.objects.all().delete()
+        self.assertEqual(rebuild_team_week_stats([2025]), 2)
+        self.assertEqual(list(TeamWeekStats.objects.order_by('week').values(*fields)), incremental)
+        self.assertEqual(incremental[0]['team_rushing_yards'], 100)
+        
+        call_command('build_team_week_stats', '--seasons', '2024', stdout=io.StringIO())
+        self.assertEqual(TeamWeekStats.objects.count(), 2)
+    
+    def test_migration_backfills_existing_games(self):
+        """Migrating a database with game stats fills TeamWeekStats without build_team_week_stats."""
+        import importlib
+        from django.apps import apps
+        from .models import TeamWeekStats
+        
+        fields = ['team', 'season', 'week', 'team_passing_yards', 'team_rushing_yards', 'team_targets']
+        expected = list(TeamWeekStats.objects.order_by('week').values(*fields))
+        
+        TeamWeekStats.objects.all().delete()
+        migration = importlib.import_module('api.migrations.0010_backfill_teamweekstats')
+        migration.backfill_team_week_stats(apps, None)
+        
+        self.assertEqual(list(TeamWeekStats.objects.order_by('week').values(*fields)), expected)
+        self.assertEqual(get_team_stats_for_week('KC', 2025, 1)['team_rushing_yards'], 100.0)
+
+
+class TeamGameStatsTest(TestCase):
+    """Tests for the team weekly stats ingest and the team context served from it."""
+    
+    CSV_HEADER = ('season,week,team,season_type,opponent_team,completions,attempts,passing_yards,passing_tds,'
+                  'passing_interceptions,passing_epa,carries,rushing_yards,rushing_tds,receptions,targets,'
+                  'receiving_yards,special_teams_tds\n')
+    
+    def setUp(self):
+        """Write a team weekly stats file with two KC weeks, a BUF week and a row without a team."""
+        self.stats_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.stats_dir)
+        self._write_csv([
+            '2025,1,KC,REG,LAC,24,35,270,2,1,8.5,25,110,1,24,34,270,0',
+            '2025,2,KC,REG,PHI,18,30,200,1,0,,30,140,2,18,28,200,0',
+            '2025,1,BUF,REG,BAL,28,40,320,3,0,12.1,22,90,1,28,39,320,1',
+            '2025,3,,REG,,0,0,0,0,0,,0,0,0,0,0,0,0',
+        ])
+    
+    def _write_csv(self, lines):
+        (self.stats_dir / 'stats_team_week_2025.csv').write_text(self.CSV_HEADER + '\n'.join(lines) + '\n')
+    
+    def _load(self, *args):
+        call_command('load_team_stats', '--dir', str(self.stats_dir), *args, stdout=io.StringIO())
+    
+    def test_load_and_reload(self):
+        """Files load in chunks, skip rows without a team and update in place when reloaded."""
+        from .models import TeamGameStats
+        
+        self._load('--chunk-size', '2')
+        self.assertEqual(TeamGameStats.objects.count(), 3)
+        kc_week_2 = TeamGameStats.objects.get(team='KC', season=2025, week=2)
+        self.assertEqual((kc_week_2.opponent_team, kc_week_2.rushing_yards, kc_week_2.targets), ('PHI', 140, 28))
+        
+        self._write_csv(['2025,2,KC,REG,PHI,19,31,215,1,0,,30,140,2,19,29,215,0'])
+        self._load('--years', '2025')
+        self.assertEqual(TeamGameStats.objects.count(), 3)
+        self.assertEqual(TeamGameStats.objects.get(team='KC', season=2025, week=2).passing_yards, 215)
+    
+    def test_team_context_from_team_games(self):
+        """Team context reads the team's game row in one query, with the latest-week fallback."""
+        from .data_access import get_team_game_context
+        
+        self._load()
+        
+        with self.assertNumQueries(1):
+            context = get_team_game_context('Kansas City Chiefs', 2025, 1)
+        self.assertEqual(context, {
+            'team_passing_yards': 270.0, 'team_rushing_yards': 110.0,
+            'team_receptions': 24.0, 'team_targets': 34.0
+        })
+        self.assertEqual(get_team_context('KC', 2025, 5)['team_passing_yards'], 200.0)
+        self.assertIsNone(get_team_game_context('KC', 2024, 1))
+    
+    def test_team_context_falls_back_to_player_sums(self):
+        """Teams without loaded team stats still get context summed from player rows."""
+        self._load()
+        wr = Player.objects.create(player_id='team-game-wr', display_name='Team Game WR', position='WR')
+        PlayerGameStats.objects.create(
+            player=wr, season=2025, week=1, season_type='REG',
+            team='DEN', opponent_team='TEN', receptions=7, targets=10, receiving_yards=95
+        )
+        
+        self.assertEqual(get_team_context('DEN', 2025, 1)['team_targets'], 10.0)
+    
+    def test_migration_loads_team_stats_for_existing_games(self):
+        """Migrating a database with game stats loads the team CSVs of its seasons."""
+        import importlib
+        from django.apps import apps
+        from .models import TeamGameStats
+        
+        migration = importlib.import_module('api.migrations.0011_load_teamgamestats')
+        with mock.patch.object(migration, 'TEAM_STATS_DIR', self.stats_dir):
+            migration.load_team_game_stats(apps, None)
+            self.assertFalse(TeamGameStats.objects.exists())  # empty database: nothing to load
+            
+            wr = Player.objects.create(player_id='team-game-wr', display_name='Team Game WR', position='WR')
+            PlayerGameStats.objects.create(
+                player=wr, season=2025, week=1, season_type='REG',
+                team='KC', opponent_team='LAC', receptions=7, targets=10, receiving_yards=95
+            )
+            migration.load_team_game_stats(apps, None)
+        
+        self.assertEqual(TeamGameStats.objects.count(), 3)
+        self.assertEqual(get_team_context('KC', 2025, 1)['team_targets'], 34.0)
+
+
+def create_player_with_games(player_id, display_name, position, yards):
+    """
+    Create a KC player with one 2025 regular season game against DEN per
+    value of yards (weeks 1, 2, ...): passing yards for a QB, receiving
+    yards otherwise.
+    """
+    player = Player.objects.create(
+        player_id=player_id,
+        display_name=display_name,
+        position=position,
+        current_team='KC'
+    )
+    for week, value in enumerate(yards, start=1):
+        if position == 'QB':
+            stats = {'passing_yards': value, 'passing_tds': 2, 'completions': 24, 'attempts': 36, 'rushing_yards': 12}
+        else:
+            stats = {'receiving_yards': value, 'receptions': 5, 'targets': 8, 'receiving_tds': week % 2}
+        PlayerGameStats.objects.create(
+            player=player, season=2025, week=week, season_type='REG',
+            team='KC', opponent_team='DEN', **stats
+        )
+    return player
+
+
+class BatchPredictionTest(TestCase):
+    """Test cases for batched multi-bet predictions."""
+    
+    def setUp(self):
+        """Set up a QB and a WR with a few games of history."""
+        predictor.clear_prediction_cache()
+        
+        self.qb = create_player_with_games('batch-qb-001', 'Batch QB', 'QB', [250, 310, 275, 290])
+        self.wr = create_player_with_games('batch-wr-001', 'Batch WR', 'WR', [60, 85, 40, 95])
+    
+    def test_predict_many_matches_single_predictions(self):
+        """Batched predictions match one-at-a-time predictions."""
+        from .data_access import get_player_recent_games
+        
+        qb_history = get_player_recent_games(self.qb, num_games=8)
+        wr_history = get_player_recent_games(self.wr, num_games=8)
+        
+        bets = [
+            BetRequest('QB', 'passing_yards', qb_history, 2025, 5, 275.5, 'over'),
+            BetRequest('WR', 'receiving_yards', wr_history, 2025, 5, 60.5, 'under'),
+            BetRequest('QB', 'passing_yards', qb_history.iloc[:2], 2025, 5, 240.5, 'under',
+                       team_stats={'team_passing_yards': 260.0, 'team_rushing_yards': 110.0,
+                                   'team_receptions': 24.0, 'team_targets': 35.0}),
+            BetRequest('QB', 'passing_yards', qb_history.iloc[:0], 2025, 5, 200.5, 'over'),
+        ]
+        
+        batched = predictor.predict_many(bets)
+        
+        self.assertEqual(len(batched), len(bets))
+        for bet, result in zip(bets, batched):
+            single = predictor.predict(
+                position=bet.position,
+                stat_name=bet.stat_name,
+                player_history=bet.player_history,
+                current_season=bet.current_season,
+                current_week=bet.current_week,
+                threshold=bet.threshold,
+                bet_type=bet.bet_type,
+                team_stats=bet.team_stats
+            )
+            for quantile in ['q10', 'q50', 'q90']:
+                self.assertAlmostEqual(result.predictions[quantile], single.predictions[quantile], places=9)
+            self.assertEqual(result.win_probability, single.win_probability)
+            self.assertEqual(result.recommendation, single.recommendation)
+    
+    def test_predict_many_rejects_invalid_stat(self):
+        """An invalid position/stat combination fails the whole batch."""
+        from .data_access import get_player_recent_games
+        
+        history = get_player_recent_games(self.wr, num_games=8)
+        with self.assertRaises(ValueError):
+            predictor.predict_many([
+                BetRequest('WR', 'passing_yards', history, 2025, 5, 10.5, 'over')
+            ])
+    
+    def test_predict_bets_endpoint(self):
+        """The batch endpoint scores valid bets and reports per-bet errors."""
+        client = Client()
+        url = reverse('predict_bets')
+        
+        payload = {
+            'bets': [
+                {'player': 'Batch QB', 'action': 'Passing Yards', 'bet_type': 'over', 'action_amount': 275.5},
+                {'player': 'Batch WR', 'action': 'Receiving Yards', 'bet_type': 'under', 'action_amount': 60.5,
+                 'bet_amount': 25},
+                {'player': 'Nobody Here', 'action': 'Passing Yards', 'bet_type': 'over', 'action_amount': 200},
+                {'player': 'Batch WR', 'action': 'Passing Yards', 'bet_type': 'over', 'action_amount': 10},
+            ]
+        }
+        
+        response = client.post(url, data=json.dumps(payload), content_type='application/json')
+        
+        self.assertEqual(response.status_code, 201)
+        response_data = json.loads(response.content)
+        self.assertEqual(response_data['count'], 2)
+        
+        results = response_data['results']
+        self.assertEqual([r['index'] for r in results], [0, 1, 2, 3])
+        self.assertTrue(results[0]['success'])
+        self.assertTrue(results[1]['success'])
+        self.assertFalse(results[2]['success'])
+        self.assertFalse(results[3]['success'])
+        self.assertEqual(results[0]['player']['position'], 'QB')
+        self.assertIn('q50', results[1]['prediction'])
+        
+        self.assertEqual(BettingScenario.objects.count(), 2)
+        self.assertEqual(BettingScenario.objects.filter(player='Batch WR').first().bet_amount, Decimal('25'))
+    
+    def test_predict_bets_requires_list(self):
+        """The batch endpoint rejects a request without a list of bets."""
+        client = Client()
+        response = client.post(
+            reverse('predict_bets'),
+            data=json.dumps({'bets': []}),
+            content_type='application/json'
+        )
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('bets', json.loads(response.content)['error'])
+
+
+class QuantileCacheTest(TestCase):
+    """Test cases for the threshold-independent quantile cache."""
+    
+    def setUp(self):
+        """Set up a QB with a few games of history."""
+        self.qb = create_player_with_games('cache-qb-001', 'Cache QB', 'QB', [250, 310, 275])
+    
+    def test_lru_eviction_and_counters(self):
+        """The cache evicts the least recently used entry once full."""
+        cache = QuantileCache(max_size=2)
+        cache.set('a', {'q50': 1.0})
+        cache.set('b', {'q50': 2.0})
+        
+        self.assertEqual(cache.get('a'), {'q50': 1.0})  # 'a' is now most recent
+        cache.set('c', {'q50': 3.0})                     # evicts 'b'
+        
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), {'q50': 3.0})
+        
+        info = cache.get_info()
+        self.assertEqual(info['size'], 2)
+        self.assertEqual(info['hits'], 2)
+        self.assertEqual(info['misses'], 1)
+        self.assertEqual(info['evictions'], 1)
+    
+    def test_key_depends_on_team_stats(self):
+        """Different team context produces a different cache key."""
+        base = dict(player_id='p', position='QB', stat_name='passing_yards',
+                    season=2025, week=5, model_version='v1')
+        
+        self.assertEqual(QuantileCache.make_key(**base), QuantileCache.make_key(**base))
+        self.assertNotEqual(
+            QuantileCache.make_key(**base),
+            QuantileCache.make_key(**base, team_stats={'team_passing_yards': 250.0})
+        )
+    
+    def test_repeat_prediction_at_new_line_skips_models(self):
+        """A second threshold for the same player/stat is served from the cache."""
+        from .data_access import get_player_recent_games
+        
+        service = PredictionService(cache_size=16)
+        history = get_player_recent_games(self.qb, num_games=8)
+        kwargs = dict(
+            position='QB', stat_name='passing_yards', player_history=history,
+            current_season=2025, current_week=4, bet_type='over', player_id=self.qb.player_id
+        )
+        
+        first = service.predict(threshold=250.5, **kwargs)
+        
+        with mock.patch.object(service.feature_engineer, 'prepare_inference_features') as prepare, \
+                mock.patch.object(service.model_loader, 'get_all_quantile_models') as get_models:
+            second = service.predict(threshold=300.5, **kwargs)
+            prepare.assert_not_called()
+            get_models.assert_not_called()
+        
+        self.assertEqual(first.predictions, second.predictions)
+        self.assertEqual(second.threshold, 300.5)
+        self.assertEqual(
+            second.win_probability,
+            service._analyze_prediction(first.predictions, 300.5, 'over')['win_probability']
+        )
+        self.assertEqual(service.quantile_cache.get_info()['hits'], 1)
+
+
+class PredictionCurveTest(TestCase):
+    """Test cases for win-probability curves over a range of lines."""
+    
+    def setUp(self):
+        """Set up a QB with a few games of history."""
+        predictor.clear_prediction_cache()
+        self.qb = create_player_with_games('curve-qb-001', 'Curve QB', 'QB', [250, 310, 275, 290])
+    
+    def test_vectorized_analysis_matches_scalar(self):
+        """The vectorized analysis gives the same answers as _analyze_prediction."""
+        cases = [
+            {'q10': 150.2, 'q50': 230.7, 'q90': 301.1},  # wide spread
+            {'q10': 0.1, 'q50': 0.4, 'q90': 1.2},        # small counts
+            {'q10': 60.0, 'q50': 62.0, 'q90': 65.0},     # tight spread
+        ]
+        for predictions in cases:
+            thresholds = [0.5, predictions['q10'], predictions['q50'], predictions['q90']]
+            thresholds += [x / 2 for x in range(1, 800, 7)]
+            for bet_type in ['over', 'under']:
+                curve = predictor._analyze_thresholds(predictions, thresholds, bet_type)
+                for i, threshold in enumerate(thresholds):
+                    expected = predictor._analyze_prediction(predictions, threshold, bet_type)
+                    self.assertEqual(round(float(curve['win_probability'][i]), 3), expected['win_probability'])
+                    self.assertEqual(round(float(curve['expected_value'][i]), 3), expected['expected_value'])
+                    self.assertEqual(curve['recommendation'][i], expected['recommendation'])
+                    self.assertEqual(curve['confidence_level'], expected['confidence_level'])
+    
+    def test_predict_curve_endpoint(self):
+        """The curve endpoint returns one point per half-yard and saves nothing."""
+        client = Client()
+        
+        response = client.post(
+            reverse('predict_curve'),
+            data=json.dumps({
+                'player': 'Curve QB',
+                'action': 'Passing Yards',
+                'bet_type': 'over',
+                'min_threshold': 150.5,
+                'max_threshold': 350.5,
+                'step': 0.5
+            }),
+            content_type='application/json'
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        response_data = json.loads(response.content)
+        curve = response_data['curve']
+        self.assertEqual(len(curve), 401)
+        self.assertEqual(curve[0]['threshold'], 150.5)
+        self.assertEqual(curve[-1]['threshold'], 350.5)
+        
+        # Over win probability never increases as the line goes up
+        probabilities = [point['win_probability'] for point in curve]
+        self.assertEqual(probabilities, sorted(probabilities, reverse=True))
+        
+        # Matches a single prediction at the same line
+        single = predictor._analyze_prediction(response_data['prediction'], 275.5, 'over')
+        point = next(p for p in curve if p['threshold'] == 275.5)
+        self.assertEqual(point['win_probability'], single['win_probability'])
+        self.assertEqual(point['recommendation'], single['recommendation'])
+        
+        self.assertEqual(BettingScenario.objects.count(), 0)
+    
+    def test_predict_curve_rejects_oversized_grid(self):
+        """Grids larger than the maximum number of points are rejected."""
+        client = Client()
+        
+        response = client.post(
+            reverse('predict_curve'),
+            data=json.dumps({
+                'player': 'Curve QB',
+                'action': 'Passing Yards',
+                'bet_type': 'under',
+                'min_threshold': 0.5,
+                'max_threshold': 5000.5,
+                'step': 0.5
+            }),
+            content_type='application/json'
+        )
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Too many thresholds', json.loads(response.content)['error'])
+
+
+HISTORY_STATS = [
+    'completions', 'attempts', 'passing_yards', 'passing_tds', 'passing_interceptions',
+    'carries', 'rushing_yards', 'rushing_tds', 'receptions', 'targets',
+    'receiving_yards', 'receiving_tds',
+]
+
+
+def random_player_history(rng, num_games, integer=True):
+    """Build a history DataFrame shaped like get_player_recent_games output."""
+    weeks = rng.permutation(np.arange(1, 19))[:num_games]
+    history = pd.DataFrame({
+        'player_id': ['parity-001'] * num_games,
+        'season': rng.choice([2024, 2025], size=num_games),
+        'week': weeks,
+        'season_type': ['REG'] * num_games,
+        'team': ['KC'] * num_games,
+        'opponent_team': ['DEN'] * num_games,
+    })
+    for stat in HISTORY_STATS:
+        if integer:
+            history[stat] = rng.integers(0, 350, size=num_games)
+        else:
+            history[stat] = rng.random(num_games) * 350
+    return history
+
+
+class FeatureVectorParityTest(TestCase):
+    """The NumPy feature fast path must match the DataFrame path (up to rounding)."""
+    
+    def test_vector_matches_dataframe_path_for_every_model(self):
+        """prepare_inference_vector == align_features(prepare_inference_features) for all models."""
+        engineer = FeatureEngineer()
+        feature_columns = predictor.model_loader._load_feature_columns()
+        rng = np.random.default_rng(42)
+        team_stats_options = [
+            None,
+            {'team_passing_yards': 255.0, 'team_rushing_yards': 101.0,
+             'team_receptions': 21.0, 'team_targets': 33.0},
+            {'team_passing_yards': 255.0},
+        ]
+        
+        with self.assertLogs('ml_service.feature_engineering', level='WARNING'):
+            for model_key, columns in feature_columns.items():
+                position = model_key.split('_', 1)[0]
+                stat_cols = POSITION_STATS[position]
+                
+                for num_games in range(0, 9):
+                    history = random_player_history(rng, num_games, integer=num_games % 2 == 0)
+                    for team_stats in team_stats_options:
+                        kwargs = dict(
+                            stat_cols=stat_cols, current_season=2025, current_week=9,
+                            is_playoff=num_games == 4, team_stats=team_stats
+                        )
+                        expected = engineer.align_features(
+                            engineer.prepare_inference_features(
+                                player_history=history, position=position, **kwargs
+                            ),
+                            columns
+                        ).to_numpy(dtype=np.float64)[0]
+                        actual = engineer.prepare_inference_vector(
+                            player_history=history, feature_columns=columns, **kwargs
+                        )
+                        
+                        np.testing.assert_allclose(
+                            actual, expected, rtol=1e-9, atol=1e-9, err_msg=f'{model_key}, {num_games} games'
+                        )
+    
+    def test_vector_predictions_match_dataframe_predictions(self):
+        """Model outputs are identical whether fed the vector or the aligned DataFrame."""
+        engineer = FeatureEngineer()
+        history = random_player_history(np.random.default_rng(7), 8)
+        columns = predictor.model_loader.get_feature_columns('WR', 'receiving_yards')
+        kwargs = dict(stat_cols=POSITION_STATS['WR'], current_season=2025, current_week=9)
+        
+        aligned = engineer.align_features(
+            engineer.prepare_inference_features(player_history=history, position='WR', **kwargs),
+            columns
+        )
+        vector = engineer.prepare_inference_vector(player_history=history, feature_columns=columns, **kwargs)
+        
+        for quantile, (model, _) in predictor.model_loader.get_all_quantile_models('WR', 'receiving_yards').items():
+            self.assertEqual(model.predict(aligned)[0], model.predict(vector.reshape(1, -1))[0])
+
+
+class FeaturePlanTest(TestCase):
+    """Compiled feature plans must match the models they were built for."""
+    
+    def test_plans_compile_and_validate_for_every_model(self):
+        """Every model's plan matches feature_columns.joblib and the Booster's feature names."""
+        loader = ModelLoader()
+        
+        with self.assertLogs('ml_service.feature_engineering', level='WARNING'):
+            for model_key, columns in loader._load_feature_columns().items():
+                position, stat_name = model_key.split('_', 1)
+                plan = loader.get_feature_plan(position, stat_name)
+                
+                self.assertEqual(list(plan.feature_columns), list(columns))
+                self.assertIs(loader.get_feature_plan(position, stat_name), plan)
+    
+    def test_mismatched_model_features_raise(self):
+        """A model trained on a different column order is rejected when the plan is compiled."""
+        loader = ModelLoader()
+        columns = list(loader.get_feature_columns('QB', 'passing_yards'))
+        loader._feature_columns = dict(loader._load_feature_columns())
+        loader._feature_columns['QB_passing_yards'] = columns[::-1]
+        
+        with self.assertLogs('ml_service.feature_engineering', level='WARNING'):
+            with self.assertRaises(ValueError):
+                loader.get_feature_plan('QB', 'passing_yards')
+    
+    def test_fill_features_into_preallocated_rows(self):
+        """Filling rows of a batch matrix gives the same vectors as prepare_inference_vector."""
+        engineer = FeatureEngineer()
+        plan = predictor.model_loader.get_feature_plan('RB', 'rushing_yards')
+        rng = np.random.default_rng(3)
+        histories = [random_player_history(rng, n) for n in (8, 3, 1)]
+        kwargs = dict(current_season=2025, current_week=12)
+        
+        matrix = np.full((len(histories), len(plan.feature_columns)), np.nan)
+        for row, history in enumerate(histories):
+            engineer.fill_features(plan, history, out=matrix[row], **kwargs)
+        
+        for row, history in enumerate(histories):
+            expected = engineer.prepare_inference_vector(
+                player_history=history,
+                stat_cols=POSITION_STATS['RB'],
+                feature_columns=list(plan.feature_columns),
+                **kwargs
+            )
+            np.testing.assert_array_equal(matrix[row], expected)
+
+
+class ModelPreloadTest(TestCase):
+    """Tests for warm model preloading and the health endpoint."""
+    
+    def test_preload_loads_every_model(self):
+        """preload() loads all models and reports load time and size for each."""
+        loader = ModelLoader()
+        self.assertFalse(loader.is_ready)
+        
+        with self.assertLogs('ml_service.feature_engineering', level='WARNING'):
+            info = loader.preload(max_workers=4)
+        
+        expected = sum(len(stats) for stats in POSITION_STATS.values()) * 3
+        self.assertTrue(loader.is_ready)
+        self.assertEqual(info['state'], 'ready')
+        self.assertEqual(info['models_loaded'], expected)
+        self.assertEqual(len(info['models']), expected)
+        self.assertEqual(loader.get_cache_info()['cache_size'], expected)
+        self.assertEqual(info['errors'], {})
+        for stats in info['models'].values():
+            self.assertGreater(stats['size_bytes'], 0)
+            self.assertGreaterEqual(stats['load_time_ms'], 0)
+        self.assertEqual(info['total_bytes'], sum(s['size_bytes'] for s in info['models'].values()))
+    
+    def test_only_the_wsgi_app_preloads(self):
+        """With preloading enabled, django.setup() (every manage.py command) doesn't build the predictor."""
+        script = (
+            "import django, sys\n"
+            "django.setup()\n"
+            "assert 'api.prediction_views' not in sys.modules\n"
+            "import hedge_bets.wsgi\n"
+            "assert 'api.prediction_views' in sys.modules\n"
+        )
+        env = dict(os.environ, ML_PRELOAD_MODELS='false', ML_MODEL_REGISTRY_DIR='', ML_PREFORK_PRELOAD='true',
+                   DJANGO_SETTINGS_MODULE='hedge_bets.settings')
+        
+        result = subprocess.run(
+            [sys.executable, '-c', script],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, timeout=120
+        )
+        
+        self.assertEqual(result.returncode, 0, result.stderr)
+    
+    def test_preload_failure_is_not_ready(self):
+        """A model that fails validation leaves the loader not ready, with the error reported."""
+        loader = ModelLoader()
+        loader._feature_columns = dict(loader._load_feature_columns())
+        loader._feature_columns['QB_passing_yards'] = loader._feature_columns['QB_passing_yards'][::-1]
+        
+        with self.assertLogs('ml_service', level='WARNING'):
+            info = loader.preload(max_workers=4)
+        
+        self.assertFalse(loader.is_ready)
+        self.assertEqual(info['state'], 'failed')
+        self.assertIn('QB_passing_yards', info['errors'])
+    
+    @override_settings(ML_PRELOAD_MODELS=True)
+    def test_health_reports_loading_until_ready(self):
+        """Health returns 503 while preloading and 200 once models are ready."""
+        client = Client()
+        
+        with mock.patch.object(predictor.model_loader, '_preload_state', 'loading'):
+            response = client.get(reverse('health'))
+            self.assertEqual(response.status_code, 503)
+            self.assertFalse(response.json()['models_ready'])
+        
+        with mock.patch.object(predictor.model_loader, '_preload_state', 'ready'):
+            response = client.get(reverse('health'), {'verbose': '1'})
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.json()['models_ready'])
+            self.assertIn('models', response.json()['preload'])
+    
+    @override_settings(ML_PRELOAD_MODELS=False)
+    def test_health_ready_without_preload(self):
+        """With preloading disabled, models load lazily and health is always ok."""
+        response = Client().get(reverse('health'))
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'ok')
+
+
+class ModelCacheTest(TestCase):
+    """Tests for the byte-budgeted model cache."""
+    
+    def test_lru_evicts_least_recently_used(self):
+        """Over budget, the least recently used model goes first."""
+        cache = ModelCache(max_bytes=300, policy='lru')
+        cache.put('a', 'model-a', 100)
+        cache.put('b', 'model-b', 100)
+        cache.put('c', 'model-c', 100)
+        cache.get('a')
+        cache.put('d', 'model-d', 100)
+        
+        self.assertEqual(cache.keys(), ['c', 'a', 'd'])
+        info = cache.get_info()
+        self.assertEqual(info['total_bytes'], 300)
+        self.assertEqual(info['evictions'], 1)
+        self.assertEqual(info['hits'], 1)
+    
+    def test_lfu_keeps_hot_models(self):
+        """Over budget, LFU keeps frequently used models even if not used recently."""
+        cache = ModelCache(max_bytes=300, policy='lfu')
+        cache.put('QB_passing_yards_q50', 'hot', 100)
+        for _ in range(5):
+            cache.get('QB_passing_yards_q50')
+        cache.put('TE_receptions_q10', 'cold', 100)
+        cache.put('RB_rushing_tds_q90', 'cold', 100)
+        cache.get('RB_rushing_tds_q90')
+        cache.put('WR_receptions_q50', 'new', 100)
+        
+        self.assertIn('QB_passing_yards_q50', cache)
+        self.assertNotIn('TE_receptions_q10', cache)
+        self.assertEqual(cache.get('missing'), None)
+        self.assertEqual(cache.get_info()['misses'], 1)
+    
+    def test_oversized_entry_is_kept(self):
+        """A model larger than the budget is still cached, alone."""
+        cache = ModelCache(max_bytes=150, policy='lru')
+        cache.put('a', 'model-a', 100)
+        cache.put('b', 'model-b', 200)
+        
+        self.assertEqual(cache.keys(), ['b'])
+    
+    def test_invalid_policy(self):
+        """Unknown eviction policies are rejected."""
+        with self.assertRaises(ValueError):
+            ModelCache(policy='fifo')
+    
+    def test_model_loader_respects_budget(self):
+        """ModelLoader stays within its byte budget and reports the counters."""
+        budget = 3 * 300_000
+        loader = ModelLoader(cache_max_bytes=budget, cache_policy='lru')
+        
+        for stat_name in ['passing_yards', 'passing_tds']:
+            loader.get_all_quantile_models('QB', stat_name)
+        loader.get_model('QB', 'passing_tds', 'q50')
+        
+        info = loader.get_cache_info()
+        self.assertLessEqual(info['total_bytes'], budget)
+        self.assertEqual(info['evictions'], 6 - info['cache_size'])
+        self.assertEqual(info['hits'], 1)
+        self.assertIn('QB_passing_tds_q50', info['cached_models'])
+
+
+class SingleFlightLoadingTest(TestCase):
+    """Concurrent cold requests must load each model exactly once."""
+    
+    def test_concurrent_get_all_quantile_models_loads_once(self):
+        """Many threads hammering the same models read and load each file once."""
+        loader = ModelLoader()
+        real_read_bytes = Path.read_bytes
+        load_counts = {}
+        counts_lock = threading.Lock()
+        
+        def slow_counting_read(path):
+            with counts_lock:
+                load_counts[path.name] = load_counts.get(path.name, 0) + 1
+            time.sleep(0.05)  # widen the race window
+            return real_read_bytes(path)
+        
+        num_threads = 32
+        combos = [('QB', 'passing_yards'), ('WR', 'receptions')]
+        barrier = threading.Barrier(num_threads)
+        results = [None] * num_threads
+        errors = []
+        
+        def worker(index):
+            try:
+                barrier.wait()
+                position, stat_name = combos[index % len(combos)]
+                models = loader.get_all_quantile_models(position, stat_name)
+                results[index] = {q: id(model) for q, (model, _) in models.items()}
+            except Exception as e:
+                errors.append(e)
+        
+        with mock.patch.object(Path, 'read_bytes', autospec=True, side_effect=slow_counting_read):
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(num_threads)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        self.assertEqual(errors, [])
+        # 6 model files + feature_columns.joblib, each loaded exactly once
+        self.assertEqual(len(load_counts), 7)
+        self.assertTrue(all(count == 1 for count in load_counts.values()), load_counts)
+        
+        # Every thread got the same model objects for its combination
+        for index in range(len(combos)):
+            self.assertEqual(len({tuple(sorted(r.items())) for r in results[index::len(combos)]}), 1)
+
+
+class ModelRegistryTest(TestCase):
+    """Tests for the versioned model registry and hot reloading."""
+    
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        
+        # A small bundle: the QB passing yards models plus the shared files
+        self.source = self.tmp / 'bundle'
+        self.source.mkdir()
+        models_dir = Path(predictor.model_loader.models_dir)
+        for name in ['feature_columns.joblib', 'model_metadata.joblib',
+                     'QB_passing_yards_q10.joblib', 'QB_passing_yards_q50.joblib',
+                     'QB_passing_yards_q90.joblib']:
+            shutil.copy2(models_dir / name, self.source / name)
+        
+        self.registry = ModelRegistry(self.tmp / 'registry')
+        self.history = random_player_history(np.random.default_rng(11), 8)
+    
+    def _predict(self, service):
+        return service.predict(
+            position='QB', stat_name='passing_yards', player_history=self.history,
+            current_season=2025, current_week=9, threshold=250.5, bet_type='over'
+        )
+    
+    def test_publish_and_activate(self):
+        """Published versions are listed and CURRENT points at the active one."""
+        self.assertIsNone(self.registry.get_current_version())
+        
+        first = self.registry.publish(self.source, version='v1')
+        second = self.registry.publish(self.source, version='v2', activate=False)
+        
+        self.assertEqual(self.registry.list_versions(), ['v1', 'v2'])
+        self.assertEqual(ModelManifest.load(self.registry.version_dir('v1')).version, 'v1')
+        self.assertEqual(self.registry.get_current_version(), first)
+        self.registry.activate(second)
+        self.assertEqual(self.registry.current_dir(), self.registry.versions_dir / 'v2')
+        
+        with self.assertRaises(ValueError):
+            self.registry.publish(self.source, version='v1')
+        with self.assertRaises(FileNotFoundError):
+            self.registry.activate('v3')
+        self.assertEqual(self.registry.get_current_version(), 'v2')
+    
+    def test_missing_current_version_falls_back_to_bundled_models(self):
+        """A CURRENT naming a pruned version serves the bundled models rather than failing at import."""
+        self.assertEqual(self.registry.active_models(), (None, None))
+        
+        self.registry.publish(self.source, version='v1')
+        self.assertEqual(self.registry.active_models(), (self.registry.versions_dir / 'v1', 'v1'))
+        
+        shutil.rmtree(self.registry.versions_dir / 'v1')
+        with self.assertLogs('ml_service', level='ERROR'):
+            self.assertEqual(self.registry.active_models(), (None, None))
+        
+        # The inference server starts on the bundled models too
+        out = io.StringIO()
+        with override_settings(ML_MODEL_REGISTRY_DIR=str(self.registry.root)), \
+                mock.patch.object(InferenceServer, 'serve') as serve, \
+                self.assertLogs('ml_service', level='ERROR'):
+            call_command('run_inference_server', socket=str(self.tmp / 'inference.sock'), stdout=out)
+        serve.assert_called_once()
+        self.assertIn(f"Serving model version {predictor.model_loader.get_model_version()}", out.getvalue())
+        
+        # Staging directories of in-progress publishes can't be activated
+        (self.registry.versions_dir / '.v2-tmp').mkdir()
+        with self.assertRaises(FileNotFoundError):
+            self.registry.activate('.v2-tmp')
+    
+    def test_hot_reload_swaps_loader(self):
+        """Activating a new version swaps the loader; the old one keeps serving in-flight work."""
+        self.registry.publish(self.source, version='v1')
+        service = PredictionService(
+            models_dir=self.registry.current_dir(), cache_size=0, model_version='v1'
+        )
+        before = self._predict(service)
+        old_loader = service.model_loader
+        
+        self.assertFalse(service.check_registry(self.registry))
+        
+        self.registry.publish(self.source, version='v2')
+        with self.assertLogs('ml_service', level='WARNING'):
+            self.assertTrue(service.check_registry(self.registry))
+        
+        self.assertIsNot(service.model_loader, old_loader)
+        self.assertEqual(service.model_loader.get_model_version(), 'v2')
+        self.assertTrue(service.model_loader.is_ready)
+        self.assertEqual(self._predict(service).predictions, before.predictions)
+        
+        # The previous loader still works for requests that started on it
+        model, _ = old_loader.get_model('QB', 'passing_yards', 'q50')
+        self.assertIsNotNone(model)
+    
+    def test_broken_version_is_not_swapped_in(self):
+        """A version whose models fail validation is rejected and the old models keep serving."""
+        self.registry.publish(self.source, version='v1')
+        service = PredictionService(
+            models_dir=self.registry.current_dir(), cache_size=0, model_version='v1'
+        )
+        
+        broken = self.tmp / 'broken'
+        shutil.copytree(self.source, broken)
+        feature_columns = joblib.load(broken / 'feature_columns.joblib')
+        feature_columns['QB_passing_yards'] = feature_columns['QB_passing_yards'][::-1]
+        joblib.dump(feature_columns, broken / 'feature_columns.joblib')
+        self.registry.publish(broken, version='v2')
+        
+        with self.assertLogs('ml_service', level='ERROR'):
+            self.assertFalse(service.check_registry(self.registry))
+        self.assertEqual(service.model_loader.get_model_version(), 'v1')
+        
+        # Not retried on every poll
+        self.assertFalse(service.check_registry(self.registry))
+    
+    def test_publish_models_command(self):
+        """publish_models publishes, lists and activates versions."""
+        registry_dir = str(self.tmp / 'registry')
+        call_command(
+            'publish_models', registry=registry_dir, source=str(self.source),
+            model_version='v1', stdout=io.StringIO()
+        )
+        call_command(
+            'publish_models', registry=registry_dir, source=str(self.source),
+            model_version='v2', no_activate=True, stdout=io.StringIO()
+        )
+        
+        out = io.StringIO()
+        call_command('publish_models', registry=registry_dir, list=True, stdout=out)
+        self.assertEqual(out.getvalue().split('\n')[:2], ['* v1', '  v2'])
+        
+        call_command('publish_models', registry=registry_dir, activate='v2', stdout=io.StringIO())
+        self.assertEqual(self.registry.get_current_version(), 'v2')
+
+
+class ModelManifestTest(TestCase):
+    """Tests for the model bundle manifest."""
+    
+    BUNDLE_FILES = [
+        'feature_columns.joblib', 'model_metadata.joblib',
+        'QB_passing_yards_q10.joblib', 'QB_passing_yards_q50.joblib', 'QB_passing_yards_q90.joblib',
+    ]
+    
+    def setUp(self):
+        self.bundle = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.bundle, ignore_errors=True)
+        for name in self.BUNDLE_FILES:
+            shutil.copy2(Path(predictor.model_loader.models_dir) / name, self.bundle / name)
+    
+    def test_bundled_manifest_is_up_to_date(self):
+        """The committed manifest matches the model files shipped with the repo (regenerate it when they change)."""
+        call_command('build_model_manifest', check=True, stdout=io.StringIO())
+    
+    def test_check_flags_stale_manifest(self):
+        """build_model_manifest --check names the files that changed since the manifest was written."""
+        with self.assertRaises(CommandError):
+            call_command('build_model_manifest', models_dir=str(self.bundle), check=True, stdout=io.StringIO())
+        
+        call_command('build_model_manifest', models_dir=str(self.bundle), stdout=io.StringIO())
+        call_command('build_model_manifest', models_dir=str(self.bundle), check=True, stdout=io.StringIO())
+        
+        shutil.copy2(
+            Path(predictor.model_loader.models_dir) / 'QB_passing_yards_q90.joblib',
+            self.bundle / 'QB_passing_yards_q50.joblib'
+        )
+        with self.assertRaisesMessage(CommandError, 'QB_passing_yards_q50.joblib'):
+            call_command('build_model_manifest', models_dir=str(self.bundle), check=True, stdout=io.StringIO())
+    
+    def test_validation_does_not_touch_filesystem(self):
+        """With a manifest, model discovery is a dictionary lookup."""
+        loader = ModelLoader()
+        
+        with mock.patch.object(Path, 'exists', side_effect=AssertionError('filesystem probe')):
+            self.assertTrue(loader.model_exists('QB', 'passing_yards'))
+            self.assertFalse(loader.model_exists('QB', 'receptions'))
+            self.assertEqual(len(loader.available_models()), 51)
+            self.assertEqual(
+                predictor.validate_position_stat_combination('WR', 'targets'), (True, None)
+            )
+    
+    def test_corrupted_model_rejected_at_load(self):
+        """A model file that no longer matches its checksum is rejected."""
+        ModelManifest.build(self.bundle).write(self.bundle)
+        with open(self.bundle / 'QB_passing_yards_q50.joblib', 'ab') as f:
+            f.write(b'\x00')
+        loader = ModelLoader(self.bundle)
+        
+        with self.assertLogs('ml_service', level='ERROR'):
+            with self.assertRaises(ValueError):
+                loader.get_model('QB', 'passing_yards', 'q50')
+            
+            info = loader.preload()
+        self.assertEqual(info['state'], 'failed')
+        self.assertIn('QB_passing_yards_q50', info['errors'])
+    
+    def test_mismatched_feature_schema_rejected_at_load(self):
+        """A model trained on a different feature schema is rejected."""
+        shutil.copy2(
+            Path(predictor.model_loader.models_dir) / 'WR_receptions_q50.joblib',
+            self.bundle / 'QB_passing_yards_q50.joblib'
+        )
+        ModelManifest.build(self.bundle).write(self.bundle)
+        loader = ModelLoader(self.bundle)
+        
+        with self.assertLogs('ml_service', level='ERROR'):
+            with self.assertRaises(ValueError):
+                loader.get_model('QB', 'passing_yards', 'q50')
+        
+        model, _ = loader.get_model('QB', 'passing_yards', 'q10')
+        self.assertIsNotNone(model)
+    
+    def test_missing_model_from_manifest(self):
+        """Models not listed in the manifest don't exist, even if a file is present."""
+        ModelManifest.build(self.bundle).write(self.bundle)
+        shutil.copy2(
+            Path(predictor.model_loader.models_dir) / 'QB_passing_tds_q50.joblib',
+            self.bundle / 'QB_passing_tds_q50.joblib'
+        )
+        loader = ModelLoader(self.bundle)
+        
+        self.assertFalse(loader.model_exists('QB', 'passing_tds'))
+        with self.assertRaises(FileNotFoundError):
+            loader.get_model('QB', 'passing_tds', 'q50')
+
+
+class InferenceEngineTest(TestCase):
+    """Array inference must match Booster.predict."""
+    
+    def _raw_boosters(self):
+        models_dir = Path(predictor.model_loader.models_dir)
+        for position, stat_name, quantile in predictor.model_loader.available_models():
+            yield f'{position}_{stat_name}_{quantile}', joblib.load(models_dir / f'{position}_{stat_name}_{quantile}.joblib')
+    
+    def test_single_row_and_batch_match_booster(self):
+        """Fast single-row and batch predictions equal Booster.predict for every model."""
+        rng = np.random.default_rng(5)
+        
+        for model_key, booster in self._raw_boosters():
+            features = rng.random((64, booster.num_feature())) * rng.integers(1, 300, booster.num_feature())
+            expected = booster.predict(features)
+            
+            for fast_single_row in (False, True):
+                wrapped = BoosterPredictor(booster, fast_single_row=fast_single_row)
+                np.testing.assert_array_equal(wrapped.predict(features), expected, err_msg=model_key)
+                for row in range(3):
+                    self.assertEqual(
+                        wrapped.predict(features[row:row + 1])[0], expected[row], msg=model_key
+                    )
+    
+    def test_booster_predict_by_default(self):
+        """Single rows go through the public Booster.predict unless the fast path is opted into."""
+        model, _ = predictor.model_loader.get_model('QB', 'passing_yards', 'q50')
+        self.assertFalse(model.fast_path)
+        
+        row = np.random.default_rng(3).random((1, model.num_feature()))
+        with mock.patch.object(model.booster, 'predict', wraps=model.booster.predict) as booster_predict:
+            model.predict(row)
+        self.assertEqual(booster_predict.call_args.kwargs.get('num_threads'), model.single_row_threads)
+    
+    def test_fast_path_falls_back_to_booster_predict(self):
+        """An untested LightGBM version or a failing fast path falls back to Booster.predict."""
+        from ml_service import inference_engine
+        
+        booster = joblib.load(Path(predictor.model_loader.models_dir) / 'WR_receptions_q50.joblib')
+        row = np.random.default_rng(2).random((1, booster.num_feature())) * 50
+        expected = booster.predict(row)
+        
+        with mock.patch.object(inference_engine, 'FAST_SINGLE_ROW_AVAILABLE', False):
+            with self.assertLogs('ml_service', level='WARNING'):
+                wrapped = BoosterPredictor(booster, fast_single_row=True)
+        self.assertFalse(wrapped.fast_path)
+        np.testing.assert_array_equal(wrapped.predict(row), expected)
+        
+        if not inference_engine.FAST_SINGLE_ROW_AVAILABLE:
+            return
+        wrapped = BoosterPredictor(booster, fast_single_row=True)
+        with mock.patch.object(inference_engine, '_FastConfig', side_effect=RuntimeError('ABI changed')):
+            with self.assertLogs('ml_service', level='ERROR'):
+                np.testing.assert_array_equal(wrapped.predict(row), expected)
+        self.assertFalse(wrapped.fast_path)
+    
+    def test_float32_inputs(self):
+        """float32 feature arrays are used as-is and match float64 predictions."""
+        booster = joblib.load(Path(predictor.model_loader.models_dir) / 'WR_receptions_q50.joblib')
+        wrapped = BoosterPredictor(booster)
+        features = np.random.default_rng(6).integers(0, 120, (16, booster.num_feature())).astype(np.float64)
+        
+        expected = booster.predict(features)
+        np.testing.assert_allclose(wrapped.predict(features.astype(np.float32)), expected, rtol=1e-6)
+        np.testing.assert_allclose(
+            InferenceEngine().predict_quantiles({'q50': (wrapped, None)}, features[0].astype(np.float32))['q50'],
+            expected[:1], rtol=1e-6
+        )
+    
+    def test_sklearn_wrapper_is_unwrapped(self):
+        """sklearn-wrapped models are reduced to their Booster at load time."""
+        import lightgbm as lgb
+        
+        rng = np.random.default_rng(8)
+        X, y = rng.random((200, 4)), rng.random(200)
+        regressor = lgb.LGBMRegressor(n_estimators=5, verbose=-1).fit(X, y)
+        wrapped = BoosterPredictor(regressor)
+        
+        self.assertIs(wrapped.booster, regressor.booster_)
+        np.testing.assert_allclose(wrapped.predict(X[:1]), regressor.predict(X[:1]))
+        np.testing.assert_allclose(wrapped.predict(X), regressor.predict(X))
+    
+    def test_fast_path_is_thread_safe(self):
+        """Concurrent single-row predictions on one model give the right answers."""
+        loaded, _ = predictor.model_loader.get_model('QB', 'passing_yards', 'q50')
+        model = BoosterPredictor(loaded.booster, fast_single_row=True)
+        rows = np.random.default_rng(9).random((200, model.num_feature())) * 100
+        expected = model.booster.predict(rows)
+        mismatches = []
+        
+        def worker(offset):
+            for i in range(offset, len(rows), 8):
+                if model.predict(rows[i:i + 1])[0] != expected[i]:
+                    mismatches.append(i)
+        
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(mismatches, [])
+
+
+class ThreadingPolicyTest(TestCase):
+    """Tests for the LightGBM threading policy."""
+    
+    def test_threads_for_batch_size(self):
+        """Small requests run single-threaded; large batches use batch threads."""
+        policy = ThreadingPolicy(single_row_threads=1, batch_threads=6, batch_min_rows=128)
+        
+        self.assertEqual(policy.threads_for(1), 1)
+        self.assertEqual(policy.threads_for(127), 1)
+        self.assertEqual(policy.threads_for(128), 6)
+    
+    def test_engine_passes_threads_to_lightgbm(self):
+        """The engine asks LightGBM for the policy's thread count."""
+        model, _ = predictor.model_loader.get_model('QB', 'passing_yards', 'q50')
+        engine = InferenceEngine(ThreadingPolicy(single_row_threads=1, batch_threads=3, batch_min_rows=10))
+        features = np.random.default_rng(4).random((10, model.num_feature()))
+        
+        with mock.patch.object(model.booster, 'predict', wraps=model.booster.predict) as booster_predict:
+            engine.predict_quantiles({'q50': (model, None)}, features[:5])
+            engine.predict_quantiles({'q50': (model, None)}, features)
+        
+        self.assertEqual(
+            [call.kwargs.get('num_threads') for call in booster_predict.call_args_list], [1, 3]
+        )
+    
+    def test_service_uses_policy(self):
+        """PredictionService hands its policy to the loader and the engine."""
+        policy = ThreadingPolicy(single_row_threads=1, batch_threads=2, batch_min_rows=64)
+        service = PredictionService(cache_size=0, threading_policy=policy)
+        
+        self.assertIs(service.model_loader.threading_policy, policy)
+        self.assertIs(service.inference_engine.threading_policy, policy)
+        model, _ = service.model_loader.get_model('WR', 'receptions', 'q50')
+        self.assertEqual(model.single_row_threads, 1)
+        self.assertFalse(model.fast_path)
+        
+        service = PredictionService(cache_size=0, threading_policy=ThreadingPolicy(fast_single_row=True))
+        model, _ = service.model_loader.get_model('WR', 'receptions', 'q50')
+        self.assertEqual(model.fast_path, FAST_SINGLE_ROW_AVAILABLE)
+    
+    def test_benchmark_command(self):
+        """benchmark_inference prints a row per batch size."""
+        out = io.StringIO()
+        call_command('benchmark_inference', rows=[1, 8], threads=[1, 2], seconds=0.001, stdout=out)
+        
+        lines = out.getvalue().splitlines()
+        self.assertTrue(any(line.strip().startswith('1 |') for line in lines))
+        self.assertTrue(any(line.strip().startswith('8 |') for line in lines))
+
+
+
+class TreeEvaluatorTest(TestCase):
+    """The NumPy tree evaluator must match Booster.predict exactly."""
+    
+    SAVED_MODELS_DIR = Path(settings.BASE_DIR).parent / 'machine_learning' / 'saved_models'
+    
+    def _features(self, rng, booster, rows):
+        """Random features spanning each model's split thresholds, with integer and NaN values mixed in."""
+        features = rng.random((rows, booster.num_feature())) * rng.integers(1, 400, booster.num_feature())
+        features[::3] = np.round(features[::3])
+        features[1, ::4] = np.nan
+        return features
+    
+    def test_parity_with_saved_models(self):
+        """Every model in machine_learning/saved_models predicts identically once flattened."""
+        model_files = sorted(self.SAVED_MODELS_DIR.glob('*_q[0-9][0-9].joblib'))
+        self.assertGreater(len(model_files), 0)
+        rng = np.random.default_rng(13)
+        
+        for model_file in model_files:
+            booster = joblib.load(model_file)
+            features = self._features(rng, booster, 200)
+            ensemble = TreeEnsemble.from_booster(booster)
+            
+            np.testing.assert_array_equal(
+                ensemble.predict(features)[0], booster.predict(features), err_msg=model_file.name
+            )
+            self.assertEqual(ensemble.predict(features[:1])[0, 0], booster.predict(features[:1])[0])
+    
+    def test_combined_quantiles_match_separate(self):
+        """Walking q10/q50/q90 together gives each model's own predictions."""
+        models_dir = Path(predictor.model_loader.models_dir)
+        boosters = [joblib.load(models_dir / f'RB_rushing_yards_{q}.joblib') for q in ('q10', 'q50', 'q90')]
+        features = self._features(np.random.default_rng(14), boosters[0], 100)
+        
+        combined = TreeEnsemble.combine([TreeEnsemble.from_booster(booster) for booster in boosters])
+        predictions = combined.predict(features)
+        
+        self.assertEqual(predictions.shape, (3, 100))
+        for booster, prediction in zip(boosters, predictions):
+            np.testing.assert_array_equal(prediction, booster.predict(features))
+    
+    def test_missing_value_handling(self):
+        """Zero and NaN missing types route missing values like LightGBM."""
+        import lightgbm as lgb
+        
+        rng = np.random.default_rng(15)
+        X = rng.random((500, 3))
+        X[rng.random(500) < 0.2, 0] = np.nan
+        X[rng.random(500) < 0.2, 1] = 0.0
+        y = np.nan_to_num(X[:, 0], nan=2.0) + X[:, 1] * 3 + rng.random(500)
+        
+        for zero_as_missing in (False, True):
+            booster = lgb.train(
+                {'objective': 'regression', 'verbose': -1, 'zero_as_missing': zero_as_missing},
+                lgb.Dataset(X, y), num_boost_round=20
+            )
+            ensemble = TreeEnsemble.from_booster(booster)
+            
+            self.assertTrue(set(ensemble.missing_type) - {0})
+            np.testing.assert_array_equal(ensemble.predict(X)[0], booster.predict(X))
+    
+    def test_unsupported_models_are_rejected(self):
+        """Models that can't be flattened raise ValueError, which both export commands report cleanly."""
+        import lightgbm as lgb
+        
+        rng = np.random.default_rng(17)
+        X = rng.random((300, 3))
+        multiclass = lgb.train(
+            {'objective': 'multiclass', 'num_class': 3, 'verbose': -1},
+            lgb.Dataset(X, rng.integers(0, 3, 300)), num_boost_round=3
+        )
+        with self.assertRaises(ValueError):
+            TreeEnsemble.from_booster(multiclass)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            shutil.copy2(Path(predictor.model_loader.models_dir) / 'feature_columns.joblib', tmp)
+            joblib.dump(multiclass, Path(tmp) / 'QB_passing_yards_q50.joblib')
+            
+            for command in ('build_model_bundle', 'export_tree_arrays'):
+                with self.assertRaisesMessage(CommandError, 'QB_passing_yards_q50.joblib'):
+                    call_command(command, models_dir=tmp, stdout=io.StringIO())
+    
+    def test_save_and_load(self):
+        """Arrays round-trip through .npz, including feature names and source checksum."""
+        booster = joblib.load(Path(predictor.model_loader.models_dir) / 'WR_receptions_q90.joblib')
+        ensemble = TreeEnsemble.from_booster(booster, source_sha256='abc123')
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'WR_receptions_q90.npz'
+            ensemble.save(path)
+            loaded = TreeEnsemble.load(path)
+        
+        features = self._features(np.random.default_rng(16), booster, 50)
+        self.assertEqual(loaded.feature_names, booster.feature_name())
+        self.assertEqual(loaded.source_sha256, 'abc123')
+        np.testing.assert_array_equal(loaded.predict(features), ensemble.predict(features))
+    
+    def test_numpy_backend_service(self):
+        """The numpy backend serves exported arrays and matches the LightGBM backend."""
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp)
+        source = Path(predictor.model_loader.models_dir)
+        for path in source.glob('*.joblib'):
+            shutil.copy2(path, tmp / path.name)
+        shutil.copy2(source / 'manifest.json', tmp / 'manifest.json')
+        call_command('export_tree_arrays', models_dir=str(tmp), stdout=io.StringIO())
+        self.assertTrue((tmp / TREE_ARRAYS_DIR / 'QB_passing_yards_q50.npz').exists())
+        
+        service = PredictionService(models_dir=str(tmp), cache_size=0, inference_backend='numpy')
+        model, _ = service.model_loader.get_model('QB', 'passing_yards', 'q50')
+        self.assertIsInstance(model, NumpyTreeModel)
+        
+        features = self._features(np.random.default_rng(17), model, 300)
+        expected = predictor._predict_quantiles('QB', 'passing_yards', features)
+        actual = service._predict_quantiles('QB', 'passing_yards', features)
+        for quantile in expected:
+            np.testing.assert_array_equal(actual[quantile], expected[quantile])
+        
+        # Arrays exported from a different model file are rebuilt from the joblib
+        stale = TreeEnsemble.from_booster(joblib.load(tmp / 'QB_passing_yards_q10.joblib'), source_sha256='0' * 64)
+        stale.save(tmp / TREE_ARRAYS_DIR / 'QB_passing_yards_q90.npz')
+        service.model_loader.clear_cache()
+        model, _ = service.model_loader.get_model('QB', 'passing_yards', 'q90')
+        np.testing.assert_array_equal(model.predict(features), expected['q90'])
+    
+    def test_invalid_backend(self):
+        """Unknown inference backends are rejected."""
+        with self.assertRaises(ValueError):
+            ModelLoader(inference_backend='onnx')
+
+
+class ModelBundleTest(TestCase):
+    """Tests for the memory-mapped models.bundle."""
+    
+    def setUp(self):
+        self.models_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.models_dir)
+        source = Path(predictor.model_loader.models_dir)
+        for path in source.glob('*.joblib'):
+            shutil.copy2(path, self.models_dir / path.name)
+        shutil.copy2(source / 'manifest.json', self.models_dir / 'manifest.json')
+        call_command('build_model_bundle', models_dir=str(self.models_dir), stdout=io.StringIO())
+    
+    def test_bundle_contents(self):
+        """The bundle holds every model and the feature schemas, with arrays mapped in place."""
+        bundle = ModelBundle(self.models_dir / BUNDLE_FILENAME)
+        
+        self.assertEqual(
+            sorted(bundle.model_keys()),
+            sorted('_'.join(combo) for combo in predictor.model_loader.available_models())
+        )
+        self.assertEqual(
+            bundle.feature_columns['WR_receptions'], predictor.model_loader.get_feature_columns('WR', 'receptions')
+        )
+        
+        ensemble, quantiles = bundle.get_ensemble('WR', 'receptions')
+        self.assertEqual(quantiles, ['q10', 'q50', 'q90'])
+        self.assertFalse(ensemble.threshold.flags.writeable)
+        self.assertFalse(ensemble.threshold.flags.owndata)
+        self.assertIs(bundle.get_ensemble('WR', 'receptions')[0], ensemble)
+        self.assertIsNone(bundle.get_model('WR', 'passing_yards', 'q50'))
+    
+    def test_bundle_predictions_match_lightgbm(self):
+        """Bundle-served predictions equal the LightGBM backend for every position-stat."""
+        service = PredictionService(models_dir=str(self.models_dir), cache_size=0, inference_backend='numpy')
+        rng = np.random.default_rng(21)
+        
+        for position, stat in sorted({(p, s) for p, s, _ in service.model_loader.available_models()}):
+            columns = service.model_loader.get_feature_columns(position, stat)
+            features = rng.random((40, len(columns))) * rng.integers(1, 300, len(columns))
+            expected = predictor._predict_quantiles(position, stat, features)
+            actual = service._predict_quantiles(position, stat, features)
+            for quantile in expected:
+                np.testing.assert_array_equal(actual[quantile], expected[quantile], err_msg=f'{position}_{stat}')
+        
+        model, _ = service.model_loader.get_model('QB', 'passing_yards', 'q10')
+        self.assertIsInstance(model, NumpyTreeModel)
+        self.assertEqual(service.model_loader.get_cache_info()['bundle'], str(self.models_dir / BUNDLE_FILENAME))
+    
+    def test_loader_skips_joblib_files(self):
+        """With a bundle, models and feature columns are served without unpickling."""
+        loader = ModelLoader(self.models_dir, inference_backend='numpy')
+        
+        with mock.patch('ml_service.model_loader.joblib.load', side_effect=AssertionError('unpickled')):
+            models = loader.get_all_quantile_models('TE', 'receptions')
+        
+        ensembles = {id(model.ensemble) for model, _ in models.values()}
+        self.assertEqual(len(ensembles), 1)
+        self.assertEqual([model.model_index for model, _ in models.values()], [0, 1, 2])
+    
+    def test_stale_bundle_falls_back(self):
+        """Models whose joblib changed after the bundle was built are loaded from the joblib."""
+        shutil.copy2(self.models_dir / 'TE_receptions_q10.joblib', self.models_dir / 'TE_receptions_q90.joblib')
+        ModelManifest.build(self.models_dir).write(self.models_dir)
+        loader = ModelLoader(self.models_dir, inference_backend='numpy')
+        
+        q10, _ = loader.get_model('TE', 'receptions', 'q10')
+        q90, _ = loader.get_model('TE', 'receptions', 'q90')
+        features = np.random.default_rng(22).random((10, q10.num_feature())) * 50
+        
+        self.assertIsNot(q90.ensemble, q10.ensemble)
+        np.testing.assert_array_equal(q90.predict(features), q10.predict(features))
+    
+    def test_lightgbm_backend_ignores_bundle(self):
+        """The default backend keeps loading Boosters."""
+        loader = ModelLoader(self.models_dir)
+        model, _ = loader.get_model('QB', 'passing_yards', 'q50')
+        
+        self.assertIsInstance(model, BoosterPredictor)
+        self.assertIsNone(loader.get_cache_info()['bundle'])
+    
+    def test_invalid_bundle_is_ignored(self):
+        """A corrupt bundle is logged and skipped."""
+        (self.models_dir / BUNDLE_FILENAME).write_bytes(b'not a bundle at all')
+        loader = ModelLoader(self.models_dir, inference_backend='numpy')
+        
+        model, _ = loader.get_model('QB', 'passing_yards', 'q50')
+        self.assertIsInstance(model, NumpyTreeModel)
+        self.assertIsNone(loader.get_cache_info()['bundle'])
+
+
+class ForkPreloadTest(TestCase):
+    """Tests for preloading in a WSGI master before workers fork."""
+    
+    # Forks in a fresh interpreter: this test process may already have started
+    # LightGBM's OpenMP threads, after which a forked child can't use them
+    FORK_SCRIPT = """
+import os, sys
+import numpy as np
+from ml_service import PredictionService
+
+service = PredictionService(cache_size=0)
+info = service.prepare_for_fork(max_workers=2)
+assert info['state'] == 'ready', info
+features = np.random.default_rng(0).random((300, len(service.model_loader.get_feature_columns('WR', 'receptions'))))
+
+pid = os.fork()
+if pid == 0:
+    models = service.model_loader.get_all_quantile_models('WR', 'receptions')
+    for model, _ in models.values():
+        model.predict(features, num_threads=2)
+        model.predict(features[:1])
+    os._exit(0)
+
+_, status = os.waitpid(pid, 0)
+sys.exit(os.waitstatus_to_exitcode(status))
+"""
+
+    def test_prepare_for_fork_freezes_loaded_models(self):
+        """Everything is loaded and moved out of reach of the cyclic GC."""
+        service = PredictionService(cache_size=0)
+        self.addCleanup(gc.unfreeze)
+        
+        info = service.prepare_for_fork(max_workers=2)
+        
+        self.assertEqual(info['state'], 'ready')
+        self.assertEqual(info['models_loaded'], len(service.model_loader.available_models()))
+        self.assertGreater(gc.get_freeze_count(), 0)
+    
+    def test_prepare_for_fork_builds_stacked_ensembles(self):
+        """With per-model tree arrays, the stacked q10/q50/q90 ensembles are built before fork."""
+        service = PredictionService(cache_size=0, inference_backend='numpy')
+        self.addCleanup(gc.unfreeze)
+        
+        service.prepare_for_fork(max_workers=2)
+        
+        self.assertEqual(len(service.inference_engine._combined), len({
+            (position, stat) for position, stat, _ in service.model_loader.available_models()
+        }))
+    
+    def test_forked_worker_predicts(self):
+        """A worker forked after preloading serves single-row and multi-threaded batch predictions."""
+        if not hasattr(os, 'fork'):
+            self.skipTest('os.fork is not available')
+        
+        result = subprocess.run(
+            [sys.executable, '-c', self.FORK_SCRIPT],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=120
+        )
+        
+        self.assertEqual(result.returncode, 0, result.stderr)
+    
+    @override_settings(ML_PREFORK_PRELOAD=True, ML_PRELOAD_MODELS=False)
+    def test_health_counts_prefork_preload(self):
+        """Health reports preload state when models are preloaded before fork."""
+        with mock.patch.object(predictor.model_loader, '_preload_state', 'failed'):
+            response = Client().get(reverse('health'))
+        
+        self.assertEqual(response.status_code, 503)
+        self.assertTrue(response.json()['preload']['enabled'])
+
+
+class InferenceServerTest(TestCase):
+    """Tests for the out-of-process inference server and its client."""
+    
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tmpdir = tempfile.mkdtemp()
+        cls.service = PredictionService(cache_size=0)
+        cls.server = InferenceServer(cls.service, Path(cls.tmpdir) / 'inference.sock', window_ms=50)
+        cls.server.bind()
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.thread.join(timeout=10)
+        shutil.rmtree(cls.tmpdir, ignore_errors=True)
+        super().tearDownClass()
+    
+    def setUp(self):
+        self.client = InferenceClient(self.server.socket_path, timeout=10)
+        self.addCleanup(self.client.close)
+        num_features = len(self.service.model_loader.get_feature_columns('WR', 'receptions'))
+        self.features = np.random.default_rng(0).random((20, num_features)) * 50
+    
+    def test_matches_local_predictions(self):
+        """The server returns the same quantiles as predicting in-process."""
+        remote = self.client.predict_quantiles('WR', 'receptions', self.features)
+        local = self.service.predict_quantiles('WR', 'receptions', self.features)
+        
+        self.assertEqual(set(remote), set(local))
+        for quantile in local:
+            np.testing.assert_allclose(remote[quantile], local[quantile])
+    
+    def test_concurrent_requests_are_batched(self):
+        """Requests from several connections arriving together share model calls."""
+        before = self.server.batcher.get_stats()
+        connected = self.server.batcher.connections + 8
+        go = threading.Event()
+        results, errors = {}, []
+        
+        def request(i):
+            client = InferenceClient(self.server.socket_path)
+            try:
+                # Connect first, so the batch doesn't close before the others arrive
+                client._connection()
+                go.wait(timeout=10)
+                results[i] = client.predict_quantiles('WR', 'receptions', self.features[i:i + 1])
+            except Exception as e:
+                errors.append(e)
+            finally:
+                client.close()
+        
+        threads = [threading.Thread(target=request, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 10
+        while self.server.batcher.connections < connected and time.monotonic() < deadline:
+            time.sleep(0.01)
+        go.set()
+        for thread in threads:
+            thread.join()
+        
+        after = self.server.batcher.get_stats()
+        self.assertEqual(errors, [])
+        self.assertEqual(after['requests'] - before['requests'], 8)
+        self.assertLess(after['model_calls'] - before['model_calls'], 8)
+        local = self.service.predict_quantiles('WR', 'receptions', self.features[:8])
+        for i in range(8):
+            np.testing.assert_allclose(results[i]['q50'], local['q50'][i:i + 1])
+    
+    def test_invalid_requests_raise_value_error(self):
+        """Unknown models and wrongly shaped features are rejected; the connection keeps working."""
+        with self.assertRaises(ValueError):
+            self.client.predict_quantiles('WR', 'passing_yards', self.features)
+        with self.assertRaises(ValueError):
+            self.client.predict_quantiles('WR', 'receptions', self.features[:, :-1])
+        
+        result = self.client.predict_quantiles('WR', 'receptions', self.features[:1])
+        self.assertEqual(len(result['q50']), 1)
+    
+    def test_service_with_client_does_not_load_models(self):
+        """A PredictionService using the server prepares features only."""
+        remote_service = PredictionService(cache_size=0, inference_client=self.client)
+        
+        info = remote_service.model_loader.preload()
+        remote = remote_service.predict_quantiles('WR', 'receptions', self.features)
+        local = self.service.predict_quantiles('WR', 'receptions', self.features)
+        
+        self.assertEqual(info['models_loaded'], 0)
+        self.assertEqual(remote_service.model_loader.get_cache_info()['cached_models'], [])
+        self.assertIsNotNone(remote_service.model_loader.get_feature_plan('WR', 'receptions'))
+        np.testing.assert_allclose(remote['q90'], local['q90'])
+        with self.assertRaises(RuntimeError):
+            remote_service.model_loader.get_model('WR', 'receptions', 'q50')
+    
+    def test_server_follows_registry(self):
+        """A version activated while the server runs is picked up, and Django only caches matching versions."""
+        tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        source = tmp / 'bundle'
+        source.mkdir()
+        models_dir = Path(self.service.model_loader.models_dir)
+        for name in ['feature_columns.joblib', 'model_metadata.joblib',
+                     'WR_receptions_q10.joblib', 'WR_receptions_q50.joblib', 'WR_receptions_q90.joblib']:
+            shutil.copy2(models_dir / name, source / name)
+        registry = ModelRegistry(tmp / 'registry')
+        registry.publish(source, version='v1')
+        
+        server = InferenceServer(
+            PredictionService(models_dir=registry.current_dir(), cache_size=0, model_version='v1'),
+            tmp / 'inference.sock', window_ms=0, registry=registry, registry_poll_seconds=0.05
+        )
+        server.bind()
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 10)
+        self.addCleanup(server.shutdown)
+        
+        client = InferenceClient(server.socket_path, timeout=10)
+        self.addCleanup(client.close)
+        remote_service = PredictionService(
+            models_dir=registry.current_dir(), model_version='v1', inference_client=client
+        )
+        history = random_player_history(np.random.default_rng(5), 8)
+        
+        def predict():
+            return remote_service.predict(
+                position='WR', stat_name='receptions', player_history=history, current_season=2025,
+                current_week=9, threshold=4.5, bet_type='over', player_id='registry-wr'
+            )
+        
+        self.assertEqual(client.predict_quantiles_with_version('WR', 'receptions', self.features)[1], 'v1')
+        
+        # Django picks up the new version before the server does: nothing is cached
+        registry.publish(source, version='v2', activate=False)
+        remote_service.reload_models(registry.version_dir('v2'), version='v2')
+        predict()
+        self.assertEqual(len(remote_service.quantile_cache), 0)
+        
+        deadline = time.monotonic() + 10
+        registry.activate('v2')
+        while server.service.model_loader.get_model_version() != 'v2' and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(client.predict_quantiles_with_version('WR', 'receptions', self.features)[1], 'v2')
+        predict()
+        self.assertEqual(len(remote_service.quantile_cache), 1)
+
+    def test_unavailable_server_raises_connection_error(self):
+        """A client pointed at a missing socket raises ConnectionError."""
+        client = InferenceClient(Path(self.tmpdir) / 'missing.sock')
+        
+        with self.assertRaises(ConnectionError):
+            client.predict_quantiles('WR', 'receptions', self.features)
+
+
+class ProjectionTest(TestCase):
+    """Tests for precomputed weekly projections."""
+    
+    def setUp(self):
+        """Set up a QB and a WR with four games; the upcoming week is 5."""
+        predictor.clear_prediction_cache()
+        
+        self.qb = create_player_with_games('proj-qb-001', 'Projection QB', 'QB', [250, 310, 275, 290])
+        self.wr = create_player_with_games('proj-wr-001', 'Projection WR', 'WR', [60, 85, 40, 95])
+    
+    def _precompute(self):
+        call_command('precompute_projections', workers=1, stdout=io.StringIO())
+    
+    def _predict_bet(self):
+        return Client().post(
+            reverse('predict_bet'),
+            data=json.dumps({
+                'player': 'Projection QB', 'action': 'Passing Yards', 'bet_type': 'over',
+                'action_amount': 275.5, 'bet_amount': 10
+            }),
+            content_type='application/json'
+        )
+    
+    def test_precompute_stores_every_stat(self):
+        """Every stat of every active player is stored, matching an on-demand prediction."""
+        self._precompute()
+        self._precompute()  # Rerunning replaces the week's projections
+        
+        self.assertEqual(PlayerProjection.objects.count(), len(POSITION_STATS['QB']) + len(POSITION_STATS['WR']))
+        projection = PlayerProjection.objects.get(player=self.qb, stat='passing_yards')
+        self.assertEqual((projection.season, projection.week, projection.games_analyzed), (2025, 5, 4))
+        self.assertEqual(projection.model_version, predictor.model_loader.get_model_version())
+        
+        from .data_access import get_player_recent_games
+        expected = predictor.predict(
+            position='QB', stat_name='passing_yards',
+            player_history=get_player_recent_games(self.qb, num_games=8),
+            current_season=2025, current_week=5, threshold=275.5, bet_type='over',
+            team_stats=get_team_context('KC', 2025, 5)
+        )
+        self.assertAlmostEqual(projection.q50, expected.predictions['q50'], places=6)
+    
+    def test_precompute_with_missing_current_version(self):
+        """A CURRENT naming a missing version projects with the bundled models, as Django serves."""
+        registry_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, registry_dir, ignore_errors=True)
+        (registry_dir / 'CURRENT').write_text('pruned\n')
+        
+        with override_settings(ML_MODEL_REGISTRY_DIR=str(registry_dir)), \
+                self.assertLogs('ml_service', level='ERROR'):
+            self._precompute()
+        
+        self.assertEqual(
+            set(PlayerProjection.objects.values_list('model_version', flat=True)),
+            {predictor.model_loader.get_model_version()}
+        )
+    
+    def test_predict_bet_serves_projection(self):
+        """predict_bet only runs the threshold analysis when a projection exists."""
+        self._precompute()
+        projection = PlayerProjection.objects.get(player=self.qb, stat='passing_yards')
+        
+        with mock.patch.object(predictor, 'predict_from_betting_scenario') as predict:
+            response = self._predict_bet()
+            predict.assert_not_called()
+        
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertTrue(data['details']['precomputed'])
+        self.assertEqual(data['details']['games_analyzed'], 4)
+        self.assertEqual(data['prediction']['q50'], projection.q50)
+    
+    def test_projection_from_other_model_version_is_ignored(self):
+        """Projections made by other models fall back to predicting on demand."""
+        self._precompute()
+        PlayerProjection.objects.update(model_version='old-version')
+        
+        response = self._predict_bet()
+        
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(response.json()['details']['precomputed'])
+    
+    def test_changed_game_invalidates_projections(self):
+        """A stat correction after precomputing drops the player's and teammates' projections."""
+        rb = Player.objects.create(
+            player_id='proj-rb-001',
+            display_name='Projection RB',
+            position='RB',
+            current_team='BUF'
+        )
+        PlayerGameStats.objects.create(
+            player=rb, season=2025, week=4, season_type='REG',
+            team='BUF', opponent_team='MIA', rushing_yards=80, carries=15
+        )
+        self._precompute()
+        
+        game = PlayerGameStats.objects.get(player=self.qb, season=2025, week=4)
+        game.passing_yards = 350
+        game.save()
+        
+        self.assertFalse(PlayerProjection.objects.filter(player__current_team='KC').exists())
+        self.assertEqual(PlayerProjection.objects.filter(player=rb).count(), len(POSITION_STATS['RB']))
+        
+        response = self._predict_bet()
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(response.json()['details']['precomputed'])
+    
+    def test_projections_endpoint(self):
+        """The leaderboard lists a stat's projections, highest median first."""
+        self._precompute()
+        
+        response = Client().get(reverse('projections'), {'stat': 'receiving_yards', 'position': 'WR'})
+        
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data['season'], data['week']), (2025, 5))
+        self.assertEqual([p['player'] for p in data['projections']], ['Projection WR'])
+        self.assertEqual(Client().get(reverse('projections')).status_code, 400)
+
+
+class FeatureStoreTest(TestCase):
+    """Tests for the incrementally maintained rolling-feature store."""
+    
+    def setUp(self):
+        """Set up a WR with ten games, saved out of order, with one game corrected."""
+        predictor.clear_prediction_cache()
+        
+        self.wr = Player.objects.create(
+            player_id='store-wr-001',
+            display_name='Store WR',
+            position='WR',
+            current_team='KC'
+        )
+        for season, week in [(2025, 3), (2024, 17), (2025, 1), (2024, 18), (2025, 2),
+                             (2025, 6), (2025, 4), (2025, 5), (2024, 16), (2025, 7)]:
+            self._save_game(season, week, receiving_yards=season - 2000 + week * 7, receptions=week % 5)
+        self._save_game(2025, 4, receiving_yards=131, receptions=9)
+    
+    def _save_game(self, season, week, **stats):
+        PlayerGameStats.objects.update_or_create(
+            player=self.wr, season=season, week=week, season_type='REG',
+            defaults={'team': 'KC', 'opponent_team': 'DEN', 'targets': 8, **stats}
+        )
+    
+    def assert_store_matches_history(self):
+        """Stored features give the same model inputs as the player's fetched history."""
+        from .data_access import get_player_recent_games
+        from .feature_store import get_rolling_features
+        
+        history = get_player_recent_games(self.wr, num_games=8)
+        stored = get_rolling_features(self.wr)
+        self.assertEqual(len(stored), len(history))
+        
+        engineer = FeatureEngineer()
+        for stat in POSITION_STATS['WR']:
+            plan = predictor.model_loader.get_feature_plan('WR', stat)
+            np.testing.assert_array_equal(
+                engineer.fill_features(plan, stored, 2025, 8),
+                engineer.fill_features(plan, history, 2025, 8)
+            )
+        
+        columns = list(plan.feature_columns)
+        pd.testing.assert_frame_equal(
+            engineer.align_features(engineer.prepare_inference_features(
+                stored, 'WR', POSITION_STATS['WR'], 2025, 8
+            ), columns).reset_index(drop=True),
+            engineer.align_features(engineer.prepare_inference_features(
+                history, 'WR', POSITION_STATS['WR'], 2025, 8
+            ), columns).reset_index(drop=True),
+            check_dtype=False
+        )
+    
+    def test_store_matches_history(self):
+        """Out-of-order saves and corrections leave the store identical to a recompute."""
+        row = PlayerFeatures.objects.get(player=self.wr)
+        
+        self.assertEqual(row.games, 8)
+        self.assertEqual(row.recent_games[0][:2], [2024, 18])
+        self.assertEqual(row.recent_games[-1][:2], [2025, 7])
+        self.assert_store_matches_history()
+    
+    def test_new_game_updates_without_refetching(self):
+        """A new game is folded into the running window without reading the player's games."""
+        with mock.patch('api.feature_store.rebuild_player_features') as rebuild:
+            self._save_game(2025, 8, receiving_yards=77, receptions=6)
+            self._save_game(2023, 10, receiving_yards=40, receptions=3)  # too old to matter
+            rebuild.assert_not_called()
+        
+        self.assertEqual(PlayerFeatures.objects.get(player=self.wr).recent_games[-1][:2], [2025, 8])
+        self.assert_store_matches_history()
+    
+    def test_deleting_a_window_game_refetches(self):
+        """Deleting a game in the window brings the next older game back in."""
+        with self.captureOnCommitCallbacks(execute=True):
+            PlayerGameStats.objects.get(player=self.wr, season=2025, week=7).delete()
+        
+        self.assertEqual(PlayerFeatures.objects.get(player=self.wr).recent_games[0][:2], [2024, 17])
+        self.assert_store_matches_history()
+    
+    def test_rebuild_command(self):
+        """build_player_features recreates rows removed behind the signals' back."""
+        PlayerFeatures.objects.all().delete()
+        
+        call_command('build_player_features', stdout=io.StringIO())
+        
+        self.assertTrue(PlayerFeatures.objects.filter(player=self.wr).exists())
+        self.assert_store_matches_history()
+    
+    def test_predict_bet_reads_store(self):
+        """predict_bet uses the stored features instead of fetching recent games."""
+        payload = json.dumps({
+            'player': 'Store WR', 'action': 'Receiving Yards', 'bet_type': 'over',
+            'action_amount': 40.5, 'bet_amount': 10
+        })
+        
+        with mock.patch('api.feature_store.get_player_recent_games') as fetch:
+            response = Client().post(reverse('predict_bet'), data=payload, content_type='application/json')
+            fetch.assert_not_called()
+        
+        with override_settings(ML_USE_FEATURE_STORE=False):
+            predictor.clear_prediction_cache()
+            expected = Client().post(reverse('predict_bet'), data=payload, content_type='application/json')
+        
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['prediction'], expected.json()['prediction'])
+        self.assertEqual(response.json()['details']['games_analyzed'], 8)
+
+
+class HistoryQueryTest(TestCase):
+    """Tests for the columnar history queries in data_access."""
+    
+    def setUp(self):
+        """Set up a QB with six games across two seasons, one with missing stats."""
+        self.qb = Player.objects.create(
+            player_id='history-qb-001',
+            display_name='History QB',
+            position='QB',
+            current_team='BUF'
+        )
+        for season, week in [(2024, 17), (2024, 18), (2025, 1), (2025, 2), (2025, 3)]:
+            PlayerGameStats.objects.create(
+                player=self.qb, season=season, week=week, season_type='REG',
+                team='BUF', opponent_team='MIA',
+                completions=20 + week, attempts=30 + week, passing_yards=200 + week * 10,
+                passing_tds=week % 3, carries=week, rushing_yards=week * 4
+            )
+        PlayerGameStats.objects.create(
+            player=self.qb, season=2025, week=4, season_type='REG',
+            team='BUF', opponent_team='NYJ', passing_yards=None, rushing_yards=None
+        )
+    
+    def test_recent_games_single_query(self):
+        """Recent games take one query however many games are fetched."""
+        from .data_access import get_player_recent_games
+        
+        with self.assertNumQueries(1):
+            history = get_player_recent_games(self.qb, num_games=8)
+        
+        self.assertEqual(len(history), 6)
+        self.assertEqual(list(zip(history['season'], history['week'])),
+                         [(2024, 17), (2024, 18), (2025, 1), (2025, 2), (2025, 3), (2025, 4)])
+        self.assertEqual(history['player_id'].unique().tolist(), ['history-qb-001'])
+        self.assertEqual(history['passing_yards'].tolist(), [370, 380, 210, 220, 230, 0])
+        self.assertEqual(history['passing_yards'].dtype, np.int64)
+        self.assertEqual(history.iloc[-1]['opponent_team'], 'NYJ')
+        
+        with self.assertNumQueries(1):
+            self.assertEqual(len(get_player_recent_games(self.qb, num_games=3)), 3)
+    
+    def test_season_stats_single_query(self):
+        """A season's games take one query and come back in week order."""
+        from .data_access import get_player_season_stats
+        
+        with self.assertNumQueries(1):
+            season = get_player_season_stats(self.qb, 2025)
+        
+        self.assertEqual(season['week'].tolist(), [1, 2, 3, 4])
+        self.assertEqual(season['rushing_yards'].tolist(), [4, 8, 12, 0])
+        self.assertEqual(list(season.columns), list(get_player_season_stats(self.qb, 2024).columns))
+        self.assertTrue(get_player_season_stats(self.qb, 2023).empty)
+    
+    def test_bulk_recent_games_single_query(self):
+        """Many players' recent games come from one windowed query, as fetched one by one."""
+        from .data_access import get_player_recent_games, get_recent_games_for_players
+        
+        rb = Player.objects.create(player_id='history-rb-001', display_name='History RB', position='RB')
+        idle = Player.objects.create(player_id='history-idle-001', display_name='History Idle', position='WR')
+        for week in range(1, 5):
+            PlayerGameStats.objects.create(
+                player=rb, season=2025, week=week, season_type='REG',
+                team='BUF', opponent_team='MIA', carries=10 + week, rushing_yards=40 + week
+            )
+        PlayerGameStats.objects.create(
+            player=rb, season=2025, week=19, season_type='POST', team='BUF', opponent_team='KC'
+        )
+        
+        with self.assertNumQueries(1):
+            histories = get_recent_games_for_players([self.qb.player_id, rb.player_id, idle.player_id], num_games=3)
+        
+        self.assertEqual(set(histories), {self.qb.player_id, rb.player_id})
+        for player in (self.qb, rb):
+            pd.testing.assert_frame_equal(histories[player.player_id], get_player_recent_games(player, num_games=3))
+        self.assertEqual(histories[rb.player_id]['week'].tolist(), [2, 3, 4])
+        self.assertEqual(set(get_recent_games_for_players(num_games=1)), {self.qb.player_id, rb.player_id})
+    
+    def test_players_form(self):
+        """get_players_form reads stored rows and bulk-fetches the rest."""
+        from .data_access import get_player_recent_games
+        from .feature_store import get_players_form
+        
+        idle = Player.objects.create(player_id='history-idle-001', display_name='History Idle', position='WR')
+        
+        with self.assertNumQueries(2):
+            forms = get_players_form([self.qb, idle])
+        self.assertIsInstance(forms[self.qb.player_id], RollingFeatures)
+        self.assertEqual(len(forms[self.qb.player_id]), 6)
+        self.assertTrue(forms[idle.player_id].empty)
+        
+        with override_settings(ML_USE_FEATURE_STORE=False):
+            forms = get_players_form([self.qb])
+        pd.testing.assert_frame_equal(forms[self.qb.player_id], get_player_recent_games(self.qb, num_games=8))
+
+
+class SeasonCalendarTest(TestCase):
+    """Tests for the cached season calendar behind get_prediction_week."""
+    
+    def setUp(self):
+        """Set up a RB with 2024 Week 18 and 2025 Weeks 1-3 games."""
+        self.rb = Player.objects.create(player_id='calendar-rb-001', display_name='Calendar RB', position='RB')
+        for season, week in [(2025, 2), (2024, 18), (2025, 3), (2025, 1)]:
+            self._save_game(season, week)
+    
+    def _save_game(self, season, week, season_type='REG'):
+        return PlayerGameStats.objects.create(
+            player=self.rb, season=season, week=week, season_type=season_type,
+            team='DET', opponent_team='GB', carries=15
+        )
+    
+    def test_prediction_week_follows_saves_and_deletes(self):
+        """Saved games move the calendar forward; deleting the latest week moves it back."""
+        from .data_access import get_prediction_week
+        from .season_calendar import get_latest_week
+        
+        self.assertEqual(get_prediction_week(), (2025, 4, False))
+        
+        older = PlayerGameStats.objects.get(player=self.rb, season=2025, week=1)
+        older.carries = 20
+        older.save()  # an older week: no change
+        self._save_game(2025, 19, season_type='POST')
+        self.assertEqual(get_latest_week('REG'), (2025, 3))
+        self.assertEqual(get_latest_week('POST'), (2025, 19))
+        
+        latest = self._save_game(2025, 18)
+        self.assertEqual(get_prediction_week(), (2025, 18, True))
+        
+        latest.delete()
+        self.assertEqual(get_prediction_week(), (2025, 4, False))
+    
+    def test_cached_reads(self):
+        """Reads serve the process cache without a query between polls, and at most a version check."""
+        from .data_access import get_prediction_week
+        from .models import SeasonCalendar
+        from django.utils import timezone
+        
+        get_prediction_week()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_prediction_week(), (2025, 4, False))
+        
+        # A write from another process is picked up at the next version check
+        SeasonCalendar.objects.filter(season_type='REG').update(week=6, updated_at=timezone.now())
+        with override_settings(SEASON_CALENDAR_POLL_SECONDS=0):
+            with self.assertNumQueries(2):
+                self.assertEqual(get_prediction_week(), (2025, 7, False))
+            with self.assertNumQueries(1):
+                self.assertEqual(get_prediction_week(), (2025, 7, False))
+    
+    def test_rebuild(self):
+        """The loader's rebuild and the backfill migration scan the game stats; reads never write."""
+        import importlib
+        from django.apps import apps
+        from .data_access import get_prediction_week
+        from .models import SeasonCalendar
+        from .season_calendar import rebuild_season_calendar
+        
+        self.assertEqual(rebuild_season_calendar(), {'REG': (2025, 3)})
+        
+        SeasonCalendar.objects.all().delete()
+        with override_settings(SEASON_CALENDAR_POLL_SECONDS=0):
+            get_prediction_week()
+        self.assertFalse(SeasonCalendar.objects.exists())
+        
+        migration = importlib.import_module('api.migrations.0012_backfill_seasoncalendar')
+        migration.backfill_season_calendar(apps, None)
+        with override_settings(SEASON_CALENDAR_POLL_SECONDS=0):
+            self.assertEqual(get_prediction_week(), (2025, 4, False))
+
+
+class GameStatsLoaderTest(TestCase):
+    """Tests for the bulk upsert in load_player_data."""
+    
+    CSV_HEADER = ('player_id,position,season,week,season_type,team,opponent_team,completions,attempts,'
+                  'passing_yards,passing_tds,carries,rushing_yards,receptions,targets,receiving_yards,passing_epa\n')
+    
+    def setUp(self):
+        """Set up two players and a weekly stats directory."""
+        self.qb = Player.objects.create(player_id='loader-qb-001', display_name='Loader QB', position='QB')
+        self.wr = Player.objects.create(player_id='loader-wr-001', display_name='Loader WR', position='WR')
+        self.stats_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.stats_dir)
+    
+    def _write_csv(self, lines):
+        (self.stats_dir / 'stats_player_week_2025.csv').write_text(self.CSV_HEADER + '\n'.join(lines) + '\n')
+    
+    def _load(self, batch_size=2):
+        from .management.commands.load_player_data import Command
+        from .signals import deferred_updates
+        
+        command = Command(stdout=io.StringIO())
+        with deferred_updates():
+            player_ids = command.load_game_stats(self.stats_dir, [2025], batch_size=batch_size)
+        command.rebuild_derived_tables([2025], player_ids)
+        return command.stdout.getvalue()
+    
+    def test_bulk_upsert(self):
+        """Rows are inserted in batches, updated in place when reloaded, and unknown players skipped."""
+        self._write_csv([
+            'loader-qb-001,QB,2025,1,REG,Kansas City Chiefs,DEN,22,31,260,2,3,12,0,0,0,4.5',
+            'loader-qb-001,QB,2025,2,REG,KC,LV,25,36,301,3,,8,0,0,0,',
+            'loader-wr-001,WR,2025,1,REG,KC,DEN,0,0,0,0,1,4,7,9,88,',
+            'unknown-001,WR,2025,1,REG,KC,DEN,0,0,0,0,0,0,3,5,40,',
+            'loader-k-001,K,2025,1,REG,KC,DEN,0,0,0,0,0,0,0,0,0,',
+        ])
+        output = self._load()
+        self.assertIn('Created 3, Updated 0, Skipped 1', output)
+        self.assertIn('rows/s', output)
+        
+        game = PlayerGameStats.objects.get(player=self.qb, week=1)
+        self.assertEqual((game.team, game.passing_yards, game.passing_epa), ('KC', 260, 4.5))
+        self.assertEqual(PlayerGameStats.objects.get(player=self.qb, week=2).carries, 0)
+        
+        self._write_csv(['loader-qb-001,QB,2025,2,REG,KC,LV,26,37,315,3,2,8,0,0,0,'])
+        self.assertIn('Created 0, Updated 1, Skipped 0', self._load())
+        self.assertEqual(PlayerGameStats.objects.filter(player=self.qb).count(), 2)
+        self.assertEqual(PlayerGameStats.objects.get(player=self.qb, week=2).passing_yards, 315)
+    
+    def test_rebuilds_derived_tables(self):
+        """Derived tables skipped during the load match per-game updates after the rebuild."""
+        from .feature_store import get_rolling_features
+        from .season_calendar import get_latest_week
+        
+        self._write_csv([
+            f'loader-wr-001,WR,2025,{week},REG,KC,DEN,0,0,0,0,0,0,{week},{week + 3},{week * 15},'
+            for week in range(1, 6)
+        ])
+        self._load()
+        
+        self.assertEqual(len(get_rolling_features(self.wr)), 5)
+        self.assertEqual(get_latest_week('REG'), (2025, 5))
+        self.assertEqual(get_team_stats_for_week('KC', 2025, 3)['team_targets'], 6.0)
+    
+    def test_vectorized_rows_match_per_row_conversion(self):
+        """Column-level conversion gives exactly the values of the loader's per-row conversion."""
+        from .management.commands.benchmark_loader import convert_per_row
+        from .management.commands.load_player_data import Command, GAME_FIELDS
+        
+        df = pd.read_csv(io.StringIO(
+            'player_id,season,week,season_type,team,opponent_team,completions,passing_yards,carries,'
+            'rushing_yards,receptions,targets,passing_epa,receiving_epa,fantasy_points\n'
+            'p1,2025,1,REG,Kansas City Chiefs,DEN,22,260.0,3,-1.5,0,,4.25,,18.4\n'
+            'p2,2025,2,REG,KC,,,301.7,2.9,12,7,9,,-0.5,\n'
+            'p3,2025,3,POST,Oakland Raiders,SF,1,0,abc,8,12,12,1e-3,2,7\n'
+        ))
+        self.assertEqual(df['carries'].dtype, object)
+        
+        # The reference covers every field the records hold
+        self.assertEqual(set(Command().game_stats_data(df.iloc[0])), set(GAME_FIELDS))
+        
+        expected = convert_per_row(df)
+        records = Command.game_stats_records(df)
+        self.assertEqual(records, expected)
+        self.assertEqual([type(value) for value in records[1]], [type(value) for value in expected[1]])
+        self.assertEqual(records[0][GAME_FIELDS.index('rushing_yards')], -1)
+        self.assertEqual(records[2][GAME_FIELDS.index('team')], 'LV')
+    
+    def test_load_players(self):
+        """players.csv rows are converted by column and upserted, matching the per-row conversion."""
+        from .management.commands.load_player_data import Command
+        
+        players_file = self.stats_dir / 'players.csv'
+        players_file.write_text(
+            'gsis_id,display_name,short_name,first_name,last_name,position,latest_team,jersey_number,'
+            'status,headshot,rookie_season,last_season\n'
+            'loader-qb-001,Loader QB,L.QB,Loader,QB,QB,KC,15.0,ACT,,2017,2025\n'
+            'new-te-001,New TE,,New,TE,TE,,,INA,https://example.com/te.png,,\n'
+            ',No Id,,No,Id,WR,BUF,1,ACT,,2020,2025\n'
+            'new-k-001,New K,,New,K,K,KC,3,ACT,,2020,2025\n'
+        )
+        command = Command(stdout=io.StringIO())
+        command.load_players(players_file)
+        self.assertIn('Created: 1', command.stdout.getvalue())
+        self.assertIn('Updated: 1', command.stdout.getvalue())
+        self.assertIn('Skipped: 1', command.stdout.getvalue())
+        
+        qb = Player.objects.get(player_id='loader-qb-001')
+        self.assertEqual(
+            (qb.short_name, qb.current_team, qb.jersey_number, qb.status, qb.headshot_url, qb.rookie_season),
+            ('L.QB', 'KC', 15, 'ACT', None, 2017)
+        )
+        te = Player.objects.get(player_id='new-te-001')
+        self.assertEqual(
+            (te.short_name, te.current_team, te.jersey_number, te.status, te.headshot_url, te.last_season),
+            (None, None, None, 'UNK', 'https://example.com/te.png', None)
+        )
+        self.assertFalse(Player.objects.filter(player_id='new-k-001').exists())
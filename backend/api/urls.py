@@ -11,6 +11,10 @@ urlpatterns = [
     
     # ML Prediction endpoint
     path("predict-bet/", prediction_views.predict_bet, name="predict_bet"),
+    path("predict-bets/", prediction_views.predict_bets, name="predict_bets"),
+    path("predict-curve/", prediction_views.predict_curve, name="predict_curve"),
+    path("projections/", prediction_views.projections, name="projections"),
+    path("health/", prediction_views.health, name="health"),
     
     # Dynamic data endpoints
     path("teams/", views.get_teams, name="get_teams"),
@@ -0,0 +1,30 @@
+"""
+Gunicorn configuration for the Django backend.
+
+The app, including every ML model and feature plan, is loaded once in the
+master process before workers are forked (preload_app), so workers share
+the models copy-on-write and per-worker memory stays roughly constant as
+workers are added. See the "Forked Workers" section of ml_service/README.md.
+
+Usage (from backend/):
+    gunicorn
+    GUNICORN_WORKERS=8 gunicorn
+"""
+
+import multiprocessing
+import os
+
+# Tell the app it is being loaded in a forking master (see ML_PREFORK_PRELOAD in settings)
+os.environ.setdefault('ML_PREFORK_PRELOAD', 'true')
+
+wsgi_app = 'hedge_bets.wsgi:application'
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+preload_app = True
+
+
+def post_fork(server, worker):
+    """Start per-worker background tasks; threads started in the master don't survive fork."""
+    from api import prediction_views
+    prediction_views.start_background_tasks()
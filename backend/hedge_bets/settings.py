@@ -2,6 +2,7 @@
 Django settings for hedge_bets project.
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -118,3 +119,60 @@ CORS_ALLOW_METHODS = [
 
 # Add preflight response handling
 CORS_PREFLIGHT_MAX_AGE = 86400
+
+# ML inference settings
+# Maximum number of cached quantile predictions per process (0 disables the cache)
+PREDICTION_CACHE_SIZE = int(os.environ.get('PREDICTION_CACHE_SIZE', 4096))
+
+# Load every quantile model from a thread pool at startup instead of lazily on first use
+ML_PRELOAD_MODELS = os.environ.get('ML_PRELOAD_MODELS', 'false').lower() in ('1', 'true', 'yes')
+ML_PRELOAD_WORKERS = int(os.environ.get('ML_PRELOAD_WORKERS', 8))
+
+# Load every model synchronously at import, in the WSGI master, so forked workers share them
+# copy-on-write (set by gunicorn.conf.py, which preloads the app). Background tasks such as
+# registry polling then start in each worker after fork instead.
+ML_PREFORK_PRELOAD = os.environ.get('ML_PREFORK_PRELOAD', 'false').lower() in ('1', 'true', 'yes')
+
+# Byte budget for loaded models per process (0 means unlimited) and eviction policy (lru or lfu)
+ML_MODEL_CACHE_MAX_BYTES = int(os.environ.get('ML_MODEL_CACHE_MAX_BYTES', 0))
+ML_MODEL_CACHE_POLICY = os.environ.get('ML_MODEL_CACHE_POLICY', 'lru')
+
+# Versioned model registry (see ml_service/model_registry.py). When set, the active version is
+# served and the registry is polled so newly activated versions are hot reloaded.
+ML_MODEL_REGISTRY_DIR = os.environ.get('ML_MODEL_REGISTRY_DIR') or None
+ML_MODEL_REGISTRY_POLL_SECONDS = float(os.environ.get('ML_MODEL_REGISTRY_POLL_SECONDS', 30))
+
+# LightGBM threads per prediction: requests below ML_BATCH_MIN_ROWS rows use
+# ML_SINGLE_ROW_THREADS, larger batches use ML_BATCH_THREADS (0 = all cores).
+# `python manage.py benchmark_inference` shows the crossover on a given host.
+ML_SINGLE_ROW_THREADS = int(os.environ.get('ML_SINGLE_ROW_THREADS', 1))
+ML_BATCH_THREADS = int(os.environ.get('ML_BATCH_THREADS', 4))
+ML_BATCH_MIN_ROWS = int(os.environ.get('ML_BATCH_MIN_ROWS', 256))
+
+# Predict single rows through LightGBM's private single-row C API instead of Booster.predict.
+# Opt-in: only enabled on the LightGBM versions it was tested with (see ml_service/inference_engine.py)
+ML_LIGHTGBM_FAST_SINGLE_ROW = os.environ.get('ML_LIGHTGBM_FAST_SINGLE_ROW', 'false').lower() in ('1', 'true', 'yes')
+
+# Model inference backend: 'lightgbm' (Boosters) or 'numpy' (flattened tree arrays, no unpickling
+# of LightGBM objects when the arrays were exported with `python manage.py export_tree_arrays`)
+ML_INFERENCE_BACKEND = os.environ.get('ML_INFERENCE_BACKEND', 'lightgbm')
+
+# Out-of-process inference server (`python manage.py run_inference_server`). When ML_INFERENCE_SOCKET
+# is set, Django prepares features and sends model work to the server over this Unix socket.
+ML_INFERENCE_SOCKET = os.environ.get('ML_INFERENCE_SOCKET') or None
+ML_INFERENCE_TIMEOUT = float(os.environ.get('ML_INFERENCE_TIMEOUT', 10))
+ML_INFERENCE_PROCESSES = int(os.environ.get('ML_INFERENCE_PROCESSES', 2))
+ML_INFERENCE_BATCH_WINDOW_MS = float(os.environ.get('ML_INFERENCE_BATCH_WINDOW_MS', 3))
+ML_INFERENCE_MAX_BATCH_ROWS = int(os.environ.get('ML_INFERENCE_MAX_BATCH_ROWS', 1024))
+
+# Serve predict_bet from the projections precomputed for the upcoming week
+# (`python manage.py precompute_projections`) when one exists for the current model version
+ML_SERVE_PROJECTIONS = os.environ.get('ML_SERVE_PROJECTIONS', 'true').lower() in ('1', 'true', 'yes')
+
+# Read players' rolling form features from the PlayerFeatures store (one row lookup) instead of
+# fetching their recent games and computing rolling windows per request
+ML_USE_FEATURE_STORE = os.environ.get('ML_USE_FEATURE_STORE', 'true').lower() in ('1', 'true', 'yes')
+
+# Seconds a process serves its cached season calendar (latest loaded week) without a query before
+# checking the calendar's version again for loads made by other processes; 0 checks on every read
+SEASON_CALENDAR_POLL_SECONDS = float(os.environ.get('SEASON_CALENDAR_POLL_SECONDS', 5))
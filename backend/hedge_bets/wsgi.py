@@ -4,8 +4,17 @@ WSGI config for hedge_bets project.
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hedge_bets.settings')
 
 application = get_wsgi_application()
+
+# Import the prediction views when the web server loads the app with preloading
+# or the model registry enabled, so loading and registry polling start at boot
+# rather than on the first request (and, with ML_PREFORK_PRELOAD, in the master
+# before it forks workers). Done here rather than in AppConfig.ready so
+# management commands don't load the models.
+if settings.ML_PRELOAD_MODELS or settings.ML_PREFORK_PRELOAD or settings.ML_MODEL_REGISTRY_DIR:
+    from api import prediction_views  # noqa: F401
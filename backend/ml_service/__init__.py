@@ -13,8 +13,11 @@ __version__ = "1.0.0"
 
 # Import main classes for easy access
 from .model_loader import ModelLoader
-from .feature_engineering import FeatureEngineer
-from .prediction_service import PredictionService, PredictionResult
+from .feature_engineering import FeatureEngineer, FeaturePlan, RollingFeatures
+from .model_registry import ModelRegistry
+from .inference_engine import InferenceEngine, ThreadingPolicy
+from .inference_server import InferenceClient, InferenceServer
+from .prediction_service import PredictionService, PredictionResult, PredictionCurve, BetRequest
 from .constants import (
     ACTION_TO_STAT,
     STAT_TO_ACTION,
@@ -26,9 +29,18 @@ from .constants import (
 
 __all__ = [
     'ModelLoader',
+    'ModelRegistry',
+    'InferenceEngine',
+    'ThreadingPolicy',
+    'InferenceClient',
+    'InferenceServer',
     'FeatureEngineer',
+    'FeaturePlan',
+    'RollingFeatures',
     'PredictionService',
     'PredictionResult',
+    'PredictionCurve',
+    'BetRequest',
     'ACTION_TO_STAT',
     'STAT_TO_ACTION',
     'POSITION_STATS',
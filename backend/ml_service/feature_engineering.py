@@ -6,11 +6,198 @@ Prepares player data for model predictions.
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Rolling windows used for the player form features
+ROLLING_WINDOWS = [3, 5]
+
+# League average approximations used when no team context is available
+DEFAULT_TEAM_STATS = {
+    'team_passing_yards': 230.0,
+    'team_rushing_yards': 120.0,
+    'team_receptions': 22.0,
+    'team_targets': 34.0
+}
+
+
+def _rolling_window_last(values: np.ndarray, windows: List[int]) -> tuple:
+    """
+    Rolling mean and std of the LAST row of a (games x stats) array.
+    
+    That is the mean and sample std (ddof=1) of each stat over its last
+    `window` games, skipping NaN games as pandas rolling(window,
+    min_periods=1).mean() / .std() do. Equal to the DataFrame path up to
+    floating-point rounding.
+    
+    Args:
+        values: Float array of shape (games, stats), oldest game first
+        windows: Rolling window sizes
+    
+    Returns:
+        Tuple of (mean, std) arrays of shape (windows, stats). std is NaN
+        where pandas would return NaN (fewer than 2 observations).
+    """
+    shape = (len(windows), values.shape[1])
+    mean = np.empty(shape)
+    std = np.empty(shape)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for w, window in enumerate(windows):
+            tail = values[-window:]
+            valid = ~np.isnan(tail)
+            counts = valid.sum(axis=0)
+            
+            mean[w] = np.where(valid, tail, 0.0).sum(axis=0) / counts
+            deviations = np.where(valid, tail - mean[w], 0.0)
+            std[w] = np.sqrt((deviations ** 2).sum(axis=0) / (counts - 1))
+            std[w, counts < 2] = np.nan
+    
+    return mean, std
+
+
+def rolling_form_features(values: np.ndarray, stat_cols: List[str]) -> Dict[str, float]:
+    """
+    Rolling form features going into a player's next game.
+    
+    Args:
+        values: Float array of shape (games, stats), oldest game first, with
+                the same games the request path would fetch as history
+        stat_cols: Stat names of the columns of values
+    
+    Returns:
+        Dictionary mapping '{stat}_avg_{window}' / '{stat}_std_{window}' to
+        the same values fill_features computes from that history
+    """
+    mean, std = _rolling_window_last(values, ROLLING_WINDOWS)
+    std = np.where(np.isnan(std), 0.0, std)
+    
+    features = {}
+    for w, window in enumerate(ROLLING_WINDOWS):
+        for j, stat in enumerate(stat_cols):
+            features[f'{stat}_avg_{window}'] = float(mean[w, j])
+            features[f'{stat}_std_{window}'] = float(std[w, j])
+    return features
+
+
+@dataclass(frozen=True)
+class RollingFeatures:
+    """
+    A player's precomputed rolling form features (e.g. from a feature store).
+    
+    Accepted wherever a player_history DataFrame is, so predictions can skip
+    fetching games and computing rolling windows. len() is the number of
+    games the features were computed from, as for a history DataFrame.
+    """
+    values: Dict[str, float]  # '{stat}_avg_{window}' / '{stat}_std_{window}' -> value
+    games: int
+    
+    def __len__(self) -> int:
+        return self.games
+
+
+@dataclass(frozen=True, eq=False)
+class FeaturePlan:
+    """
+    Precompiled layout of one model's feature vector.
+    
+    Built once per (position, stat) when the models load, so inference can
+    fill a preallocated float array directly instead of building and
+    reindexing a DataFrame for every quantile model.
+    """
+    position: str
+    stat_name: str
+    feature_columns: Tuple[str, ...]
+    column_index: Dict[str, int]
+    stat_cols: Tuple[str, ...]  # stats with rolling features
+    rolling_index: np.ndarray  # (windows, stats, 2) -> [avg, std] column index, -1 if unused
+    team_defaults: Tuple[Tuple[str, int, float], ...]  # (team stat, column index, league average)
+    missing_columns: Tuple[str, ...]  # columns feature engineering never produces
+    season_index: int
+    week_index: int
+    season_progression_index: int
+    is_playoff_index: int
+    
+    @classmethod
+    def compile(
+        cls,
+        position: str,
+        stat_name: str,
+        feature_columns: List[str],
+        stat_cols: List[str]
+    ) -> 'FeaturePlan':
+        """
+        Compile a feature plan for a model.
+        
+        Args:
+            position: Player position
+            stat_name: Stat the model predicts
+            feature_columns: Model feature names, in model column order
+            stat_cols: Stats that get rolling features for this position
+        
+        Returns:
+            FeaturePlan for the model
+        """
+        column_index = {name: i for i, name in enumerate(feature_columns)}
+        
+        rolling_index = np.full((len(ROLLING_WINDOWS), len(stat_cols), 2), -1, dtype=np.intp)
+        for w, window in enumerate(ROLLING_WINDOWS):
+            for j, stat in enumerate(stat_cols):
+                rolling_index[w, j, 0] = column_index.get(f'{stat}_avg_{window}', -1)
+                rolling_index[w, j, 1] = column_index.get(f'{stat}_std_{window}', -1)
+        
+        team_defaults = tuple(
+            (team_stat, column_index[team_stat], value)
+            for team_stat, value in DEFAULT_TEAM_STATS.items()
+            if team_stat in column_index
+        )
+        
+        produced = {'season', 'week', 'season_progression', 'is_playoff', 'is_home'}
+        produced.update(DEFAULT_TEAM_STATS)
+        produced.update(
+            f'{stat}_{kind}_{window}'
+            for stat in stat_cols for window in ROLLING_WINDOWS for kind in ('avg', 'std')
+        )
+        missing_columns = tuple(name for name in feature_columns if name not in produced)
+        if missing_columns:
+            label = f"{position}_{stat_name}" if position else "(ad hoc)"
+            logger.warning(
+                f"Feature plan {label}: {list(missing_columns)} are not produced "
+                f"by feature engineering and will default to 0"
+            )
+        
+        return cls(
+            position=position,
+            stat_name=stat_name,
+            feature_columns=tuple(feature_columns),
+            column_index=column_index,
+            stat_cols=tuple(stat_cols),
+            rolling_index=rolling_index,
+            team_defaults=team_defaults,
+            missing_columns=missing_columns,
+            season_index=column_index.get('season', -1),
+            week_index=column_index.get('week', -1),
+            season_progression_index=column_index.get('season_progression', -1),
+            is_playoff_index=column_index.get('is_playoff', -1)
+        )
+    
+    def validate(self, expected_columns: List[str]):
+        """
+        Check that the plan matches a model's expected feature columns.
+        
+        Raises:
+            ValueError: If the columns or their order differ
+        """
+        if list(self.feature_columns) != list(expected_columns):
+            raise ValueError(
+                f"Feature plan for {self.position}_{self.stat_name} does not match the "
+                f"expected feature columns: plan={list(self.feature_columns)}, "
+                f"expected={list(expected_columns)}"
+            )
+
 
 class FeatureEngineer:
     """
@@ -20,7 +207,7 @@ class FeatureEngineer:
     
     def __init__(self):
         """Initialize the feature engineer."""
-        pass
+        self._plans: Dict[tuple, FeaturePlan] = {}
     
     def create_rolling_features(
         self, 
@@ -138,14 +325,7 @@ class FeatureEngineer:
         
         # Otherwise, set default values (league average approximations)
         else:
-            default_team_stats = {
-                'team_passing_yards': 230.0,
-                'team_rushing_yards': 120.0,
-                'team_receptions': 22.0,
-                'team_targets': 34.0
-            }
-            
-            for stat_name, stat_value in default_team_stats.items():
+            for stat_name, stat_value in DEFAULT_TEAM_STATS.items():
                 if stat_name not in df.columns:
                     df[stat_name] = stat_value
         
@@ -153,7 +333,7 @@ class FeatureEngineer:
     
     def prepare_inference_features(
         self,
-        player_history: pd.DataFrame,
+        player_history: Union[pd.DataFrame, RollingFeatures],
         position: str,
         stat_cols: List[str],
         current_season: int,
@@ -165,7 +345,8 @@ class FeatureEngineer:
         Prepare all features needed for model inference.
         
         Args:
-            player_history: DataFrame with player's recent game history
+            player_history: DataFrame with player's recent game history, or
+                            the player's precomputed RollingFeatures
             position: Player position (QB, RB, WR, TE)
             stat_cols: List of stats to create rolling features for
             current_season: Current season year
@@ -176,6 +357,24 @@ class FeatureEngineer:
         Returns:
             DataFrame with all engineered features for the NEXT game
         """
+        if isinstance(player_history, RollingFeatures) and len(player_history) > 0:
+            # Read the stored rolling features instead of computing them
+            latest_features = pd.DataFrame({
+                'season': [current_season],
+                'week': [current_week],
+                'season_progression': [current_week / 18.0],
+                'is_playoff': [int(is_playoff)],
+                'is_home': [0]
+            })
+            for window in ROLLING_WINDOWS:
+                for stat in stat_cols:
+                    for kind in ('avg', 'std'):
+                        name = f'{stat}_{kind}_{window}'
+                        latest_features[name] = player_history.values.get(name, 0.0)
+            return self.add_team_context_features(latest_features, team_stats)
+        if isinstance(player_history, RollingFeatures):
+            player_history = pd.DataFrame()
+        
         df = player_history.copy()
         
         # Add temporal features to historical data
@@ -219,6 +418,166 @@ class FeatureEngineer:
         
         return latest_features
     
+    def prepare_inference_vector(
+        self,
+        player_history: pd.DataFrame,
+        stat_cols: List[str],
+        feature_columns: List[str],
+        current_season: int,
+        current_week: int,
+        is_playoff: bool = False,
+        team_stats: Optional[Dict[str, float]] = None
+    ) -> np.ndarray:
+        """
+        Array-based equivalent of prepare_inference_features + align_features.
+        
+        Computes only the last-row rolling mean/std straight from a
+        (games x stats) array instead of copying the DataFrame and running a
+        groupby-rolling per (window, stat). The output equals the DataFrame
+        path up to floating-point rounding.
+        
+        Args:
+            player_history: DataFrame with player's recent game history
+            stat_cols: List of stats to create rolling features for
+            feature_columns: Model feature names, in model column order
+            current_season: Current season year
+            current_week: Current week number
+            is_playoff: Whether this is a playoff game
+            team_stats: Optional team statistics
+        
+        Returns:
+            Float array of feature values in feature_columns order
+        """
+        plan_key = (tuple(feature_columns), tuple(stat_cols))
+        plan = self._plans.get(plan_key)
+        if plan is None:
+            plan = FeaturePlan.compile('', '', list(feature_columns), list(stat_cols))
+            self._plans[plan_key] = plan
+        
+        return self.fill_features(
+            plan=plan,
+            player_history=player_history,
+            current_season=current_season,
+            current_week=current_week,
+            is_playoff=is_playoff,
+            team_stats=team_stats
+        )
+    
+    def fill_features(
+        self,
+        plan: FeaturePlan,
+        player_history: Union[pd.DataFrame, RollingFeatures],
+        current_season: int,
+        current_week: int,
+        is_playoff: bool = False,
+        team_stats: Optional[Dict[str, float]] = None,
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Fill a model feature vector using a precompiled feature plan.
+        
+        Args:
+            plan: FeaturePlan for the model
+            player_history: DataFrame with player's recent game history, or
+                            the player's precomputed RollingFeatures
+            current_season: Current season year
+            current_week: Current week number
+            is_playoff: Whether this is a playoff game
+            team_stats: Optional team statistics
+            out: Optional preallocated float array (e.g. a row of a batch
+                 matrix) to fill in place
+        
+        Returns:
+            Float array of feature values in plan.feature_columns order
+        """
+        if out is None:
+            out = np.empty(len(plan.feature_columns), dtype=np.float64)
+        out.fill(0.0)
+        
+        if isinstance(player_history, RollingFeatures) and len(player_history) > 0:
+            # Stored rolling features, for the plan's stats only (as the history path)
+            for w, window in enumerate(ROLLING_WINDOWS):
+                for j, stat in enumerate(plan.stat_cols):
+                    avg_index, std_index = plan.rolling_index[w, j]
+                    if avg_index >= 0:
+                        out[avg_index] = player_history.values.get(f'{stat}_avg_{window}', 0.0)
+                    if std_index >= 0:
+                        out[std_index] = player_history.values.get(f'{stat}_std_{window}', 0.0)
+            columns = ()
+        
+        elif len(player_history) > 0:
+            rows = self._ordered_history_rows(player_history)
+            columns = player_history.columns
+            
+            # Start from the latest game, as the DataFrame path does
+            for name in columns:
+                index = plan.column_index.get(name)
+                if index is not None:
+                    out[index] = player_history[name].to_numpy()[rows[-1]]
+            
+            # Rolling form features, from a (games x stats) array
+            present = [j for j, stat in enumerate(plan.stat_cols) if stat in columns]
+            if present:
+                values = player_history[[plan.stat_cols[j] for j in present]].to_numpy(dtype=np.float64)[rows]
+                mean, std = _rolling_window_last(values, ROLLING_WINDOWS)
+                std = np.where(np.isnan(std), 0.0, std)
+                
+                targets = plan.rolling_index[:, present, :]
+                used = targets[..., 0] >= 0
+                out[targets[..., 0][used]] = mean[used]
+                used = targets[..., 1] >= 0
+                out[targets[..., 1][used]] = std[used]
+        
+        else:
+            logger.warning("No player history available, using default features")
+            columns = ()
+        
+        # Team context, as add_team_context_features applies it
+        if team_stats:
+            for stat_name, stat_value in team_stats.items():
+                index = plan.column_index.get(stat_name)
+                if index is not None:
+                    out[index] = stat_value
+        else:
+            for team_stat, index, value in plan.team_defaults:
+                if team_stat not in columns:
+                    out[index] = value
+        
+        # Update to next game's temporal features
+        if plan.season_index >= 0:
+            out[plan.season_index] = current_season
+        if plan.week_index >= 0:
+            out[plan.week_index] = current_week
+        if plan.season_progression_index >= 0:
+            out[plan.season_progression_index] = current_week / 18.0
+        if plan.is_playoff_index >= 0:
+            out[plan.is_playoff_index] = int(is_playoff)
+        
+        return out
+    
+    @staticmethod
+    def _ordered_history_rows(player_history: pd.DataFrame) -> np.ndarray:
+        """
+        Row positions of the player's games, oldest first.
+        
+        Matches the DataFrame path, which sorts by (player_id, season, week)
+        and takes the last row: only the last player's games are used.
+        """
+        num_rows = len(player_history)
+        columns = player_history.columns
+        
+        if not all(col in columns for col in ('player_id', 'season', 'week')):
+            return np.arange(num_rows)
+        
+        player_ids = player_history['player_id'].to_numpy()
+        rows = np.arange(num_rows)
+        if num_rows > 1 and not (player_ids == player_ids[0]).all():
+            rows = rows[player_ids == max(player_ids)]
+        
+        seasons = player_history['season'].to_numpy()[rows]
+        weeks = player_history['week'].to_numpy()[rows]
+        return rows[np.lexsort((weeks, seasons))]
+    
     def validate_features(
         self,
         df: pd.DataFrame,
@@ -0,0 +1,321 @@
+"""
+Inference engine for the LightGBM quantile models.
+
+Models are reduced to their underlying lightgbm.Booster once, at load time,
+and predicted on contiguous float64/float32 arrays with Booster.predict.
+
+Single rows can optionally go through LightGBM's single-row fast C API
+(ThreadingPolicy.fast_single_row, ML_LIGHTGBM_FAST_SINGLE_ROW), which skips
+the per-call predictor setup that Booster.predict does (several times the
+cost of scoring ~25 features through 100 trees). It drives private LightGBM
+internals, so it is off by default, only enabled on the LightGBM versions in
+FAST_SINGLE_ROW_VERSIONS, and falls back to Booster.predict if it fails.
+"""
+
+import ctypes
+import logging
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+try:
+    from .tree_evaluator import NumpyTreeModel, TreeEnsemble
+except ImportError:
+    from tree_evaluator import NumpyTreeModel, TreeEnsemble
+
+logger = logging.getLogger(__name__)
+
+# LightGBM releases the single-row fast path has been tested against (major.minor)
+FAST_SINGLE_ROW_VERSIONS = ('4.6',)
+
+try:
+    import lightgbm as lgb
+except ImportError:  # pragma: no cover - lightgbm is a hard requirement of the models
+    lgb = None
+
+try:
+    from lightgbm.basic import _LIB, _safe_call
+    FAST_SINGLE_ROW_AVAILABLE = (
+        '.'.join(lgb.__version__.split('.')[:2]) in FAST_SINGLE_ROW_VERSIONS
+        and all(
+            hasattr(_LIB, name) for name in (
+                'LGBM_BoosterPredictForMatSingleRowFastInit',
+                'LGBM_BoosterPredictForMatSingleRowFast',
+                'LGBM_FastConfigFree',
+            )
+        )
+    )
+except Exception:  # private API: missing or changed in this LightGBM build
+    FAST_SINGLE_ROW_AVAILABLE = False
+
+# LightGBM C API constants (c_api.h)
+_C_API_DTYPE = {np.dtype(np.float32): 0, np.dtype(np.float64): 1}
+_C_API_PREDICT_NORMAL = 0
+
+
+@dataclass(frozen=True)
+class ThreadingPolicy:
+    """
+    How many LightGBM threads a prediction may use.
+    
+    Spinning up an OpenMP team costs more than scoring one row, and under
+    several concurrent workers every LightGBM call grabbing all cores
+    oversubscribes the CPU. Small requests therefore run single-threaded;
+    only batches of at least batch_min_rows use batch_threads. Run
+    ``python manage.py benchmark_inference`` to find the crossover on a host.
+    
+    fast_single_row opts single-row predictions into LightGBM's private
+    single-row C API (see the module docstring).
+    """
+    single_row_threads: int = 1
+    batch_threads: int = 4
+    batch_min_rows: int = 256
+    fast_single_row: bool = False
+    
+    def threads_for(self, rows: int) -> int:
+        """Number of threads for a prediction over ``rows`` rows (0 = LightGBM default)."""
+        return self.batch_threads if rows >= self.batch_min_rows else self.single_row_threads
+
+
+def extract_booster(model: Any) -> Any:
+    """
+    Get the lightgbm.Booster behind a model.
+    
+    Handles raw Boosters and sklearn wrappers (LGBMRegressor.booster_).
+    Anything else is returned unchanged.
+    """
+    if lgb is not None and isinstance(model, lgb.Booster):
+        return model
+    booster = getattr(model, 'booster_', None)
+    if lgb is not None and isinstance(booster, lgb.Booster):
+        return booster
+    return model
+
+
+class _FastConfig:
+    """Owns a LightGBM single-row FastConfig handle (one per booster per thread)."""
+    
+    def __init__(self, booster: Any, dtype: np.dtype, num_features: int, parameters: str):
+        self.handle = ctypes.c_void_p()
+        self.booster = booster  # keep the booster alive while the config exists
+        _safe_call(_LIB.LGBM_BoosterPredictForMatSingleRowFastInit(
+            booster._handle,
+            ctypes.c_int(_C_API_PREDICT_NORMAL),
+            ctypes.c_int(0),
+            ctypes.c_int(-1),
+            ctypes.c_int(_C_API_DTYPE[dtype]),
+            ctypes.c_int32(num_features),
+            ctypes.c_char_p(parameters.encode('utf-8')),
+            ctypes.byref(self.handle)
+        ))
+        # Output buffers are reused; each config is only used by one thread
+        self._out = ctypes.c_double()
+        self._out_ref = ctypes.byref(self._out)
+        self._out_len = ctypes.c_int64()
+        self._out_len_ref = ctypes.byref(self._out_len)
+    
+    def predict(self, row: np.ndarray) -> float:
+        _safe_call(_LIB.LGBM_BoosterPredictForMatSingleRowFast(
+            self.handle,
+            ctypes.c_void_p(row.ctypes.data),
+            self._out_len_ref,
+            self._out_ref
+        ))
+        return self._out.value
+    
+    def __del__(self):
+        if self.handle:
+            _LIB.LGBM_FastConfigFree(self.handle)
+            self.handle = ctypes.c_void_p()
+
+
+class BoosterPredictor:
+    """
+    A loaded quantile model, predicting on float arrays.
+    
+    Wraps the model's Booster (extracted once, at load time) and predicts
+    with Booster.predict. With fast_single_row, single-row float32/float64
+    inputs use the single-row fast path instead where it is available.
+    """
+    
+    def __init__(self, model: Any, single_row_threads: int = 1, fast_single_row: bool = False):
+        """
+        Initialize the predictor.
+        
+        Args:
+            model: lightgbm.Booster or sklearn-wrapped LightGBM model
+            single_row_threads: LightGBM threads for single-row predictions
+            fast_single_row: Use the single-row fast C API when available
+        """
+        self.booster = extract_booster(model)
+        self.single_row_threads = single_row_threads
+        self.num_features = (
+            self.booster.num_feature() if hasattr(self.booster, 'num_feature') else None
+        )
+        if fast_single_row and not FAST_SINGLE_ROW_AVAILABLE:
+            logger.warning(
+                f"LightGBM single-row fast path unavailable for lightgbm "
+                f"{getattr(lgb, '__version__', None)} (tested: {FAST_SINGLE_ROW_VERSIONS}); "
+                f"using Booster.predict"
+            )
+        self.fast_path = (
+            fast_single_row and FAST_SINGLE_ROW_AVAILABLE and isinstance(self.booster, lgb.Booster)
+        )
+        self._local = threading.local()
+    
+    def feature_name(self):
+        """Feature names the model was trained with."""
+        return self.booster.feature_name()
+    
+    def num_feature(self) -> int:
+        """Number of features the model expects."""
+        return self.num_features
+    
+    def _fast_config(self, dtype: np.dtype) -> _FastConfig:
+        """Get this thread's FastConfig for a dtype, creating it on first use."""
+        configs = getattr(self._local, 'configs', None)
+        if configs is None:
+            configs = self._local.configs = {}
+        
+        config = configs.get(dtype)
+        if config is None:
+            config = configs[dtype] = _FastConfig(
+                self.booster, dtype, self.num_features, f'num_threads={self.single_row_threads}'
+            )
+        return config
+    
+    def predict(self, features: Any, num_threads: Optional[int] = None) -> np.ndarray:
+        """
+        Predict for a feature matrix.
+        
+        Args:
+            features: Array of shape (rows, features) in model column order
+                      (float64 or float32 are used as-is), or a DataFrame
+            num_threads: LightGBM threads for multi-row predictions
+                         (None = LightGBM default). Single rows always use
+                         single_row_threads.
+        
+        Returns:
+            Array of predictions, one per row
+        """
+        if isinstance(features, np.ndarray) and features.ndim == 2:
+            if features.dtype not in _C_API_DTYPE:
+                features = features.astype(np.float64)
+            
+            if self.fast_path and features.shape == (1, self.num_features):
+                row = np.ascontiguousarray(features[0])
+                try:
+                    return np.array([self._fast_config(row.dtype).predict(row)])
+                except Exception as e:
+                    logger.error(f"LightGBM single-row fast path failed, using Booster.predict: {e}")
+                    self.fast_path = False
+            
+            features = np.ascontiguousarray(features)
+            if features.shape[0] == 1:
+                num_threads = self.single_row_threads
+        
+        if num_threads is None:
+            return np.asarray(self.booster.predict(features), dtype=np.float64)
+        return np.asarray(self.booster.predict(features, num_threads=num_threads), dtype=np.float64)
+
+
+class InferenceEngine:
+    """
+    Runs the q10/q50/q90 models of a position-stat over one feature matrix.
+    
+    When every model is a NumpyTreeModel their trees are walked in a single
+    pass: directly when they share a bundle's stacked ensemble, otherwise
+    through a TreeEnsemble stacked once per set of models.
+    """
+    
+    def __init__(self, threading_policy: Optional[ThreadingPolicy] = None):
+        """
+        Initialize the engine.
+        
+        Args:
+            threading_policy: LightGBM threading policy (defaults to ThreadingPolicy())
+        """
+        self.threading_policy = threading_policy or ThreadingPolicy()
+        # first model -> (weak references to the others, combined ensemble)
+        self._combined = weakref.WeakKeyDictionary()
+    
+    def _combined_ensemble(self, models: list) -> TreeEnsemble:
+        """Get the stacked ensemble for a list of NumpyTreeModels."""
+        cached = self._combined.get(models[0])
+        if cached is not None:
+            others, ensemble = cached
+            if len(others) == len(models) - 1 and all(
+                ref() is model for ref, model in zip(others, models[1:])
+            ):
+                return ensemble
+        
+        ensemble = TreeEnsemble.combine([model.ensemble for model in models])
+        self._combined[models[0]] = (tuple(weakref.ref(model) for model in models[1:]), ensemble)
+        return ensemble
+    
+    def warm(self, models: Dict[str, Any]):
+        """
+        Build what predict_quantiles() would build lazily for a set of models
+        (the stacked ensemble of separately loaded NumpyTreeModels), without
+        predicting. Used before forking workers so they share it.
+        """
+        quantile_models = [model for model, _ in models.values()]
+        if quantile_models and all(isinstance(model, NumpyTreeModel) for model in quantile_models):
+            ensembles = {id(model.ensemble): model.ensemble for model in quantile_models}
+            if len(ensembles) > 1 and all(ensemble.num_models == 1 for ensemble in ensembles.values()):
+                self._combined_ensemble(quantile_models)
+    
+    @staticmethod
+    def prepare(features: np.ndarray) -> np.ndarray:
+        """
+        Convert features to a contiguous 2-D float array once for all quantile models.
+        
+        float32 and float64 inputs keep their dtype; anything else becomes float64.
+        """
+        features = np.asarray(features)
+        if features.dtype not in _C_API_DTYPE:
+            features = features.astype(np.float64)
+        if features.ndim == 1:
+            features = features.reshape(1, -1)
+        return np.ascontiguousarray(features)
+    
+    def predict_quantiles(
+        self,
+        models: Dict[str, Any],
+        features: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        Predict every quantile model over a feature matrix.
+        
+        Args:
+            models: Dictionary mapping quantile -> (model, feature_columns)
+            features: Array of shape (rows, features), or (features,) for one row
+        
+        Returns:
+            Dictionary mapping quantile -> array of predictions (one per row)
+        """
+        features = self.prepare(features)
+        
+        quantile_models = [model for model, _ in models.values()]
+        if quantile_models and all(isinstance(model, NumpyTreeModel) for model in quantile_models):
+            ensembles = {id(model.ensemble): model.ensemble for model in quantile_models}
+            if len(ensembles) == 1:
+                # Models of a bundle already share one stacked ensemble
+                predictions = quantile_models[0].ensemble.predict(features)
+                return {
+                    quantile: predictions[model.model_index]
+                    for quantile, (model, _) in models.items()
+                }
+            if all(ensemble.num_models == 1 for ensemble in ensembles.values()):
+                predictions = self._combined_ensemble(quantile_models).predict(features)
+                return dict(zip(models.keys(), predictions))
+        
+        num_threads = self.threading_policy.threads_for(features.shape[0])
+        
+        return {
+            quantile: np.asarray(model.predict(features, num_threads=num_threads), dtype=np.float64)
+            for quantile, (model, _) in models.items()
+        }
@@ -0,0 +1,503 @@
+"""
+Out-of-process inference server with micro-batching.
+
+Runs the quantile models in a pool of local processes listening on one
+Unix socket, so web request threads hand the CPU-bound model work to it
+instead of running LightGBM themselves. Requests arriving within a short
+window (a few milliseconds) are grouped by (position, stat) and predicted
+as one batch, amortizing the per-call overhead at peak load.
+
+Clients send feature matrices already in model column order (feature
+engineering stays in the calling process). Wire format, both directions:
+
+    header length (uint32) | body length (uint32) | JSON header | float64 body
+
+Requests carry ``{"position", "stat", "rows", "cols"}`` and a (rows, cols)
+body; responses carry ``{"quantiles", "rows", "model_version"}`` and a
+(quantiles, rows) body, or ``{"error", "error_type"}``.
+"""
+
+import json
+import logging
+import os
+import queue
+import signal
+import socket
+import struct
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_FRAME = struct.Struct('!II')
+
+# Exceptions a server error is re-raised as on the client
+_ERROR_TYPES = {'ValueError': ValueError, 'FileNotFoundError': FileNotFoundError}
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    """Read exactly size bytes, or None if the peer closed the connection first."""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if count == 0:
+            return None
+        received += count
+    return bytes(buffer)
+
+
+def send_message(sock: socket.socket, header: Dict[str, Any], body: bytes = b''):
+    """Send one framed message."""
+    header_data = json.dumps(header).encode()
+    sock.sendall(_FRAME.pack(len(header_data), len(body)) + header_data + body)
+
+
+def recv_message(sock: socket.socket) -> Optional[Tuple[Dict[str, Any], bytes]]:
+    """Receive one framed message, or None if the connection was closed."""
+    prefix = _recv_exactly(sock, _FRAME.size)
+    if prefix is None:
+        return None
+    header_length, body_length = _FRAME.unpack(prefix)
+    header = _recv_exactly(sock, header_length)
+    body = _recv_exactly(sock, body_length) if body_length else b''
+    if header is None or body is None:
+        return None
+    return json.loads(header), body
+
+
+class _Pending:
+    """A request waiting to be batched."""
+    
+    __slots__ = ('position', 'stat', 'features', 'done', 'result', 'version', 'error')
+    
+    def __init__(self, position: str, stat: str, features: np.ndarray):
+        self.position = position
+        self.stat = stat
+        self.features = features
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, np.ndarray]] = None
+        self.version: Optional[str] = None
+        self.error: Optional[Exception] = None
+
+
+class MicroBatcher:
+    """
+    Collects requests for up to window_ms and predicts each (position, stat)
+    group as one batch on a single thread. Collection ends early once every
+    open connection has a request in the batch.
+    """
+    
+    def __init__(self, service: Any, window_ms: float = 3.0, max_batch_rows: int = 1024):
+        """
+        Initialize the batcher.
+        
+        Args:
+            service: PredictionService whose models run the batches
+            window_ms: How long to wait for more requests after the first one arrives
+            max_batch_rows: Stop collecting once this many rows are waiting
+        """
+        self.service = service
+        self.window = window_ms / 1000
+        self.max_batch_rows = max_batch_rows
+        self._queue: 'queue.Queue[Optional[_Pending]]' = queue.Queue()
+        self._stats = {'requests': 0, 'rows': 0, 'batches': 0, 'model_calls': 0}
+        self._thread: Optional[threading.Thread] = None
+        # Open client connections (kept by the server). Each has at most one request
+        # in flight, so once every connection is in the batch no more can arrive.
+        self.connections = 0
+    
+    def start(self):
+        """Start the batching thread."""
+        self._thread = threading.Thread(target=self._run, name='inference-batcher', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the batching thread after the queued requests are served."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+    
+    def predict(
+        self, position: str, stat: str, features: np.ndarray
+    ) -> Tuple[Dict[str, np.ndarray], Optional[str]]:
+        """
+        Queue a request and wait for its predictions (called from connection threads).
+        
+        Returns:
+            Tuple of (quantile -> predictions, version of the models that made them)
+        """
+        pending = _Pending(position, stat, features)
+        self._queue.put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result, pending.version
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Requests, rows, collection windows and model calls served so far."""
+        return dict(self._stats)
+    
+    def _collect(self, first: _Pending) -> Tuple[List[_Pending], bool]:
+        """Gather requests arriving within the window. Returns (batch, stop requested)."""
+        batch = [first]
+        rows = len(first.features)
+        deadline = time.perf_counter() + self.window
+        
+        while rows < self.max_batch_rows and len(batch) < max(self.connections, 1):
+            timeout = deadline - time.perf_counter()
+            try:
+                pending = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if pending is None:
+                return batch, True
+            batch.append(pending)
+            rows += len(pending.features)
+        
+        return batch, False
+    
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, stop = self._collect(first)
+            self._predict_batch(batch)
+            if stop:
+                return
+    
+    def _predict_batch(self, batch: List[_Pending]):
+        """Run one model call per (position, stat) and hand each request its rows."""
+        groups: Dict[Tuple[str, str], List[_Pending]] = {}
+        for pending in batch:
+            groups.setdefault((pending.position, pending.stat), []).append(pending)
+        
+        self._stats['requests'] += len(batch)
+        self._stats['batches'] += 1
+        
+        # One loader for the whole batch, so a hot reload mid-batch can't mix versions
+        loader = self.service.model_loader
+        version = loader.get_model_version()
+        
+        for (position, stat), pendings in groups.items():
+            try:
+                features = np.concatenate([pending.features for pending in pendings])
+                predictions = self.service.predict_quantiles(position, stat, features, loader=loader)
+                self._stats['model_calls'] += 1
+                self._stats['rows'] += len(features)
+                
+                start = 0
+                for pending in pendings:
+                    end = start + len(pending.features)
+                    pending.result = {quantile: values[start:end] for quantile, values in predictions.items()}
+                    pending.version = version
+                    start = end
+            except Exception as e:
+                for pending in pendings:
+                    pending.error = e
+            finally:
+                for pending in pendings:
+                    pending.done.set()
+
+
+class InferenceServer:
+    """
+    Serves a PredictionService's models over a Unix socket.
+    
+    With processes > 1 the models are loaded once, the socket is bound, and
+    the server forks that many processes accepting on the shared socket;
+    each runs its own micro-batcher and shares the models copy-on-write.
+    
+    Given a registry, each serving process polls its active version and hot
+    reloads on change, as Django does, and every response carries the
+    version of the models that made it.
+    """
+    
+    def __init__(
+        self,
+        service: Any,
+        socket_path: str,
+        window_ms: float = 3.0,
+        max_batch_rows: int = 1024,
+        registry: Optional[Any] = None,
+        registry_poll_seconds: float = 30.0
+    ):
+        """
+        Initialize the server.
+        
+        Args:
+            service: PredictionService with the models to serve
+            socket_path: Path of the Unix socket to listen on
+            window_ms: Micro-batching window (0 batches only requests already queued)
+            max_batch_rows: Maximum rows collected into one batch
+            registry: ModelRegistry to follow, if the models come from one
+            registry_poll_seconds: Seconds between checks of the registry's active version
+        """
+        self.service = service
+        self.socket_path = str(socket_path)
+        self.registry = registry
+        self.registry_poll_seconds = registry_poll_seconds
+        self.batcher = MicroBatcher(service, window_ms=window_ms, max_batch_rows=max_batch_rows)
+        self._sock: Optional[socket.socket] = None
+        self._stopping = threading.Event()
+        self._is_child = False
+        self._connections_lock = threading.Lock()
+    
+    def bind(self):
+        """Create and listen on the socket, replacing a stale socket file."""
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.bind(self.socket_path)
+        self._sock.listen(128)
+        logger.info(f"Inference server listening on {self.socket_path}")
+    
+    def serve_forever(self):
+        """Accept connections and serve them until shutdown() (binds first if needed)."""
+        if self._sock is None:
+            self.bind()
+        self.batcher.start()
+        # Started here rather than in serve(): threads don't survive fork, so
+        # each forked process needs its own watcher
+        if self.registry is not None:
+            self.service.watch_registry(self.registry, interval=self.registry_poll_seconds)
+        
+        try:
+            while not self._stopping.is_set():
+                try:
+                    conn, _ = self._sock.accept()
+                except OSError:
+                    if self._stopping.is_set():
+                        break
+                    raise
+                threading.Thread(
+                    target=self._handle, args=(conn,), name='inference-connection', daemon=True
+                ).start()
+        finally:
+            self.service.stop_watching()
+            self.batcher.stop()
+    
+    def serve(self, processes: int = 1, max_workers: Optional[int] = None):
+        """
+        Load the models and serve from a pool of processes until SIGTERM/SIGINT.
+        
+        Args:
+            processes: Number of server processes sharing the socket
+            max_workers: Threads used to load the models
+        """
+        self.bind()
+        
+        if processes <= 1:
+            self.service.model_loader.preload(max_workers=max_workers)
+            self.serve_forever()
+            return
+        
+        # Load once, then fork; children share the models copy-on-write
+        self.service.prepare_for_fork(max_workers=max_workers)
+        children = []
+        for _ in range(processes):
+            pid = os.fork()
+            if pid == 0:
+                self._is_child = True
+                signal.signal(signal.SIGTERM, lambda *_: self.shutdown())
+                try:
+                    self.serve_forever()
+                finally:
+                    os._exit(0)
+            children.append(pid)
+        logger.info(f"Started {processes} inference server processes: {children}")
+        
+        def stop(signum, frame):
+            for pid in children:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+        
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        for pid in children:
+            os.waitpid(pid, 0)
+        self._close_socket()
+    
+    def shutdown(self):
+        """Stop accepting connections (serve_forever returns)."""
+        self._stopping.set()
+        if self._is_child:
+            # The listening socket is shared with the other processes: only
+            # drop this process's handle (accept() in the main thread then fails)
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
+        else:
+            self._close_socket()
+    
+    def _close_socket(self):
+        """Shut down, close and unlink the listening socket (wakes a blocked accept())."""
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+            self._sock = None
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+    
+    def _parse_request(self, header: Dict[str, Any], body: bytes) -> np.ndarray:
+        """
+        Validate a request before it is queued, so a bad one can't fail its batch.
+        
+        Raises:
+            ValueError: For an unknown model or a feature matrix of the wrong shape
+        """
+        is_valid, error_msg = self.service.validate_position_stat_combination(header['position'], header['stat'])
+        if not is_valid:
+            raise ValueError(error_msg)
+        
+        expected = len(self.service.model_loader.get_feature_columns(header['position'], header['stat']))
+        if header['cols'] != expected or len(body) != header['rows'] * header['cols'] * 8:
+            raise ValueError(
+                f"Expected {expected} features per row for {header['position']}_{header['stat']}, "
+                f"got {header['rows']} x {header['cols']}"
+            )
+        
+        return np.frombuffer(body, dtype=np.float64).reshape(header['rows'], header['cols'])
+    
+    def _handle(self, conn: socket.socket):
+        """Serve requests on one client connection until it closes."""
+        with self._connections_lock:
+            self.batcher.connections += 1
+        try:
+            self._serve_connection(conn)
+        finally:
+            with self._connections_lock:
+                self.batcher.connections -= 1
+    
+    def _serve_connection(self, conn: socket.socket):
+        with conn:
+            while True:
+                try:
+                    message = recv_message(conn)
+                except OSError:
+                    return
+                if message is None:
+                    return
+                
+                header, body = message
+                try:
+                    features = self._parse_request(header, body)
+                    predictions, version = self.batcher.predict(header['position'], header['stat'], features)
+                    quantiles = list(predictions.keys())
+                    values = np.ascontiguousarray([predictions[quantile] for quantile in quantiles], dtype=np.float64)
+                    response = {
+                        'quantiles': quantiles,
+                        'rows': header['rows'],
+                        'model_version': version
+                    }
+                    body = values.tobytes()
+                except Exception as e:
+                    logger.error(f"Inference request failed: {e}")
+                    response, body = {'error': str(e), 'error_type': type(e).__name__}, b''
+                
+                try:
+                    send_message(conn, response, body)
+                except OSError:
+                    return
+
+
+class InferenceClient:
+    """
+    Client for an InferenceServer. Each thread keeps its own connection.
+    """
+    
+    def __init__(self, socket_path: str, timeout: float = 10.0):
+        """
+        Initialize the client.
+        
+        Args:
+            socket_path: Path of the server's Unix socket
+            timeout: Seconds to wait for a response
+        """
+        self.socket_path = str(socket_path)
+        self.timeout = timeout
+        self._local = threading.local()
+    
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, 'sock', None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.sock = sock
+        return sock
+    
+    def close(self):
+        """Close this thread's connection."""
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+    
+    def predict_quantiles(self, position: str, stat: str, features: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Predict every quantile model of a position-stat on the server.
+        
+        Returns:
+            Dictionary mapping quantile -> array of predictions (one per row)
+        """
+        return self.predict_quantiles_with_version(position, stat, features)[0]
+    
+    def predict_quantiles_with_version(
+        self, position: str, stat: str, features: np.ndarray
+    ) -> Tuple[Dict[str, np.ndarray], Optional[str]]:
+        """
+        Predict every quantile model of a position-stat on the server.
+        
+        Args:
+            position: Player position
+            stat: Stat name
+            features: Array of shape (rows, features) in model column order
+        
+        Returns:
+            Tuple of (quantile -> array of predictions, version of the server's
+            models that made them)
+        
+        Raises:
+            ConnectionError: If the server can't be reached
+            ValueError, FileNotFoundError, RuntimeError: If the server rejected the request
+        """
+        features = np.ascontiguousarray(features, dtype=np.float64)
+        if features.ndim == 1:
+            features = features.reshape(1, -1)
+        header = {'position': position, 'stat': stat, 'rows': features.shape[0], 'cols': features.shape[1]}
+        
+        # Retry once on a fresh connection, in case the server restarted since the last request
+        for attempt in range(2):
+            try:
+                sock = self._connection()
+                send_message(sock, header, features.tobytes())
+                message = recv_message(sock)
+                if message is None:
+                    raise ConnectionError('Inference server closed the connection')
+                break
+            except socket.timeout as e:
+                self.close()
+                raise ConnectionError(f"Inference server at {self.socket_path} timed out") from e
+            except OSError as e:
+                self.close()
+                if attempt:
+                    raise ConnectionError(f"Inference server at {self.socket_path} unavailable: {e}") from e
+        
+        response, body = message
+        if 'error' in response:
+            raise _ERROR_TYPES.get(response['error_type'], RuntimeError)(response['error'])
+        
+        values = np.frombuffer(body, dtype=np.float64).reshape(len(response['quantiles']), response['rows'])
+        return dict(zip(response['quantiles'], values)), response.get('model_version')
@@ -0,0 +1,233 @@
+"""
+Single-file, memory-mappable model bundle for ML inference.
+
+models.bundle packs every quantile model (as flattened tree arrays, see
+tree_evaluator) and the feature schemas into one file:
+
+    magic (8 bytes) | header length (uint64, little-endian) | JSON header | arrays
+
+Each array starts on a 64-byte boundary and is used in place through a
+read-only mmap, so worker processes loading the same bundle share its pages
+through the OS page cache instead of each unpickling a private copy. The
+q10/q50/q90 models of a position-stat are stored stacked, ready to be
+evaluated in one pass.
+"""
+
+import io
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+
+try:
+    from .constants import get_model_filename, POSITION_STATS, QUANTILES
+    from .inference_engine import extract_booster
+    from .model_manifest import file_sha256
+    from .tree_evaluator import NumpyTreeModel, TreeEnsemble, TREE_ARRAY_FIELDS
+except ImportError:
+    from constants import get_model_filename, POSITION_STATS, QUANTILES
+    from inference_engine import extract_booster
+    from model_manifest import file_sha256
+    from tree_evaluator import NumpyTreeModel, TreeEnsemble, TREE_ARRAY_FIELDS
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FILENAME = 'models.bundle'
+BUNDLE_MAGIC = b'HYBTREES'
+BUNDLE_FORMAT = 1
+_PREFIX = struct.Struct('<8sQ')
+_ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+class ModelBundle:
+    """
+    A memory-mapped models.bundle file.
+    """
+    
+    def __init__(self, path: Path):
+        """
+        Open and map a bundle.
+        
+        Raises:
+            ValueError: If the file is not a bundle or its format is not supported
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, header_length = _PREFIX.unpack_from(self._mmap, 0)
+        if magic != BUNDLE_MAGIC:
+            raise ValueError(f"{self.path} is not a model bundle")
+        header = json.loads(self._mmap[_PREFIX.size:_PREFIX.size + header_length])
+        if header.get('format') != BUNDLE_FORMAT:
+            raise ValueError(f"Unsupported model bundle format: {header.get('format')}")
+        
+        self.header = header
+        self._data_start = _align(_PREFIX.size + header_length)
+        self.version: str = header['version']
+        self.feature_columns: Dict[str, List[str]] = header['feature_columns']
+        self.feature_columns_sha256: str = header['feature_columns_sha256']
+        self._groups: Dict[str, Dict[str, Any]] = header['groups']
+        self._ensembles: Dict[str, TreeEnsemble] = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def build(cls, models_dir: Path, output: Optional[Path] = None, version: Optional[str] = None) -> Path:
+        """
+        Pack a directory of joblib models into a bundle.
+        
+        Args:
+            models_dir: Directory with the model and feature_columns joblib files
+            output: Bundle path (default: models_dir / models.bundle)
+            version: Version name. Defaults to the training date in the metadata.
+        
+        Returns:
+            Path of the written bundle
+        
+        Raises:
+            ValueError: If a model can't be flattened (see TreeEnsemble.from_booster)
+        """
+        models_dir = Path(models_dir)
+        output = Path(output) if output else models_dir / BUNDLE_FILENAME
+        
+        feature_columns_data = (models_dir / 'feature_columns.joblib').read_bytes()
+        feature_columns = joblib.load(io.BytesIO(feature_columns_data))
+        
+        if version is None:
+            metadata_file = models_dir / 'model_metadata.joblib'
+            metadata = joblib.load(metadata_file) if metadata_file.exists() else {}
+            version = str(metadata.get('training_date', 'unknown'))
+        
+        groups = {}
+        blobs: List[Tuple[int, np.ndarray]] = []
+        offset = 0
+        
+        for position, stats in POSITION_STATS.items():
+            for stat in stats:
+                quantiles, sources, ensembles = [], {}, []
+                for quantile in QUANTILES.keys():
+                    model_path = models_dir / get_model_filename(position, stat, quantile)
+                    if not model_path.exists():
+                        continue
+                    data = model_path.read_bytes()
+                    booster = extract_booster(joblib.load(io.BytesIO(data)))
+                    try:
+                        ensembles.append(TreeEnsemble.from_booster(booster))
+                    except ValueError as e:
+                        raise ValueError(f"{model_path.name}: {e}") from e
+                    quantiles.append(quantile)
+                    sources[quantile] = file_sha256(data)
+                
+                if not ensembles:
+                    continue
+                
+                ensemble = TreeEnsemble.combine(ensembles)
+                arrays = {}
+                for name in TREE_ARRAY_FIELDS:
+                    array = np.ascontiguousarray(getattr(ensemble, name))
+                    offset = _align(offset)
+                    arrays[name] = {
+                        'offset': offset,
+                        'dtype': array.dtype.str,
+                        'shape': list(array.shape)
+                    }
+                    blobs.append((offset, array))
+                    offset += array.nbytes
+                
+                groups[f"{position}_{stat}"] = {
+                    'quantiles': quantiles,
+                    'source_sha256': sources,
+                    'feature_names': ensemble.feature_names,
+                    'arrays': arrays
+                }
+        
+        header = json.dumps({
+            'format': BUNDLE_FORMAT,
+            'version': version,
+            'feature_columns': {key: list(columns) for key, columns in sorted(feature_columns.items())},
+            'feature_columns_sha256': file_sha256(feature_columns_data),
+            'groups': groups
+        }).encode()
+        data_start = _align(_PREFIX.size + len(header))
+        
+        # Write next to the target and rename, so processes mapping the old
+        # bundle keep their (unlinked) file and never see a partial one
+        fd, tmp_path = tempfile.mkstemp(prefix='.bundle-', dir=output.parent)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_PREFIX.pack(BUNDLE_MAGIC, len(header)))
+                f.write(header)
+                for array_offset, array in blobs:
+                    f.seek(data_start + array_offset)
+                    f.write(array.tobytes())
+            os.replace(tmp_path, output)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        
+        logger.info(f"Wrote model bundle {output} ({len(groups)} position-stats)")
+        return output
+    
+    def get_ensemble(self, position: str, stat: str) -> Optional[Tuple[TreeEnsemble, List[str]]]:
+        """
+        Get the stacked ensemble of a position-stat (arrays are views into the map).
+        
+        Returns:
+            Tuple of (ensemble, quantiles in model order), or None if not in the bundle
+        """
+        key = f"{position}_{stat}"
+        group = self._groups.get(key)
+        if group is None:
+            return None
+        
+        ensemble = self._ensembles.get(key)
+        if ensemble is None:
+            with self._lock:
+                ensemble = self._ensembles.get(key)
+                if ensemble is None:
+                    ensemble = self._ensembles[key] = self._map_ensemble(group)
+        return ensemble, group['quantiles']
+    
+    def _map_ensemble(self, group: Dict[str, Any]) -> TreeEnsemble:
+        """Build a TreeEnsemble over the bundle's arrays without copying them."""
+        arrays = {}
+        for name, spec in group['arrays'].items():
+            dtype = np.dtype(spec['dtype'])
+            count = int(np.prod(spec['shape']))
+            arrays[name] = np.frombuffer(
+                self._mmap, dtype=dtype, count=count, offset=self._data_start + spec['offset']
+            ).reshape(spec['shape'])
+        return TreeEnsemble(feature_names=group['feature_names'], **arrays)
+    
+    def get_model(self, position: str, stat: str, quantile: str) -> Optional[NumpyTreeModel]:
+        """Get one quantile model, or None if it is not in the bundle."""
+        found = self.get_ensemble(position, stat)
+        if found is None or quantile not in found[1]:
+            return None
+        ensemble, quantiles = found
+        return NumpyTreeModel(ensemble, quantiles.index(quantile))
+    
+    def source_sha256(self, position: str, stat: str, quantile: str) -> Optional[str]:
+        """Checksum of the joblib file a model was built from."""
+        group = self._groups.get(f"{position}_{stat}")
+        return group['source_sha256'].get(quantile) if group else None
+    
+    def model_keys(self) -> List[str]:
+        """Keys (position_stat_quantile) of every model in the bundle."""
+        return [
+            f"{key}_{quantile}"
+            for key, group in self._groups.items()
+            for quantile in group['quantiles']
+        ]
@@ -0,0 +1,145 @@
+"""
+Model cache for ML inference.
+Keeps loaded models in memory under an optional byte budget so small
+worker processes can cap their footprint without dropping hot models.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_POLICIES = ('lru', 'lfu')
+
+
+class ModelCache:
+    """
+    Byte-budgeted model cache with LRU or LFU eviction.
+    
+    Each entry is accounted at the size of its model file. When the total
+    exceeds the budget, entries are evicted until it fits again:
+    - lru: least recently used first
+    - lfu: fewest hits first (ties broken by least recently used)
+    
+    The entry being inserted is never evicted, so a model larger than the
+    whole budget is still served for the request that loaded it.
+    """
+    
+    def __init__(self, max_bytes: int = 0, policy: str = 'lru'):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_bytes: Byte budget for cached models. 0 means unlimited.
+            policy: Eviction policy, 'lru' or 'lfu'
+        
+        Raises:
+            ValueError: If policy is not supported
+        """
+        policy = policy.lower()
+        if policy not in CACHE_POLICIES:
+            raise ValueError(
+                f"Invalid cache policy '{policy}'. Must be one of {list(CACHE_POLICIES)}"
+            )
+        
+        self.max_bytes = max(0, int(max_bytes))
+        self.policy = policy
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._frequency: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached model for a key, or None on a miss."""
+        with self._lock:
+            model = self._entries.get(key)
+            if model is None:
+                self._misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self._frequency[key] += 1
+            self._hits += 1
+            return model
+    
+    def peek(self, key: str) -> Optional[Any]:
+        """Return the cached model for a key without touching recency or counters."""
+        with self._lock:
+            return self._entries.get(key)
+    
+    def put(self, key: str, model: Any, size_bytes: int):
+        """
+        Store a model, evicting others if the byte budget is exceeded.
+        
+        Args:
+            key: Model cache key (position_stat_quantile)
+            model: Loaded model
+            size_bytes: Size accounted for this entry
+        """
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._sizes[key]
+            else:
+                self._frequency[key] = 0
+            
+            self._entries[key] = model
+            self._entries.move_to_end(key)
+            self._sizes[key] = int(size_bytes)
+            self._total_bytes += int(size_bytes)
+            
+            if self.max_bytes:
+                while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                    self._evict(exclude=key)
+    
+    def _evict(self, exclude: str):
+        """Evict one entry according to the policy. Caller holds the lock."""
+        candidates = [key for key in self._entries if key != exclude]
+        
+        if self.policy == 'lfu':
+            # min() keeps the first minimum, i.e. the least recently used among ties
+            victim = min(candidates, key=lambda key: self._frequency[key])
+        else:
+            victim = candidates[0]
+        
+        del self._entries[victim]
+        self._total_bytes -= self._sizes.pop(victim)
+        self._frequency.pop(victim)
+        self._evictions += 1
+        logger.info(f"Evicted model '{victim}' from cache ({self.policy})")
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def keys(self) -> List[str]:
+        """Cached keys, least recently used first."""
+        with self._lock:
+            return list(self._entries.keys())
+    
+    def clear(self):
+        """Remove all entries. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._frequency.clear()
+            self._total_bytes = 0
+    
+    def get_info(self) -> Dict[str, Any]:
+        """Get size accounting and hit/miss/eviction counters."""
+        with self._lock:
+            return {
+                'policy': self.policy,
+                'max_bytes': self.max_bytes,
+                'total_bytes': self._total_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions
+            }
@@ -3,18 +3,36 @@ Model Loader for ML inference service.
 Implements lazy loading to avoid loading all 56 models at startup.
 """
 
+import io
 import joblib
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
 
 try:
-    from .constants import get_model_filename, VALID_POSITIONS, QUANTILES
+    from .constants import get_model_filename, VALID_POSITIONS, QUANTILES, POSITION_STATS
+    from .feature_engineering import FeaturePlan
+    from .model_cache import ModelCache
+    from .model_manifest import ModelManifest, feature_schema_hash, file_sha256
+    from .inference_engine import BoosterPredictor, ThreadingPolicy, extract_booster
+    from .tree_evaluator import NumpyTreeModel, TreeEnsemble, TREE_ARRAYS_DIR
+    from .model_bundle import ModelBundle, BUNDLE_FILENAME
 except ImportError:
-    from constants import get_model_filename, VALID_POSITIONS, QUANTILES
+    from constants import get_model_filename, VALID_POSITIONS, QUANTILES, POSITION_STATS
+    from feature_engineering import FeaturePlan
+    from model_cache import ModelCache
+    from model_manifest import ModelManifest, feature_schema_hash, file_sha256
+    from inference_engine import BoosterPredictor, ThreadingPolicy, extract_booster
+    from tree_evaluator import NumpyTreeModel, TreeEnsemble, TREE_ARRAYS_DIR
+    from model_bundle import ModelBundle, BUNDLE_FILENAME
 
 logger = logging.getLogger(__name__)
 
+INFERENCE_BACKENDS = ('lightgbm', 'numpy')
+
 
 class ModelLoader:
     """
@@ -22,61 +40,152 @@ class ModelLoader:
     Uses lazy loading - models are only loaded when first requested.
     """
     
-    def __init__(self, models_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        models_dir: Optional[Path] = None,
+        cache_max_bytes: int = 0,
+        cache_policy: str = 'lru',
+        version: Optional[str] = None,
+        threading_policy: Optional[ThreadingPolicy] = None,
+        inference_backend: str = 'lightgbm',
+        load_models: bool = True
+    ):
         """
         Initialize the model loader.
         
         Args:
             models_dir: Path to directory containing model files.
                        If None, uses the same directory as this file.
+            cache_max_bytes: Byte budget for loaded models (0 means unlimited)
+            cache_policy: Eviction policy when over budget, 'lru' or 'lfu'
+            version: Registry version name of the models in models_dir, if any
+            threading_policy: LightGBM threading policy for the loaded models
+            inference_backend: 'lightgbm' to predict with the Boosters, or 'numpy'
+                               to predict with flattened tree arrays (see tree_evaluator)
+            load_models: False for a process that only prepares features (a client of
+                         the inference server): models are never loaded, and feature
+                         plans are validated against the manifest's schema hashes
         """
+        if inference_backend not in INFERENCE_BACKENDS:
+            raise ValueError(
+                f"Invalid inference backend '{inference_backend}'. Must be one of {INFERENCE_BACKENDS}"
+            )
+        
         if models_dir is None:
             models_dir = Path(__file__).parent
         
         self.models_dir = Path(models_dir)
-        self._model_cache: Dict[str, Any] = {}
+        self.version = version
+        self.threading_policy = threading_policy or ThreadingPolicy()
+        self.inference_backend = inference_backend
+        self.load_models = load_models
+        self._model_cache = ModelCache(max_bytes=cache_max_bytes, policy=cache_policy)
+        self._feature_plans: Dict[str, FeaturePlan] = {}
+        self._load_stats: Dict[str, Dict[str, float]] = {}
+        self._preload_state = 'idle'  # idle -> loading -> ready | failed
+        self._preload_info: Dict[str, Any] = {}
         self._feature_columns: Optional[Dict] = None
         self._model_metadata: Optional[Dict] = None
+        self._bundle: Optional[ModelBundle] = None
+        self._bundle_checked = False
+        
+        # Manifest of the bundle's models (None for bundles without one), so
+        # model discovery doesn't probe the filesystem on every request
+        self._manifest = ModelManifest.load(self.models_dir)
+        if self._manifest is None:
+            logger.warning(
+                f"No model manifest in {self.models_dir}; falling back to filesystem checks. "
+                f"Generate one with: python manage.py build_model_manifest"
+            )
+        
+        # Single-flight loading: one lock per cache key, so concurrent cold
+        # requests for the same model wait for one load instead of racing
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._key_locks_guard = threading.Lock()
         
         logger.info(f"ModelLoader initialized with models_dir: {self.models_dir}")
     
+    def _key_lock(self, key: str) -> threading.Lock:
+        """Get the lock guarding loads for a cache key, creating it on first use."""
+        with self._key_locks_guard:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+    
     def _load_feature_columns(self) -> Dict:
         """
         Load feature columns mapping from disk.
         This is critical for ensuring features are in the correct order.
         """
         if self._feature_columns is None:
-            feature_file = self.models_dir / "feature_columns.joblib"
-            
-            if not feature_file.exists():
-                raise FileNotFoundError(
-                    f"Feature columns file not found: {feature_file}"
-                )
-            
-            try:
-                self._feature_columns = joblib.load(feature_file)
-                logger.info("Feature columns loaded successfully")
-            except Exception as e:
-                logger.error(f"Error loading feature columns: {e}")
-                raise
+            with self._key_lock('feature_columns'):
+                if self._feature_columns is None:
+                    bundle = self._get_bundle()
+                    if bundle is not None and (
+                        self._manifest is None
+                        or bundle.feature_columns_sha256 == self._manifest.data['feature_columns']['sha256']
+                    ):
+                        self._feature_columns = bundle.feature_columns
+                        return self._feature_columns
+                    
+                    feature_file = self.models_dir / "feature_columns.joblib"
+                    
+                    if not feature_file.exists():
+                        raise FileNotFoundError(
+                            f"Feature columns file not found: {feature_file}"
+                        )
+                    
+                    try:
+                        data = feature_file.read_bytes()
+                        if self._manifest is not None:
+                            self._manifest.verify_file(
+                                feature_file.name, self._manifest.data['feature_columns'], data
+                            )
+                        self._feature_columns = joblib.load(io.BytesIO(data))
+                        logger.info("Feature columns loaded successfully")
+                    except Exception as e:
+                        logger.error(f"Error loading feature columns: {e}")
+                        raise
         
         return self._feature_columns
     
+    def _get_bundle(self) -> Optional[ModelBundle]:
+        """
+        Map models.bundle for the numpy backend, if the bundle directory has one.
+        Opened once; returns None for the lightgbm backend or when there is no bundle.
+        """
+        if not self._bundle_checked:
+            with self._key_lock('bundle'):
+                if not self._bundle_checked:
+                    bundle_file = self.models_dir / BUNDLE_FILENAME
+                    if self.inference_backend == 'numpy' and bundle_file.exists():
+                        try:
+                            self._bundle = ModelBundle(bundle_file)
+                            logger.info(f"Mapped model bundle {bundle_file}")
+                        except (OSError, ValueError) as e:
+                            logger.warning(f"Ignoring model bundle {bundle_file}: {e}")
+                    self._bundle_checked = True
+        
+        return self._bundle
+    
     def _load_model_metadata(self) -> Dict:
         """Load model metadata from disk."""
         if self._model_metadata is None:
-            metadata_file = self.models_dir / "model_metadata.joblib"
-            
-            if not metadata_file.exists():
-                logger.warning(f"Model metadata file not found: {metadata_file}")
-                return {}
-            
-            try:
-                self._model_metadata = joblib.load(metadata_file)
-                logger.info("Model metadata loaded successfully")
-            except Exception as e:
-                logger.warning(f"Error loading model metadata: {e}")
-                self._model_metadata = {}
+            with self._key_lock('model_metadata'):
+                if self._model_metadata is None:
+                    metadata_file = self.models_dir / "model_metadata.joblib"
+                    
+                    if not metadata_file.exists():
+                        logger.warning(f"Model metadata file not found: {metadata_file}")
+                        return {}
+                    
+                    try:
+                        self._model_metadata = joblib.load(metadata_file)
+                        logger.info("Model metadata loaded successfully")
+                    except Exception as e:
+                        logger.warning(f"Error loading model metadata: {e}")
+                        self._model_metadata = {}
         
         return self._model_metadata
     
@@ -108,37 +217,133 @@ class ModelLoader:
                 f"Invalid quantile '{quantile}'. Must be one of {list(QUANTILES.keys())}"
             )
         
+        if not self.load_models:
+            raise RuntimeError(
+                f"Models are not loaded in this process (load_models=False); "
+                f"'{position}_{stat}_{quantile}' is served by the inference server"
+            )
+        
         # Create cache key
         cache_key = f"{position}_{stat}_{quantile}"
         
         # Check cache first
-        if cache_key in self._model_cache:
+        model = self._model_cache.get(cache_key)
+        if model is not None:
             logger.debug(f"Model '{cache_key}' loaded from cache")
-            model = self._model_cache[cache_key]
         else:
-            # Load model from disk
-            model_filename = get_model_filename(position, stat, quantile)
-            model_path = self.models_dir / model_filename
-            
-            if not model_path.exists():
-                raise FileNotFoundError(
-                    f"Model file not found: {model_path}. "
-                    f"Position '{position}' may not have a model for stat '{stat}'."
-                )
-            
-            try:
-                model = joblib.load(model_path)
-                self._model_cache[cache_key] = model
-                logger.info(f"Model '{cache_key}' loaded from disk")
-            except Exception as e:
-                logger.error(f"Error loading model '{cache_key}': {e}")
-                raise
+            with self._key_lock(cache_key):
+                # Another thread may have loaded it while we waited for the lock
+                model = self._model_cache.peek(cache_key)
+                if model is None:
+                    model = self._load_model(cache_key, position, stat, quantile)
+                else:
+                    logger.debug(f"Model '{cache_key}' loaded by a concurrent request")
         
         # Get feature columns for this model
         feature_columns = self.get_feature_columns(position, stat)
         
         return model, feature_columns
     
+    def _load_model(self, cache_key: str, position: str, stat: str, quantile: str) -> Any:
+        """Load a model from disk into the cache. Caller holds the key's lock."""
+        model_filename = get_model_filename(position, stat, quantile)
+        model_path = self.models_dir / model_filename
+        entry = None
+        
+        # The manifest, when present, is the authoritative list of models
+        if self._manifest is not None:
+            entry = self._manifest.get_entry(cache_key)
+            missing = entry is None
+        else:
+            missing = not model_path.exists()
+        
+        if missing:
+            raise FileNotFoundError(
+                f"Model file not found: {model_path}. "
+                f"Position '{position}' may not have a model for stat '{stat}'."
+            )
+        
+        try:
+            start = time.perf_counter()
+            if self.inference_backend == 'numpy':
+                model, size_bytes = self._load_tree_model(position, stat, quantile, model_filename, entry)
+            else:
+                data = model_path.read_bytes()
+                if entry is not None:
+                    self._manifest.verify_file(model_filename, entry, data)
+                # Keep only the Booster, wrapped for array inference
+                model = BoosterPredictor(
+                    joblib.load(io.BytesIO(data)),
+                    single_row_threads=self.threading_policy.single_row_threads,
+                    fast_single_row=self.threading_policy.fast_single_row
+                )
+                size_bytes = len(data)
+            if entry is not None:
+                self._manifest.verify_schema(cache_key, model)
+            load_time_ms = (time.perf_counter() - start) * 1000
+            self._model_cache.put(cache_key, model, size_bytes)
+            self._load_stats[cache_key] = {
+                'load_time_ms': round(load_time_ms, 2),
+                'size_bytes': size_bytes
+            }
+            logger.info(f"Model '{cache_key}' loaded from disk in {load_time_ms:.1f}ms")
+        except Exception as e:
+            logger.error(f"Error loading model '{cache_key}': {e}")
+            raise
+        
+        return model
+    
+    def _load_tree_model(
+        self,
+        position: str,
+        stat: str,
+        quantile: str,
+        model_filename: str,
+        entry: Optional[Dict[str, Any]]
+    ) -> Tuple[NumpyTreeModel, int]:
+        """
+        Load a model for the NumPy backend.
+        
+        Sources, cheapest first, each used only if it was built from the
+        current model file: the memory-mapped models.bundle
+        (``manage.py build_model_bundle``), the per-model tree arrays
+        (``manage.py export_tree_arrays``), and finally the Booster itself,
+        flattened in-process.
+        
+        Returns:
+            Tuple of (model, size in bytes)
+        """
+        cache_key = f"{position}_{stat}_{quantile}"
+        
+        bundle = self._get_bundle()
+        if bundle is not None:
+            model = bundle.get_model(position, stat, quantile)
+            if model is not None and (
+                entry is None or bundle.source_sha256(position, stat, quantile) == entry['sha256']
+            ):
+                # Mapped pages are shared between processes; count this model's share
+                return model, model.ensemble.nbytes // model.ensemble.num_models
+            logger.warning(f"'{cache_key}' is missing or stale in {bundle.path}; loading it separately")
+        
+        arrays_path = self.models_dir / TREE_ARRAYS_DIR / f"{cache_key}.npz"
+        if arrays_path.exists():
+            ensemble = TreeEnsemble.load(arrays_path)
+            if entry is None or ensemble.source_sha256 == entry['sha256']:
+                return NumpyTreeModel(ensemble), ensemble.nbytes
+            logger.warning(
+                f"Tree arrays for '{cache_key}' were exported from a different model file; "
+                f"rebuilding from {model_filename}"
+            )
+        
+        data = (self.models_dir / model_filename).read_bytes()
+        if entry is not None:
+            self._manifest.verify_file(model_filename, entry, data)
+        ensemble = TreeEnsemble.from_booster(
+            extract_booster(joblib.load(io.BytesIO(data))),
+            source_sha256=file_sha256(data)
+        )
+        return NumpyTreeModel(ensemble), ensemble.nbytes
+    
     def get_feature_columns(self, position: str, stat: str) -> list:
         """
         Get the required feature columns for a specific model.
@@ -162,6 +367,67 @@ class ModelLoader:
         
         return feature_cols[model_key]
     
+    def get_feature_plan(self, position: str, stat: str) -> FeaturePlan:
+        """
+        Get the compiled feature plan for a position-stat combination.
+        
+        The plan is compiled once, when the models are first loaded, and
+        checked against the feature names stored in every quantile model so
+        a retrained model with a different column layout fails loudly
+        instead of silently receiving misaligned features.
+        
+        Args:
+            position: Player position (QB, RB, WR, TE)
+            stat: Stat name (e.g., 'passing_yards')
+        
+        Returns:
+            FeaturePlan for the model
+        
+        Raises:
+            ValueError: If a model's features don't match feature_columns.joblib
+        """
+        model_key = f"{position}_{stat}"
+        
+        plan = self._feature_plans.get(model_key)
+        if plan is None:
+            with self._key_lock(f"plan:{model_key}"):
+                plan = self._feature_plans.get(model_key)
+                if plan is None:
+                    plan = self._compile_feature_plan(position, stat)
+        
+        return plan
+    
+    def _compile_feature_plan(self, position: str, stat: str) -> FeaturePlan:
+        """Compile and validate a feature plan. Caller holds the plan's lock."""
+        model_key = f"{position}_{stat}"
+        
+        feature_columns = self.get_feature_columns(position, stat)
+        plan = FeaturePlan.compile(
+            position, stat, feature_columns, POSITION_STATS.get(position, [])
+        )
+        
+        if self.load_models:
+            for quantile, (model, _) in self.get_all_quantile_models(position, stat).items():
+                if hasattr(model, 'feature_name'):
+                    try:
+                        plan.validate(model.feature_name())
+                    except ValueError as e:
+                        raise ValueError(f"Model '{model_key}_{quantile}': {e}") from e
+        elif self._manifest is not None:
+            # The manifest records each model's feature-schema hash
+            schema_hash = feature_schema_hash(plan.feature_columns)
+            for quantile in QUANTILES.keys():
+                entry = self._manifest.get_entry(f"{model_key}_{quantile}")
+                if entry and entry['feature_schema_hash'] and entry['feature_schema_hash'] != schema_hash:
+                    raise ValueError(
+                        f"Model '{model_key}_{quantile}': feature schema does not match feature_columns.joblib"
+                    )
+        
+        self._feature_plans[model_key] = plan
+        logger.info(f"Feature plan compiled for '{model_key}' ({len(feature_columns)} features)")
+        
+        return plan
+    
     def get_all_quantile_models(self, position: str, stat: str) -> Dict[str, Tuple[Any, list]]:
         """
         Load all three quantile models (q10, q50, q90) for a position-stat combination.
@@ -197,6 +463,9 @@ class ModelLoader:
         Returns:
             True if at least one quantile model exists, False otherwise
         """
+        if self._manifest is not None:
+            return self._manifest.has_model(position, stat)
+        
         for quantile in QUANTILES.keys():
             model_filename = get_model_filename(position, stat, quantile)
             model_path = self.models_dir / model_filename
@@ -205,19 +474,156 @@ class ModelLoader:
         
         return False
     
+    def available_models(self) -> List[Tuple[str, str, str]]:
+        """
+        List the (position, stat, quantile) models in the bundle.
+        Read from the manifest when there is one, else found by checking files.
+        """
+        if self._manifest is not None:
+            return [
+                (entry['position'], entry['stat'], entry['quantile'])
+                for entry in self._manifest.models.values()
+            ]
+        
+        return [
+            (position, stat, quantile)
+            for position, stats in POSITION_STATS.items()
+            for stat in stats
+            for quantile in QUANTILES.keys()
+            if (self.models_dir / get_model_filename(position, stat, quantile)).exists()
+        ]
+    
+    def get_manifest(self) -> Optional[ModelManifest]:
+        """Get the bundle's manifest, or None if it has none."""
+        return self._manifest
+    
+    def preload(self, max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Load every available quantile model up front, from a thread pool.
+        
+        Also compiles each position-stat feature plan, so the first request
+        for every model is served from memory.
+        
+        Args:
+            max_workers: Number of loader threads (None uses the executor default)
+        
+        Returns:
+            Preload report (see get_preload_info)
+        """
+        self._preload_state = 'loading'
+        start = time.perf_counter()
+        
+        # Shared files are loaded once here rather than raced by the workers
+        self._load_feature_columns()
+        self._load_model_metadata()
+        
+        combos = self.available_models() if self.load_models else []
+        errors = {}
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='model-preload') as executor:
+            futures = {executor.submit(self.get_model, *combo): combo for combo in combos}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    model_key = '_'.join(futures[future])
+                    errors[model_key] = str(e)
+                    logger.error(f"Error preloading model '{model_key}': {e}")
+        
+        models_loaded = len(combos) - len(errors)
+        
+        for position, stat in sorted({(position, stat) for position, stat, _ in self.available_models()}):
+            try:
+                self.get_feature_plan(position, stat)
+            except Exception as e:
+                errors[f"{position}_{stat}"] = str(e)
+                logger.error(f"Error compiling feature plan for '{position}_{stat}': {e}")
+        
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._preload_info = {
+            'elapsed_ms': round(elapsed_ms, 2),
+            'models_loaded': models_loaded,
+            'errors': errors
+        }
+        self._preload_state = 'failed' if errors else 'ready'
+        
+        info = self.get_preload_info()
+        if self._model_cache.max_bytes and info['total_bytes'] > self._model_cache.max_bytes:
+            logger.warning(
+                f"Preloaded models ({info['total_bytes']} bytes) exceed the model cache budget "
+                f"({self._model_cache.max_bytes} bytes); {self._model_cache.get_info()['evictions']} evicted"
+            )
+        logger.info(
+            f"Preloaded {info['models_loaded']} models ({info['total_bytes'] / 1024:.0f} KB) "
+            f"in {elapsed_ms:.0f}ms, state: {self._preload_state}"
+        )
+        return info
+    
+    def preload_in_background(self, max_workers: Optional[int] = None) -> threading.Thread:
+        """
+        Run preload() on a daemon thread so startup isn't blocked.
+        
+        Returns:
+            The started thread
+        """
+        self._preload_state = 'loading'
+        thread = threading.Thread(
+            target=self.preload,
+            kwargs={'max_workers': max_workers},
+            name='model-preload',
+            daemon=True
+        )
+        thread.start()
+        return thread
+    
+    @property
+    def is_ready(self) -> bool:
+        """True once preload() has loaded every model without errors."""
+        return self._preload_state == 'ready'
+    
+    def get_preload_info(self) -> Dict[str, Any]:
+        """Get preload state plus per-model load time and file size."""
+        models = dict(self._load_stats)
+        return {
+            'state': self._preload_state,
+            'models_loaded': self._preload_info.get('models_loaded', 0),
+            'elapsed_ms': self._preload_info.get('elapsed_ms'),
+            'total_bytes': sum(stats['size_bytes'] for stats in models.values()),
+            'errors': self._preload_info.get('errors', {}),
+            'models': models
+        }
+    
     def get_metadata(self) -> Dict:
         """Get model training metadata."""
         return self._load_model_metadata()
     
+    def get_model_version(self) -> str:
+        """
+        Get an identifier for the loaded set of models.
+        Uses the registry version if there is one, else the training date
+        from the model metadata.
+        """
+        if self.version:
+            return self.version
+        return str(self._load_model_metadata().get('training_date', 'unknown'))
+    
     def clear_cache(self):
         """Clear the model cache to free memory."""
         self._model_cache.clear()
+        self._feature_plans.clear()
+        self._load_stats.clear()
+        self._preload_state = 'idle'
+        self._bundle = None
+        self._bundle_checked = False
         logger.info("Model cache cleared")
     
     def get_cache_info(self) -> Dict:
         """Get information about currently cached models."""
         return {
-            'cached_models': list(self._model_cache.keys()),
-            'cache_size': len(self._model_cache)
+            'cached_models': self._model_cache.keys(),
+            'cache_size': len(self._model_cache),
+            'inference_backend': self.inference_backend,
+            'bundle': str(self._bundle.path) if self._bundle is not None else None,
+            **self._model_cache.get_info()
         }
 
@@ -0,0 +1,212 @@
+"""
+Model bundle manifest for ML inference.
+
+manifest.json is generated once per model version and lists every
+available (position, stat, quantile) model with its file size, SHA-256
+checksum and feature-schema hash. ModelLoader reads it at startup so model
+discovery is a dictionary lookup, and rejects files that don't match it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import joblib
+
+try:
+    from .constants import get_model_filename, POSITION_STATS, QUANTILES
+except ImportError:
+    from constants import get_model_filename, POSITION_STATS, QUANTILES
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = 'manifest.json'
+MANIFEST_FORMAT = 1
+
+
+def file_sha256(data: bytes) -> str:
+    """SHA-256 hex digest of file contents."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def feature_schema_hash(feature_columns: List[str]) -> str:
+    """Hash of an ordered list of feature names."""
+    return hashlib.sha256(json.dumps(list(feature_columns)).encode()).hexdigest()
+
+
+class ModelManifest:
+    """
+    Index of the models in one model bundle.
+    """
+    
+    def __init__(self, data: Dict[str, Any]):
+        """
+        Initialize from parsed manifest.json contents.
+        
+        Raises:
+            ValueError: If the manifest format is not supported
+        """
+        if data.get('format') != MANIFEST_FORMAT:
+            raise ValueError(f"Unsupported model manifest format: {data.get('format')}")
+        
+        self.data = data
+        self.version: str = data['version']
+        self.models: Dict[str, Dict[str, Any]] = data['models']
+        self.feature_schemas: Dict[str, str] = data['feature_schemas']
+        self._position_stats = {
+            (entry['position'], entry['stat']) for entry in self.models.values()
+        }
+    
+    @classmethod
+    def build(cls, models_dir: Path, version: Optional[str] = None) -> 'ModelManifest':
+        """
+        Build a manifest by scanning a model bundle.
+        
+        Args:
+            models_dir: Directory with the model, feature_columns and model_metadata joblib files
+            version: Version name. Defaults to the training date in the metadata.
+        
+        Returns:
+            ModelManifest for the bundle
+        """
+        models_dir = Path(models_dir)
+        
+        feature_columns_data = (models_dir / 'feature_columns.joblib').read_bytes()
+        feature_columns = joblib.load(models_dir / 'feature_columns.joblib')
+        
+        if version is None:
+            metadata_file = models_dir / 'model_metadata.joblib'
+            metadata = joblib.load(metadata_file) if metadata_file.exists() else {}
+            version = str(metadata.get('training_date', 'unknown'))
+        
+        models = {}
+        for position, stats in POSITION_STATS.items():
+            for stat in stats:
+                for quantile in QUANTILES.keys():
+                    filename = get_model_filename(position, stat, quantile)
+                    model_path = models_dir / filename
+                    if not model_path.exists():
+                        continue
+                    
+                    data = model_path.read_bytes()
+                    model = joblib.load(model_path)
+                    schema = model.feature_name() if hasattr(model, 'feature_name') else None
+                    
+                    models[f"{position}_{stat}_{quantile}"] = {
+                        'position': position,
+                        'stat': stat,
+                        'quantile': quantile,
+                        'file': filename,
+                        'size_bytes': len(data),
+                        'sha256': file_sha256(data),
+                        'feature_schema_hash': feature_schema_hash(schema) if schema else None
+                    }
+        
+        return cls({
+            'format': MANIFEST_FORMAT,
+            'version': version,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'feature_columns': {
+                'file': 'feature_columns.joblib',
+                'size_bytes': len(feature_columns_data),
+                'sha256': file_sha256(feature_columns_data)
+            },
+            'feature_schemas': {
+                model_key: feature_schema_hash(columns)
+                for model_key, columns in sorted(feature_columns.items())
+            },
+            'models': models
+        })
+    
+    @classmethod
+    def load(cls, models_dir: Path) -> Optional['ModelManifest']:
+        """
+        Load manifest.json from a model bundle.
+        
+        Returns:
+            ModelManifest, or None if the bundle has no manifest
+        """
+        manifest_file = Path(models_dir) / MANIFEST_FILENAME
+        
+        try:
+            with open(manifest_file) as f:
+                return cls(json.load(f))
+        except FileNotFoundError:
+            return None
+    
+    def write(self, models_dir: Path) -> Path:
+        """Write manifest.json into a model bundle, replacing any existing one atomically."""
+        models_dir = Path(models_dir)
+        manifest_file = models_dir / MANIFEST_FILENAME
+        
+        fd, tmp_path = tempfile.mkstemp(prefix='.manifest-', dir=models_dir)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+            f.write('\n')
+        os.replace(tmp_path, manifest_file)
+        
+        return manifest_file
+    
+    def differences(self, other: 'ModelManifest') -> List[str]:
+        """
+        Compare the file entries of two manifests (created_at and version are ignored).
+        
+        Returns:
+            Names of the files and feature schemas that differ, empty if none
+        """
+        differences = []
+        if self.data['feature_columns'] != other.data['feature_columns']:
+            differences.append(self.data['feature_columns']['file'])
+        for model_key in sorted(set(self.models) | set(other.models)):
+            ours, theirs = self.models.get(model_key), other.models.get(model_key)
+            if ours != theirs:
+                differences.append((ours or theirs)['file'])
+        for model_key in sorted(set(self.feature_schemas) | set(other.feature_schemas)):
+            if self.feature_schemas.get(model_key) != other.feature_schemas.get(model_key):
+                differences.append(f"{model_key} feature schema")
+        return differences
+    
+    def has_model(self, position: str, stat: str) -> bool:
+        """True if at least one quantile model exists for a position-stat combination."""
+        return (position, stat) in self._position_stats
+    
+    def get_entry(self, model_key: str) -> Optional[Dict[str, Any]]:
+        """Get the entry for a model (position_stat_quantile), or None if not in the bundle."""
+        return self.models.get(model_key)
+    
+    def verify_file(self, name: str, entry: Dict[str, Any], data: bytes):
+        """
+        Check file contents against their manifest entry.
+        
+        Raises:
+            ValueError: If the size or checksum doesn't match
+        """
+        if len(data) != entry['size_bytes'] or file_sha256(data) != entry['sha256']:
+            raise ValueError(
+                f"'{name}' does not match the model manifest (expected {entry['size_bytes']} bytes, "
+                f"sha256 {entry['sha256'][:12]}...; got {len(data)} bytes, "
+                f"sha256 {file_sha256(data)[:12]}...). The file is corrupted or was replaced "
+                f"without regenerating {MANIFEST_FILENAME}."
+            )
+    
+    def verify_schema(self, model_key: str, model: Any):
+        """
+        Check a loaded model's feature names against the bundle's feature columns.
+        
+        Raises:
+            ValueError: If the model was trained on a different feature schema
+        """
+        entry = self.models[model_key]
+        expected = self.feature_schemas.get(f"{entry['position']}_{entry['stat']}")
+        
+        if hasattr(model, 'feature_name'):
+            actual = feature_schema_hash(model.feature_name())
+            if actual != entry['feature_schema_hash'] or actual != expected:
+                raise ValueError(
+                    f"Model '{model_key}' feature schema does not match feature_columns.joblib"
+                )
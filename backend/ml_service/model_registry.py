@@ -0,0 +1,189 @@
+"""
+Versioned model registry for ML inference.
+
+Layout:
+    <root>/
+        CURRENT                 # name of the active version
+        versions/
+            <version>/
+                {POSITION}_{STAT}_q{QUANTILE}.joblib
+                feature_columns.joblib
+                model_metadata.joblib
+                manifest.json           # sizes, checksums, feature-schema hashes
+
+Versions are published into a temporary directory and renamed into place,
+and CURRENT is replaced atomically, so readers never see a partial version.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import joblib
+
+try:
+    from .model_manifest import ModelManifest
+except ImportError:
+    from model_manifest import ModelManifest
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_FILES = ('feature_columns.joblib', 'model_metadata.joblib')
+
+
+class ModelRegistry:
+    """
+    Directory of versioned model bundles with an active-version pointer.
+    """
+    
+    def __init__(self, root: Path):
+        """
+        Initialize the registry.
+        
+        Args:
+            root: Registry root directory (created on first publish)
+        """
+        self.root = Path(root)
+        self.versions_dir = self.root / 'versions'
+        self.current_file = self.root / 'CURRENT'
+    
+    def list_versions(self) -> List[str]:
+        """List published versions, oldest name first."""
+        if not self.versions_dir.exists():
+            return []
+        return sorted(
+            path.name for path in self.versions_dir.iterdir()
+            if path.is_dir() and not path.name.startswith('.')
+        )
+    
+    def get_current_version(self) -> Optional[str]:
+        """Get the active version name, or None if nothing has been activated."""
+        try:
+            version = self.current_file.read_text().strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+    
+    def version_dir(self, version: str) -> Path:
+        """
+        Get the directory for a published version.
+        
+        Raises:
+            FileNotFoundError: If the version doesn't exist
+        """
+        path = self.versions_dir / version
+        # Dot-prefixed directories are publishes still being staged
+        if not version or version.startswith('.') or path.parent != self.versions_dir or not path.is_dir():
+            raise FileNotFoundError(
+                f"Model version '{version}' not found in registry {self.root}. "
+                f"Available versions: {self.list_versions()}"
+            )
+        return path
+    
+    def active_models(self) -> Tuple[Optional[Path], Optional[str]]:
+        """
+        Get the (models_dir, version) to serve: the active version, or
+        (None, None) for the bundled models.
+        
+        Falls back to the bundled models when nothing is active or CURRENT
+        names a version that isn't in the registry, so a bad pointer logs an
+        error instead of stopping whatever is starting up.
+        """
+        version = self.get_current_version()
+        if version is None:
+            return None, None
+        
+        try:
+            return self.version_dir(version), version
+        except FileNotFoundError as e:
+            logger.error(f"{e} Serving the bundled models instead.")
+            return None, None
+    
+    def current_dir(self) -> Path:
+        """
+        Get the directory of the active version.
+        
+        Raises:
+            FileNotFoundError: If no version is active
+        """
+        version = self.get_current_version()
+        if version is None:
+            raise FileNotFoundError(f"No active model version in registry {self.root}")
+        return self.version_dir(version)
+    
+    def publish(self, source_dir: Path, version: Optional[str] = None, activate: bool = True) -> str:
+        """
+        Copy a model bundle into the registry as a new version.
+        
+        Args:
+            source_dir: Directory with the model, feature column and metadata joblib files
+            version: Version name. Defaults to the training date in the metadata.
+            activate: Whether to make it the active version
+        
+        Returns:
+            The published version name
+        
+        Raises:
+            FileNotFoundError: If required files are missing from source_dir
+            ValueError: If the version already exists
+        """
+        source_dir = Path(source_dir)
+        for filename in REQUIRED_FILES:
+            if not (source_dir / filename).exists():
+                raise FileNotFoundError(f"{filename} not found in {source_dir}")
+        
+        if version is None:
+            version = self._default_version(source_dir)
+        
+        target = self.versions_dir / version
+        if target.exists():
+            raise ValueError(f"Model version '{version}' already exists in registry {self.root}")
+        
+        # Build the version next to its final location, then rename it into place
+        self.versions_dir.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f'.{version}-', dir=self.versions_dir))
+        try:
+            for path in sorted(source_dir.glob('*.joblib')):
+                shutil.copy2(path, staging / path.name)
+            ModelManifest.build(staging, version=version).write(staging)
+            os.replace(staging, target)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        
+        logger.info(f"Published model version '{version}' to {target}")
+        
+        if activate:
+            self.activate(version)
+        
+        return version
+    
+    def activate(self, version: str):
+        """
+        Make a published version the active one.
+        
+        Raises:
+            FileNotFoundError: If the version has no directory in the registry
+        """
+        # Refuse before touching CURRENT, so it never names a missing version
+        self.version_dir(version)
+        
+        fd, tmp_path = tempfile.mkstemp(prefix='.CURRENT-', dir=self.root)
+        with os.fdopen(fd, 'w') as f:
+            f.write(version + '\n')
+        os.replace(tmp_path, self.current_file)
+        
+        logger.info(f"Activated model version '{version}'")
+    
+    @staticmethod
+    def _default_version(source_dir: Path) -> str:
+        """Version name from the bundle's training date, falling back to now."""
+        try:
+            training_date = joblib.load(source_dir / 'model_metadata.joblib').get('training_date')
+            return datetime.fromisoformat(str(training_date)).strftime('%Y%m%d-%H%M%S')
+        except Exception:
+            return datetime.now().strftime('%Y%m%d-%H%M%S')
@@ -0,0 +1,118 @@
+"""
+Quantile prediction cache for ML inference.
+Stores q10/q50/q90 outputs so repeat requests at a different line skip
+feature engineering and the models.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, Any
+
+logger = logging.getLogger(__name__)
+
+
+class QuantileCache:
+    """
+    Size-bounded LRU cache of quantile predictions.
+    
+    Quantile outputs depend only on the player's features, never on the
+    betting threshold or bet type, so a single entry serves every line
+    for the same player, stat and week.
+    """
+    
+    def __init__(self, max_size: int = 2048):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of entries to keep. 0 disables caching.
+        """
+        self.max_size = max(0, int(max_size))
+        self._entries: "OrderedDict[Tuple, Dict[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+    
+    @staticmethod
+    def make_key(
+        player_id: str,
+        position: str,
+        stat_name: str,
+        season: int,
+        week: int,
+        model_version: str,
+        team_stats: Optional[Dict[str, float]] = None,
+        is_playoff: bool = False
+    ) -> Tuple:
+        """
+        Build a cache key for a player's quantile predictions.
+        
+        Args:
+            player_id: Player identifier
+            position: Player position
+            stat_name: Stat name
+            season: Season being predicted
+            week: Week being predicted
+            model_version: Version of the loaded models
+            team_stats: Team context passed to feature engineering
+            is_playoff: Whether this is a playoff game
+        
+        Returns:
+            Hashable cache key
+        """
+        team_stats_hash = hash(tuple(sorted(team_stats.items()))) if team_stats else None
+        return (
+            player_id, position, stat_name, int(season), int(week),
+            model_version, team_stats_hash, bool(is_playoff)
+        )
+    
+    def get(self, key: Tuple) -> Optional[Dict[str, float]]:
+        """Return cached predictions for a key, or None on a miss."""
+        if self.max_size == 0:
+            return None
+        
+        with self._lock:
+            predictions = self._entries.get(key)
+            if predictions is None:
+                self._misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return dict(predictions)
+    
+    def set(self, key: Tuple, predictions: Dict[str, float]):
+        """Store predictions for a key, evicting the least recently used entry if full."""
+        if self.max_size == 0:
+            return
+        
+        with self._lock:
+            self._entries[key] = dict(predictions)
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_size:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self._evictions += 1
+                logger.debug(f"Evicted quantile cache entry {evicted_key}")
+    
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+        logger.info("Quantile cache cleared")
+    
+    def get_info(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss/eviction counters."""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions
+            }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
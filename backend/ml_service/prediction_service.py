@@ -3,15 +3,21 @@ Prediction Service for ML inference.
 Main entry point for making betting predictions.
 """
 
+import gc
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, Optional, List, Any
+import threading
+from pathlib import Path
+from typing import Dict, Optional, List, Any, Tuple, Union
 from dataclasses import dataclass
 
 try:
     from .model_loader import ModelLoader
-    from .feature_engineering import FeatureEngineer
+    from .feature_engineering import FeatureEngineer, RollingFeatures
+    from .prediction_cache import QuantileCache
+    from .model_registry import ModelRegistry
+    from .inference_engine import InferenceEngine, ThreadingPolicy
     from .constants import (
         ACTION_TO_STAT, 
         POSITION_STATS, 
@@ -22,7 +28,10 @@ try:
     )
 except ImportError:
     from model_loader import ModelLoader
-    from feature_engineering import FeatureEngineer
+    from feature_engineering import FeatureEngineer, RollingFeatures
+    from prediction_cache import QuantileCache
+    from model_registry import ModelRegistry
+    from inference_engine import InferenceEngine, ThreadingPolicy
     from constants import (
         ACTION_TO_STAT, 
         POSITION_STATS, 
@@ -51,23 +60,268 @@ class PredictionResult:
     details: Dict[str, Any]
 
 
+@dataclass
+class PredictionCurve:
+    """Container for threshold analysis across a range of lines."""
+    position: str
+    stat_name: str
+    stat_display_name: str
+    predictions: Dict[str, float]  # quantile -> predicted value
+    bet_type: str  # 'over' or 'under'
+    confidence_level: str  # 'Low', 'Medium', 'High'
+    points: List[Dict[str, Any]]  # one analysis dict per threshold
+    details: Dict[str, Any]
+
+
+@dataclass
+class BetRequest:
+    """A single bet submitted to PredictionService.predict_many()."""
+    position: str
+    stat_name: str
+    player_history: Union[pd.DataFrame, RollingFeatures]
+    current_season: int
+    current_week: int
+    threshold: float
+    bet_type: str  # 'over' or 'under'
+    is_playoff: bool = False
+    team_stats: Optional[Dict[str, float]] = None
+    player_id: Optional[str] = None
+
+
 class PredictionService:
     """
     Main service for making player prop predictions.
     Orchestrates model loading, feature engineering, and prediction.
     """
     
-    def __init__(self, models_dir: Optional[str] = None):
+    def __init__(
+        self,
+        models_dir: Optional[str] = None,
+        cache_size: int = 2048,
+        model_cache_bytes: int = 0,
+        model_cache_policy: str = 'lru',
+        model_version: Optional[str] = None,
+        threading_policy: Optional[ThreadingPolicy] = None,
+        inference_backend: str = 'lightgbm',
+        inference_client: Optional[Any] = None
+    ):
         """
         Initialize the prediction service.
         
         Args:
             models_dir: Path to directory containing model files
+            cache_size: Maximum number of cached quantile predictions (0 disables the cache)
+            model_cache_bytes: Byte budget for loaded models (0 means unlimited)
+            model_cache_policy: Model eviction policy when over budget, 'lru' or 'lfu'
+            model_version: Registry version name of the models in models_dir, if any
+            threading_policy: LightGBM threads for single-row vs batch predictions
+            inference_backend: 'lightgbm' or 'numpy' (flattened tree arrays)
+            inference_client: InferenceClient of an inference server. When given,
+                              model predictions run on the server and this process
+                              only prepares features (its loader never loads models)
         """
-        self.model_loader = ModelLoader(models_dir)
+        threading_policy = threading_policy or ThreadingPolicy()
+        self._loader_options = {
+            'cache_max_bytes': model_cache_bytes,
+            'cache_policy': model_cache_policy,
+            'threading_policy': threading_policy,
+            'inference_backend': inference_backend,
+            'load_models': inference_client is None
+        }
+        # Requests take a reference to the current loader and use it throughout,
+        # so reload_models() can swap this attribute while they finish
+        self.model_loader = ModelLoader(models_dir, version=model_version, **self._loader_options)
         self.feature_engineer = FeatureEngineer()
+        self.inference_engine = InferenceEngine(threading_policy)
+        self.inference_client = inference_client
+        self.quantile_cache = QuantileCache(max_size=cache_size)
+        self._reload_lock = threading.Lock()
+        self._failed_versions = set()
+        self._watcher_stop: Optional[threading.Event] = None
         logger.info("PredictionService initialized")
     
+    def _cache_key(
+        self,
+        player_id: Optional[str],
+        position: str,
+        stat_name: str,
+        current_season: int,
+        current_week: int,
+        is_playoff: bool,
+        team_stats: Optional[Dict[str, float]],
+        loader: ModelLoader
+    ) -> Optional[tuple]:
+        """Build the quantile cache key for a prediction, or None if it can't be cached."""
+        if player_id is None:
+            return None
+        
+        return QuantileCache.make_key(
+            player_id=player_id,
+            position=position,
+            stat_name=stat_name,
+            season=current_season,
+            week=current_week,
+            model_version=loader.get_model_version(),
+            team_stats=team_stats,
+            is_playoff=is_playoff
+        )
+    
+    def reload_models(
+        self,
+        models_dir: Path,
+        version: Optional[str] = None,
+        preload: bool = True
+    ) -> bool:
+        """
+        Load a new set of models and swap them in without a restart.
+        
+        The new ModelLoader is built (and preloaded) while the current one
+        keeps serving; the swap is a single attribute assignment, so
+        in-flight requests finish on the loader they started with. Cached
+        quantile predictions are keyed by model version, so the new models
+        never serve stale entries.
+        
+        Args:
+            models_dir: Directory of the new model bundle
+            version: Version name of the new models
+            preload: Load every model before swapping (recommended)
+        
+        Returns:
+            True if the new models were swapped in, False if they failed to load
+        """
+        with self._reload_lock:
+            logger.info(f"Loading model version '{version}' from {models_dir}")
+            loader = ModelLoader(models_dir, version=version, **self._loader_options)
+            
+            if preload:
+                loader.preload()
+                if not loader.is_ready:
+                    logger.error(
+                        f"Model version '{version}' failed to load, keeping "
+                        f"'{self.model_loader.get_model_version()}': {loader.get_preload_info()['errors']}"
+                    )
+                    self._failed_versions.add(version)
+                    return False
+            
+            previous = self.model_loader.get_model_version()
+            self.model_loader = loader
+            logger.info(f"Swapped models from version '{previous}' to '{loader.get_model_version()}'")
+            return True
+    
+    def reload_in_background(
+        self,
+        models_dir: Path,
+        version: Optional[str] = None,
+        preload: bool = True
+    ) -> threading.Thread:
+        """Run reload_models() on a daemon thread."""
+        thread = threading.Thread(
+            target=self.reload_models,
+            args=(models_dir, version, preload),
+            name='model-reload',
+            daemon=True
+        )
+        thread.start()
+        return thread
+    
+    def prepare_for_fork(self, max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Load every model and feature plan in a WSGI master before it forks workers.
+        
+        Workers forked afterwards (gunicorn ``preload_app``) share the loaded
+        models copy-on-write instead of each loading its own copy. Model data
+        lives in LightGBM's native memory or NumPy buffers, which worker
+        refcounting never writes to; the remaining Python objects are moved to
+        the permanent GC generation (gc.freeze) so collections in the workers
+        don't dirty their pages either.
+        
+        No LightGBM prediction runs here: a process that has started OpenMP
+        threads must not fork, or multi-threaded predictions in the children hang.
+        
+        Args:
+            max_workers: Number of loader threads
+        
+        Returns:
+            Preload report (see ModelLoader.get_preload_info)
+        """
+        loader = self.model_loader
+        info = loader.preload(max_workers=max_workers)
+        
+        combos = loader.available_models() if loader.load_models else []
+        for position, stat in sorted({(position, stat) for position, stat, _ in combos}):
+            try:
+                self.inference_engine.warm(loader.get_all_quantile_models(position, stat))
+            except Exception as e:
+                logger.error(f"Error warming '{position}_{stat}' before fork: {e}")
+        
+        gc.collect()
+        gc.freeze()
+        logger.info(
+            f"Prepared {info['models_loaded']} models for forked workers "
+            f"({gc.get_freeze_count()} objects frozen)"
+        )
+        return info
+    
+    def check_registry(self, registry: ModelRegistry) -> bool:
+        """
+        Reload if the registry's active version differs from the loaded one.
+        
+        Returns:
+            True if a new version was swapped in
+        """
+        version = registry.get_current_version()
+        if (
+            version is None
+            or version == self.model_loader.version
+            or version in self._failed_versions
+        ):
+            return False
+        
+        try:
+            models_dir = registry.version_dir(version)
+        except FileNotFoundError as e:
+            logger.error(str(e))
+            self._failed_versions.add(version)
+            return False
+        
+        return self.reload_models(models_dir, version=version)
+    
+    def watch_registry(self, registry: ModelRegistry, interval: float = 30.0) -> threading.Thread:
+        """
+        Poll the registry's active version on a daemon thread and hot reload on change.
+        
+        Args:
+            registry: ModelRegistry to watch
+            interval: Seconds between checks
+        
+        Returns:
+            The watcher thread (stop it with stop_watching())
+        """
+        self.stop_watching()
+        stop = self._watcher_stop = threading.Event()
+        
+        def watch():
+            while not stop.wait(interval):
+                try:
+                    self.check_registry(registry)
+                except Exception as e:
+                    logger.error(f"Error checking model registry: {e}")
+        
+        thread = threading.Thread(target=watch, name='model-registry-watcher', daemon=True)
+        thread.start()
+        logger.info(f"Watching model registry {registry.root} every {interval}s")
+        return thread
+    
+    def stop_watching(self):
+        """Stop the registry watcher, if one is running."""
+        if self._watcher_stop is not None:
+            self._watcher_stop.set()
+            self._watcher_stop = None
+    
+    def clear_prediction_cache(self):
+        """Drop all cached quantile predictions."""
+        self.quantile_cache.clear()
+    
     def validate_position_stat_combination(
         self, 
         position: str, 
@@ -106,13 +360,14 @@ class PredictionService:
         self,
         position: str,
         stat_name: str,
-        player_history: pd.DataFrame,
+        player_history: Union[pd.DataFrame, RollingFeatures],
         current_season: int,
         current_week: int,
         threshold: float,
         bet_type: str,
         is_playoff: bool = False,
-        team_stats: Optional[Dict[str, float]] = None
+        team_stats: Optional[Dict[str, float]] = None,
+        player_id: Optional[str] = None
     ) -> PredictionResult:
         """
         Make a prediction for a player prop bet.
@@ -120,13 +375,19 @@ class PredictionService:
         Args:
             position: Player position (QB, RB, WR, TE)
             stat_name: Stat to predict (e.g., 'passing_yards')
-            player_history: DataFrame with player's recent game history
+            player_history: DataFrame with player's recent game history, or
+                            the player's precomputed RollingFeatures
             current_season: Current season year
             current_week: Current week number
             threshold: Betting threshold (e.g., 250.5 yards)
             bet_type: 'over' or 'under'
             is_playoff: Whether this is a playoff game
             team_stats: Optional team statistics
+            player_id: Optional player identifier. When given, the quantile
+                      predictions are cached, so repeat requests for the same
+                      player and stat at a different threshold skip feature
+                      engineering and the models. Only pass it when
+                      player_history is the player's standard recent history.
         
         Returns:
             PredictionResult object with predictions and analysis
@@ -144,47 +405,448 @@ class PredictionService:
         
         logger.info(f"Making prediction for {position}_{stat_name}, threshold={threshold}, bet_type={bet_type}")
         
-        # Prepare features
-        stat_cols = POSITION_STATS[position]
-        features_df = self.feature_engineer.prepare_inference_features(
+        predictions = self._get_quantile_predictions(
+            position=position,
+            stat_name=stat_name,
             player_history=player_history,
+            current_season=current_season,
+            current_week=current_week,
+            is_playoff=is_playoff,
+            team_stats=team_stats,
+            player_id=player_id
+        )
+        
+        return self._build_result(
+            position=position,
+            stat_name=stat_name,
+            predictions=predictions,
+            threshold=threshold,
+            bet_type=bet_type,
+            games_analyzed=len(player_history),
+            current_season=current_season,
+            current_week=current_week,
+            is_playoff=is_playoff
+        )
+    
+    def _get_quantile_predictions(
+        self,
+        position: str,
+        stat_name: str,
+        player_history: Union[pd.DataFrame, RollingFeatures],
+        current_season: int,
+        current_week: int,
+        is_playoff: bool,
+        team_stats: Optional[Dict[str, float]],
+        player_id: Optional[str]
+    ) -> Dict[str, float]:
+        """
+        Get q10/q50/q90 predictions for one player, using the quantile cache when possible.
+        
+        Returns:
+            Dictionary mapping quantile -> predicted value
+        """
+        loader = self.model_loader
+        
+        # Quantiles don't depend on the threshold, so reuse them when we can
+        cache_key = self._cache_key(
+            player_id, position, stat_name, current_season, current_week, is_playoff, team_stats, loader
+        )
+        predictions = self.quantile_cache.get(cache_key) if cache_key else None
+        
+        if predictions is not None:
+            logger.debug(f"Quantile predictions for {position}_{stat_name} served from cache")
+        else:
+            # Prepare features (one vector, in model column order)
+            features = self.feature_engineer.fill_features(
+                plan=loader.get_feature_plan(position, stat_name),
+                player_history=player_history,
+                current_season=current_season,
+                current_week=current_week,
+                is_playoff=is_playoff,
+                team_stats=team_stats
+            )
+            
+            # Make predictions with each quantile model
+            quantile_preds, version = self._predict_quantiles_with_version(
+                position, stat_name, features.reshape(1, -1), loader
+            )
+            predictions = {
+                quantile: float(values[0]) for quantile, values in quantile_preds.items()
+            }
+            for quantile, pred in predictions.items():
+                logger.debug(f"Prediction {quantile}: {pred:.2f}")
+            
+            if cache_key and self._is_cacheable(version, loader):
+                self.quantile_cache.set(cache_key, predictions)
+        
+        return predictions
+    
+    def predict_many(self, bets: List[BetRequest]) -> List[PredictionResult]:
+        """
+        Make predictions for many bets at once.
+        
+        Bets are grouped by (position, stat) so that each group builds a
+        single feature matrix and calls every quantile model once, instead
+        of three single-row model calls per bet.
+        
+        Args:
+            bets: List of BetRequest objects
+        
+        Returns:
+            List of PredictionResult objects, in the same order as ``bets``
+        
+        Raises:
+            ValueError: If any bet has an invalid position/stat or bet_type
+        """
+        # Validate everything up front so a bad bet fails before any model work
+        for index, bet in enumerate(bets):
+            if bet.bet_type not in ['over', 'under']:
+                raise ValueError(
+                    f"Bet {index}: Invalid bet_type '{bet.bet_type}'. Must be 'over' or 'under'"
+                )
+        
+        all_predictions = self.predict_quantiles_many(bets)
+        
+        return [
+            self._build_result(
+                position=bet.position,
+                stat_name=bet.stat_name,
+                predictions=predictions,
+                threshold=bet.threshold,
+                bet_type=bet.bet_type,
+                games_analyzed=len(bet.player_history),
+                current_season=bet.current_season,
+                current_week=bet.current_week,
+                is_playoff=bet.is_playoff
+            )
+            for bet, predictions in zip(bets, all_predictions)
+        ]
+    
+    def predict_quantiles_many(self, bets: List[BetRequest]) -> List[Dict[str, float]]:
+        """
+        Get q10/q50/q90 predictions for many bets, batched by (position, stat).
+        
+        Only the player and model fields of each BetRequest are used; the
+        threshold and bet_type are ignored.
+        
+        Args:
+            bets: List of BetRequest objects
+        
+        Returns:
+            List of dictionaries mapping quantile -> predicted value, in the
+            same order as ``bets``
+        
+        Raises:
+            ValueError: If any bet has an invalid position/stat
+        """
+        for index, bet in enumerate(bets):
+            is_valid, error_msg = self.validate_position_stat_combination(
+                bet.position, bet.stat_name
+            )
+            if not is_valid:
+                raise ValueError(f"Bet {index}: {error_msg}")
+        
+        loader = self.model_loader
+        
+        # Serve cached quantiles first; group the remaining bets by model
+        results: List[Optional[Dict[str, float]]] = [None] * len(bets)
+        cache_keys: Dict[int, tuple] = {}
+        groups: Dict[tuple, List[int]] = {}
+        for index, bet in enumerate(bets):
+            cache_key = self._cache_key(
+                bet.player_id, bet.position, bet.stat_name,
+                bet.current_season, bet.current_week, bet.is_playoff, bet.team_stats, loader
+            )
+            if cache_key:
+                cache_keys[index] = cache_key
+                predictions = self.quantile_cache.get(cache_key)
+                if predictions is not None:
+                    results[index] = predictions
+                    continue
+            groups.setdefault((bet.position, bet.stat_name), []).append(index)
+        
+        logger.info(
+            f"Making batched predictions for {len(bets)} bets in {len(groups)} model groups "
+            f"({len(bets) - sum(len(indices) for indices in groups.values())} served from cache)"
+        )
+        
+        for (position, stat_name), indices in groups.items():
+            plan = loader.get_feature_plan(position, stat_name)
+            
+            # One feature row per bet, filled in place in a preallocated matrix
+            features = np.empty((len(indices), len(plan.feature_columns)), dtype=np.float64)
+            for row, i in enumerate(indices):
+                self.feature_engineer.fill_features(
+                    plan=plan,
+                    player_history=bets[i].player_history,
+                    current_season=bets[i].current_season,
+                    current_week=bets[i].current_week,
+                    is_playoff=bets[i].is_playoff,
+                    team_stats=bets[i].team_stats,
+                    out=features[row]
+                )
+            
+            quantile_preds, version = self._predict_quantiles_with_version(position, stat_name, features, loader)
+            cacheable = self._is_cacheable(version, loader)
+            
+            for row, i in enumerate(indices):
+                predictions = {
+                    quantile: float(values[row]) for quantile, values in quantile_preds.items()
+                }
+                if cacheable and i in cache_keys:
+                    self.quantile_cache.set(cache_keys[i], predictions)
+                results[i] = predictions
+        
+        return results
+    
+    def analyze_quantiles(
+        self,
+        position: str,
+        stat_name: str,
+        predictions: Dict[str, float],
+        threshold: float,
+        bet_type: str,
+        games_analyzed: int,
+        current_season: int,
+        current_week: int,
+        is_playoff: bool = False
+    ) -> PredictionResult:
+        """
+        Analyze a bet against quantile predictions made earlier (e.g. precomputed
+        projections), without running the models.
+        
+        Args:
+            position: Player position (QB, RB, WR, TE)
+            stat_name: Stat the predictions are for
+            predictions: Dictionary mapping quantile -> predicted value
+            threshold: Betting threshold
+            bet_type: 'over' or 'under'
+            games_analyzed: Number of games the predictions were made from
+            current_season: Season predicted for
+            current_week: Week predicted for
+            is_playoff: Whether this is a playoff game
+        
+        Returns:
+            PredictionResult object
+        
+        Raises:
+            ValueError: If bet_type is invalid
+        """
+        if bet_type not in ['over', 'under']:
+            raise ValueError(f"Invalid bet_type '{bet_type}'. Must be 'over' or 'under'")
+        
+        return self._build_result(
             position=position,
-            stat_cols=stat_cols,
+            stat_name=stat_name,
+            predictions=predictions,
+            threshold=threshold,
+            bet_type=bet_type,
+            games_analyzed=games_analyzed,
+            current_season=current_season,
+            current_week=current_week,
+            is_playoff=is_playoff
+        )
+    
+    def predict_curve(
+        self,
+        position: str,
+        stat_name: str,
+        player_history: Union[pd.DataFrame, RollingFeatures],
+        current_season: int,
+        current_week: int,
+        thresholds: List[float],
+        bet_type: str,
+        is_playoff: bool = False,
+        team_stats: Optional[Dict[str, float]] = None,
+        player_id: Optional[str] = None
+    ) -> PredictionCurve:
+        """
+        Analyze a whole range of betting lines for one player prop.
+        
+        The models run once; the threshold analysis is vectorized over
+        every line.
+        
+        Args:
+            position: Player position (QB, RB, WR, TE)
+            stat_name: Stat to predict (e.g., 'passing_yards')
+            player_history: DataFrame with player's recent game history, or
+                            the player's precomputed RollingFeatures
+            current_season: Current season year
+            current_week: Current week number
+            thresholds: Betting thresholds to analyze
+            bet_type: 'over' or 'under'
+            is_playoff: Whether this is a playoff game
+            team_stats: Optional team statistics
+            player_id: Optional player identifier, enables the quantile cache
+        
+        Returns:
+            PredictionCurve with one analysis point per threshold
+        
+        Raises:
+            ValueError: If position/stat combination or bet_type is invalid
+        """
+        is_valid, error_msg = self.validate_position_stat_combination(position, stat_name)
+        if not is_valid:
+            raise ValueError(error_msg)
+        
+        if bet_type not in ['over', 'under']:
+            raise ValueError(f"Invalid bet_type '{bet_type}'. Must be 'over' or 'under'")
+        
+        logger.info(f"Making prediction curve for {position}_{stat_name}, {len(thresholds)} thresholds, bet_type={bet_type}")
+        
+        predictions = self._get_quantile_predictions(
+            position=position,
+            stat_name=stat_name,
+            player_history=player_history,
             current_season=current_season,
             current_week=current_week,
             is_playoff=is_playoff,
-            team_stats=team_stats
+            team_stats=team_stats,
+            player_id=player_id
+        )
+        
+        analysis = self._analyze_thresholds(
+            predictions=predictions,
+            thresholds=np.asarray(thresholds, dtype=float),
+            bet_type=bet_type
         )
         
-        # Load all quantile models
-        models = self.model_loader.get_all_quantile_models(position, stat_name)
+        points = [
+            {
+                'threshold': float(threshold),
+                'win_probability': round(float(win_prob), 3),
+                'expected_value': round(float(expected_value), 3),
+                'recommendation': str(recommendation),
+                'distance_from_median': round(float(distance), 2)
+            }
+            for threshold, win_prob, expected_value, recommendation, distance in zip(
+                analysis['thresholds'],
+                analysis['win_probability'],
+                analysis['expected_value'],
+                analysis['recommendation'],
+                analysis['distance_from_median']
+            )
+        ]
+        
+        return PredictionCurve(
+            position=position,
+            stat_name=stat_name,
+            stat_display_name=STAT_DISPLAY_NAMES.get(stat_name, stat_name),
+            predictions=predictions,
+            bet_type=bet_type,
+            confidence_level=analysis['confidence_level'],
+            points=points,
+            details={
+                'player_games_analyzed': len(player_history),
+                'current_season': current_season,
+                'current_week': current_week,
+                'is_playoff': is_playoff,
+                'stat_unit': STAT_UNITS.get(stat_name, ''),
+                'prediction_spread': round(analysis['prediction_spread'], 2),
+                'relative_spread': round(analysis['relative_spread'], 3)
+            }
+        )
+    
+    def predict_quantiles(
+        self,
+        position: str,
+        stat_name: str,
+        features: np.ndarray,
+        loader: Optional[ModelLoader] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Run every quantile model for a position-stat over a feature matrix.
+        
+        Args:
+            position: Player position
+            stat_name: Stat name
+            features: Array of shape (rows, features) in model column order
+            loader: ModelLoader to predict with (defaults to the current one)
+        
+        Returns:
+            Dictionary mapping quantile -> array of predictions (one per row)
+        """
+        return self._predict_quantiles(position, stat_name, features, loader)
+    
+    def _predict_quantiles(
+        self,
+        position: str,
+        stat_name: str,
+        features: np.ndarray,
+        loader: Optional[ModelLoader] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Run every quantile model for a position-stat over a feature matrix.
+        
+        Args:
+            position: Player position
+            stat_name: Stat name
+            features: Array of shape (rows, features) in model column order
+            loader: ModelLoader the request started with (defaults to the current one)
+        
+        Returns:
+            Dictionary mapping quantile -> array of predictions (one per row)
+        """
+        return self._predict_quantiles_with_version(position, stat_name, features, loader)[0]
+    
+    def _predict_quantiles_with_version(
+        self,
+        position: str,
+        stat_name: str,
+        features: np.ndarray,
+        loader: Optional[ModelLoader] = None
+    ) -> Tuple[Dict[str, np.ndarray], Optional[str]]:
+        """
+        Run every quantile model for a position-stat over a feature matrix.
+        
+        Returns:
+            Tuple of (quantile -> array of predictions, version of the models
+            that made them). With an inference server that is the version the
+            server reports, which lags this process's loader until both have
+            seen a newly activated version.
+        """
+        if self.inference_client is not None:
+            return self.inference_client.predict_quantiles_with_version(position, stat_name, features)
+        
+        loader = loader or self.model_loader
+        models = loader.get_all_quantile_models(position, stat_name)
         
         if not models:
             raise RuntimeError(f"Failed to load any models for {position}_{stat_name}")
         
-        # Make predictions with each quantile model
-        predictions = {}
-        for quantile, (model, required_features) in models.items():
-            # Align features to model requirements
-            aligned_features = self.feature_engineer.align_features(
-                features_df,
-                required_features
-            )
-            
-            # Make prediction
-            pred = model.predict(aligned_features)[0]
-            predictions[quantile] = float(pred)
-            logger.debug(f"Prediction {quantile}: {pred:.2f}")
+        return self.inference_engine.predict_quantiles(models, features), loader.get_model_version()
+    
+    def _is_cacheable(self, version: Optional[str], loader: ModelLoader) -> bool:
+        """Whether predictions made by the given model version can be cached under loader's version."""
+        if version == loader.get_model_version():
+            return True
         
-        # Calculate win probability and analysis
+        logger.info(
+            f"Not caching predictions from model version '{version}' "
+            f"while serving '{loader.get_model_version()}'"
+        )
+        return False
+    
+    def _build_result(
+        self,
+        position: str,
+        stat_name: str,
+        predictions: Dict[str, float],
+        threshold: float,
+        bet_type: str,
+        games_analyzed: int,
+        current_season: int,
+        current_week: int,
+        is_playoff: bool
+    ) -> PredictionResult:
+        """Run the threshold analysis and package it as a PredictionResult."""
         analysis = self._analyze_prediction(
             predictions=predictions,
             threshold=threshold,
             bet_type=bet_type
         )
         
-        # Create result
-        result = PredictionResult(
+        return PredictionResult(
             position=position,
             stat_name=stat_name,
             stat_display_name=STAT_DISPLAY_NAMES.get(stat_name, stat_name),
@@ -196,7 +858,7 @@ class PredictionService:
             expected_value=analysis['expected_value'],
             recommendation=analysis['recommendation'],
             details={
-                'player_games_analyzed': len(player_history),
+                'player_games_analyzed': games_analyzed,
                 'current_season': current_season,
                 'current_week': current_week,
                 'is_playoff': is_playoff,
@@ -204,8 +866,6 @@ class PredictionService:
                 **analysis
             }
         )
-        
-        return result
     
     def _analyze_prediction(
         self,
@@ -328,6 +988,81 @@ class PredictionService:
             'distance_from_median': round(abs(threshold - q50), 2)
         }
     
+    def _analyze_thresholds(
+        self,
+        predictions: Dict[str, float],
+        thresholds: np.ndarray,
+        bet_type: str
+    ) -> Dict[str, Any]:
+        """
+        Vectorized version of _analyze_prediction over an array of thresholds.
+        
+        Uses the same piecewise interpolation, clamping and recommendation
+        rules, evaluated with NumPy across every threshold at once. Values
+        are returned unrounded.
+        
+        Args:
+            predictions: Dictionary of quantile predictions
+            thresholds: Array of betting thresholds
+            bet_type: 'over' or 'under'
+        
+        Returns:
+            Dictionary of per-threshold arrays plus the (threshold independent)
+            confidence level and spread
+        """
+        q10 = predictions.get('q10', 0)
+        q50 = predictions.get('q50', 0)
+        q90 = predictions.get('q90', 0)
+        t = np.asarray(thresholds, dtype=float)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if bet_type == 'over':
+                win_prob = np.select(
+                    [t < q10, t > q90, t > q50],
+                    [0.95, 0.05, 0.50 - ((t - q50) / (q90 - q50 + 0.001)) * 0.40],
+                    default=0.90 - ((t - q10) / (q50 - q10 + 0.001)) * 0.40
+                )
+            else:  # under
+                win_prob = np.select(
+                    [t > q90, t < q10, t < q50],
+                    [0.95, 0.05, 0.50 - ((q50 - t) / (q50 - q10 + 0.001)) * 0.40],
+                    default=0.90 - ((q90 - t) / (q90 - q50 + 0.001)) * 0.40
+                )
+        
+        # Clamp probability between 0.05 and 0.95
+        win_prob = np.clip(win_prob, 0.05, 0.95)
+        
+        # Confidence depends only on the prediction spread
+        spread = q90 - q10
+        relative_spread = spread / (q50 + 1)
+        
+        if relative_spread < 0.3:
+            confidence = 'High'
+            cutoffs = (0.55, 0.45, 0.35)
+        elif relative_spread < 0.6:
+            confidence = 'Medium'
+            cutoffs = (0.60, 0.50, 0.40)
+        else:
+            confidence = 'Low'
+            cutoffs = (0.75, 0.65, 0.55)
+        
+        recommendation = np.select(
+            [win_prob >= cutoffs[0], win_prob >= cutoffs[1], win_prob >= cutoffs[2]],
+            ['Good Bet', 'Fair Bet', 'Risky Bet'],
+            default='Poor Bet'
+        )
+        
+        return {
+            'thresholds': t,
+            'win_probability': win_prob,
+            'expected_value': 2 * win_prob - 1,
+            'recommendation': recommendation,
+            'distance_from_median': np.abs(t - q50),
+            'confidence_level': confidence,
+            'prediction_spread': spread,
+            'relative_spread': relative_spread
+        }
+    
     def predict_from_betting_scenario(
         self,
         player_name: str,
@@ -336,11 +1071,12 @@ class PredictionService:
         action: str,
         bet_type: str,
         action_amount: float,
-        player_history: pd.DataFrame,
+        player_history: Union[pd.DataFrame, RollingFeatures],
         current_season: int = 2025,
         current_week: int = 1,
         is_playoff: bool = False,
-        team_stats: Optional[Dict[str, float]] = None
+        team_stats: Optional[Dict[str, float]] = None,
+        player_id: Optional[str] = None
     ) -> PredictionResult:
         """
         Make a prediction from a betting scenario (as submitted by frontend).
@@ -352,11 +1088,12 @@ class PredictionService:
             action: Action display name (e.g., 'Passing Yards')
             bet_type: 'over' or 'under'
             action_amount: Threshold value
-            player_history: Player's recent game history
+            player_history: Player's recent game history (or RollingFeatures)
             current_season: Current season
             current_week: Current week
             is_playoff: Whether playoff game
             team_stats: Optional team stats
+            player_id: Optional player identifier, enables the quantile cache
         
         Returns:
             PredictionResult object
@@ -382,6 +1119,7 @@ class PredictionService:
             threshold=action_amount,
             bet_type=bet_type,
             is_playoff=is_playoff,
-            team_stats=team_stats
+            team_stats=team_stats,
+            player_id=player_id
         )
 
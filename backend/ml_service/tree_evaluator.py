@@ -0,0 +1,264 @@
+"""
+Pure-NumPy evaluator for the LightGBM quantile models.
+
+Each model's trees are flattened into arrays (split feature, threshold,
+left/right child, leaf value) and evaluated vectorized over a batch of
+rows, with all trees of several models (q10/q50/q90) walked together.
+The arrays can be saved as .npz files, so a serving process using this
+backend never unpickles a LightGBM Booster.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Directory (inside a model bundle) holding exported tree arrays
+TREE_ARRAYS_DIR = 'trees'
+
+# LightGBM missing-value handling per split
+_MISSING_TYPES = {'None': 0, 'Zero': 1, 'NaN': 2}
+_ZERO_THRESHOLD = 1e-35  # kZeroThreshold in LightGBM
+
+TREE_ARRAY_FIELDS = (
+    'split_feature', 'threshold', 'default_left', 'missing_type',
+    'left_child', 'right_child', 'leaf_value', 'roots', 'tree_model',
+)
+
+
+class TreeEnsemble:
+    """
+    Flattened trees of one or more LightGBM regression models.
+    
+    Nodes and leaves of every tree are stored in shared arrays. Child and
+    root references are node indices when >= 0 and ``~leaf_index`` when
+    negative. ``tree_model`` maps each tree to the model it belongs to;
+    trees of a model are contiguous and in boosting order.
+    """
+    
+    def __init__(
+        self,
+        split_feature: np.ndarray,
+        threshold: np.ndarray,
+        default_left: np.ndarray,
+        missing_type: np.ndarray,
+        left_child: np.ndarray,
+        right_child: np.ndarray,
+        leaf_value: np.ndarray,
+        roots: np.ndarray,
+        tree_model: np.ndarray,
+        feature_names: Sequence[str],
+        source_sha256: Optional[str] = None
+    ):
+        self.split_feature = split_feature
+        self.threshold = threshold
+        self.default_left = default_left
+        self.missing_type = missing_type
+        self.left_child = left_child
+        self.right_child = right_child
+        self.leaf_value = leaf_value
+        self.roots = roots
+        self.tree_model = tree_model
+        self.feature_names = list(feature_names)
+        self.source_sha256 = source_sha256
+        self.num_models = int(tree_model.max()) + 1 if len(tree_model) else 0
+        self._model_bounds = np.searchsorted(tree_model, np.arange(self.num_models + 1))
+    
+    @classmethod
+    def from_booster(cls, booster: Any, source_sha256: Optional[str] = None) -> 'TreeEnsemble':
+        """
+        Flatten a lightgbm.Booster.
+        
+        Args:
+            booster: Trained lightgbm.Booster (regression, numerical splits)
+            source_sha256: Checksum of the model file it came from, kept for validation
+        
+        Raises:
+            ValueError: For multiclass, averaged (random forest),
+                        linear-tree or categorical-split models
+        """
+        dump = booster.dump_model()
+        
+        if dump['num_tree_per_iteration'] != 1 or dump.get('average_output'):
+            raise ValueError('Only single-output boosted models can be flattened')
+        
+        split_feature, threshold, default_left, missing_type = [], [], [], []
+        left_child, right_child, leaf_value, roots = [], [], [], []
+        
+        def add(node: Dict[str, Any]) -> int:
+            """Append a subtree and return its reference."""
+            if 'split_index' not in node:
+                leaf_value.append(node['leaf_value'])
+                return ~(len(leaf_value) - 1)
+            
+            if node['decision_type'] != '<=':
+                raise ValueError(f"Unsupported split type '{node['decision_type']}'")
+            
+            index = len(split_feature)
+            split_feature.append(node['split_feature'])
+            threshold.append(node['threshold'])
+            default_left.append(node['default_left'])
+            missing_type.append(_MISSING_TYPES[node['missing_type']])
+            left_child.append(0)
+            right_child.append(0)
+            left_child[index] = add(node['left_child'])
+            right_child[index] = add(node['right_child'])
+            return index
+        
+        for tree in dump['tree_info']:
+            if 'leaf_coeff' in tree['tree_structure'] or tree.get('num_cat', 0):
+                raise ValueError('Linear trees and categorical splits are not supported')
+            roots.append(add(tree['tree_structure']))
+        
+        return cls(
+            split_feature=np.array(split_feature, dtype=np.int32),
+            threshold=np.array(threshold, dtype=np.float64),
+            default_left=np.array(default_left, dtype=bool),
+            missing_type=np.array(missing_type, dtype=np.int8),
+            left_child=np.array(left_child, dtype=np.int32),
+            right_child=np.array(right_child, dtype=np.int32),
+            leaf_value=np.array(leaf_value, dtype=np.float64),
+            roots=np.array(roots, dtype=np.int32),
+            tree_model=np.zeros(len(roots), dtype=np.int32),
+            feature_names=dump['feature_names'],
+            source_sha256=source_sha256
+        )
+    
+    @classmethod
+    def combine(cls, ensembles: List['TreeEnsemble']) -> 'TreeEnsemble':
+        """
+        Stack several ensembles so one evaluation walks all of their trees.
+        Model i of the result is ensembles[i] (each input must hold one model).
+        """
+        num_nodes = np.cumsum([0] + [len(e.split_feature) for e in ensembles])
+        num_leaves = np.cumsum([0] + [len(e.leaf_value) for e in ensembles])
+        
+        def shift(refs: np.ndarray, i: int) -> np.ndarray:
+            """Re-base node and leaf references into the combined arrays."""
+            return np.where(refs >= 0, refs + num_nodes[i], ~(~refs + num_leaves[i])).astype(np.int32)
+        
+        return cls(
+            split_feature=np.concatenate([e.split_feature for e in ensembles]),
+            threshold=np.concatenate([e.threshold for e in ensembles]),
+            default_left=np.concatenate([e.default_left for e in ensembles]),
+            missing_type=np.concatenate([e.missing_type for e in ensembles]),
+            left_child=np.concatenate([shift(e.left_child, i) for i, e in enumerate(ensembles)]),
+            right_child=np.concatenate([shift(e.right_child, i) for i, e in enumerate(ensembles)]),
+            leaf_value=np.concatenate([e.leaf_value for e in ensembles]),
+            roots=np.concatenate([shift(e.roots, i) for i, e in enumerate(ensembles)]),
+            tree_model=np.concatenate([
+                np.full(len(e.roots), i, dtype=np.int32) for i, e in enumerate(ensembles)
+            ]),
+            feature_names=ensembles[0].feature_names
+        )
+    
+    def predict(self, features: np.ndarray, model: Optional[int] = None) -> np.ndarray:
+        """
+        Evaluate the models over a feature matrix.
+        
+        Args:
+            features: Array of shape (rows, features) in model column order
+            model: Index of a single model to evaluate (None evaluates all)
+        
+        Returns:
+            Array of shape (num_models, rows), or (rows,) for a single model
+        """
+        features = np.asarray(features, dtype=np.float64)
+        if features.ndim == 1:
+            features = features.reshape(1, -1)
+        num_rows = features.shape[0]
+        
+        if model is None:
+            first, last = 0, len(self.roots)
+        else:
+            first, last = self._model_bounds[model], self._model_bounds[model + 1]
+        roots = self.roots[first:last]
+        
+        # One cursor per (tree, row), all trees advanced one level per pass
+        state = np.repeat(roots, num_rows)
+        row_of = np.tile(np.arange(num_rows), len(roots))
+        active = np.flatnonzero(state >= 0)
+        
+        while active.size:
+            nodes = state[active]
+            fval = features[row_of[active], self.split_feature[nodes]]
+            missing_type = self.missing_type[nodes]
+            
+            # LightGBM's NumericalDecision
+            is_nan = np.isnan(fval)
+            fval = np.where(is_nan & (missing_type != 2), 0.0, fval)
+            use_default = ((missing_type == 1) & (np.abs(fval) <= _ZERO_THRESHOLD)) | ((missing_type == 2) & is_nan)
+            go_left = np.where(use_default, self.default_left[nodes], fval <= self.threshold[nodes])
+            
+            state[active] = np.where(go_left, self.left_child[nodes], self.right_child[nodes])
+            active = active[state[active] >= 0]
+        
+        leaf_values = self.leaf_value[~state].reshape(len(roots), num_rows)
+        
+        # Sum trees in boosting order, as LightGBM does, so results match bit for bit
+        if model is not None:
+            return np.cumsum(leaf_values, axis=0)[-1] if len(roots) else np.zeros(num_rows)
+        
+        output = np.empty((self.num_models, num_rows), dtype=np.float64)
+        for index in range(self.num_models):
+            start, end = self._model_bounds[index], self._model_bounds[index + 1]
+            output[index] = np.cumsum(leaf_values[start:end], axis=0)[-1] if end > start else 0.0
+        return output
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the tree arrays."""
+        return sum(getattr(self, name).nbytes for name in TREE_ARRAY_FIELDS)
+    
+    def save(self, path: Path):
+        """Save the arrays to an .npz file."""
+        np.savez(
+            path,
+            feature_names=np.array(self.feature_names),
+            source_sha256=np.array(self.source_sha256 or ''),
+            **{name: getattr(self, name) for name in TREE_ARRAY_FIELDS}
+        )
+    
+    @classmethod
+    def load(cls, path: Path) -> 'TreeEnsemble':
+        """Load arrays saved with save()."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                feature_names=data['feature_names'].tolist(),
+                source_sha256=str(data['source_sha256']) or None,
+                **{name: data[name] for name in TREE_ARRAY_FIELDS}
+            )
+
+
+class NumpyTreeModel:
+    """
+    A quantile model served by the NumPy tree evaluator.
+    Same predict/feature_name interface as BoosterPredictor.
+    
+    The ensemble may hold several models (e.g. the q10/q50/q90 models of a
+    model bundle); model_index selects this model's trees.
+    """
+    
+    def __init__(self, ensemble: TreeEnsemble, model_index: int = 0):
+        self.ensemble = ensemble
+        self.model_index = model_index
+    
+    def feature_name(self) -> List[str]:
+        """Feature names the model was trained with."""
+        return self.ensemble.feature_names
+    
+    def num_feature(self) -> int:
+        """Number of features the model expects."""
+        return len(self.ensemble.feature_names)
+    
+    def predict(self, features: Any, num_threads: Optional[int] = None) -> np.ndarray:
+        """
+        Predict for a feature matrix (num_threads is accepted for interface
+        compatibility; evaluation is single-threaded NumPy).
+        """
+        if hasattr(features, 'to_numpy'):
+            features = features.to_numpy(dtype=np.float64)
+        return self.ensemble.predict(features, model=self.model_index)